@@ -0,0 +1,107 @@
+import os
+import copy
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+
+# Log records go on a queue; a background thread formats and writes them,
+# so a log call costs the caller about as much as a queue put. Messages use
+# logging's %-style arguments, which are only formatted (on that thread)
+# when the record passes the level: logger.debug("Data:\n%s", df) never
+# renders df unless DEBUG is on.
+LOG_DIRECTORY = "logs"
+LOG_FILE = "rental_management.log"
+LOG_LEVEL = "INFO"  # "DEBUG" adds the views' report data dumps
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, thread, message, any extra= fields."""
+
+    def format(self, record):
+        # RotatingFileHandler formats each record twice (size check, then write)
+        line = vars(record).get("_json_line")
+        if line is not None:
+            return line
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and key != "_json_line":
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        record._json_line = json.dumps(entry, default=str)
+        return record._json_line
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # The stock QueueHandler formats the message before queueing it, i.e. on
+    # the calling (GUI) thread. The record goes as it is instead; its
+    # arguments must not be changed after the log call.
+    def prepare(self, record):
+        return copy.copy(record)
+
+
+def start_logging(level=None, directory=None):
+    """Send the application's log records to a rotating JSON-lines file.
+
+    Also echoes warnings and errors to stderr. Safe to call again; later
+    calls only change the level. Returns the log file path.
+    """
+    global _listener
+    directory = directory or LOG_DIRECTORY
+    path = os.path.join(directory, LOG_FILE)
+    root = logging.getLogger()
+    root.setLevel(level or LOG_LEVEL)
+    if _listener is not None:
+        return path
+
+    os.makedirs(directory, exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8"
+    )
+    file_handler.setFormatter(JsonFormatter())
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.WARNING)
+    console_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    records = queue.SimpleQueue()
+    root.addHandler(_DeferredQueueHandler(records))
+    _listener = logging.handlers.QueueListener(
+        records, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(stop_logging)
+    return path
+
+
+def stop_logging():
+    """Write out the queued records and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, _DeferredQueueHandler):
+            root.removeHandler(handler)
+    _listener = None
@@ -0,0 +1,192 @@
+import logging
+import os
+import sqlite3
+from controllers import database
+from controllers.database import connect
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "archive"
+
+PAYMENT_COLUMNS = "id, tenant_id, room_id, amount, date, method, due_date, notes, payment_status, reference_number"
+LEASE_COLUMNS = "id, room_id, tenant_id, start_date, end_date, status"
+
+# Leases in these states are closed and can leave the live tables
+CLOSED_LEASE_STATUSES = ("Completed", "Canceled")
+# Payments in these states are settled; Pending and Overdue ones stay live
+# however old they are, since they are still owed
+SETTLED_PAYMENT_STATUSES = ("Paid",)
+
+
+def archive_path(year):
+    """Path of the archive database holding one year of history."""
+    return os.path.join(_archive_dir(), f"rental_archive_{year}.db")
+
+
+def _archive_dir():
+    # In sharded mode each shard archives into a directory of its own
+    path = database.database_path()
+    if path == database.DATABASE:
+        return ARCHIVE_DIR
+    return os.path.join(ARCHIVE_DIR, os.path.splitext(os.path.basename(path))[0])
+
+
+def list_archives():
+    """Return (year, path) for every archive file, oldest first."""
+    directory = _archive_dir()
+    if not os.path.isdir(directory):
+        return []
+    archives = []
+    for name in os.listdir(directory):
+        if name.startswith("rental_archive_") and name.endswith(".db"):
+            year = name[len("rental_archive_"):-len(".db")]
+            if year.isdigit():
+                archives.append((year, os.path.join(directory, name)))
+    return sorted(archives)
+
+
+def _create_archive_tables(cursor):
+    """Create Payment and Lease in the attached archive if missing."""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS archive.Payment (
+        id INTEGER PRIMARY KEY,
+        tenant_id INTEGER NOT NULL,
+        room_id INTEGER NOT NULL,
+        amount REAL NOT NULL,
+        date TEXT NOT NULL,
+        method TEXT,
+        due_date TEXT,
+        notes TEXT,
+        payment_status TEXT,
+        reference_number TEXT
+    );
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS archive.idx_payment_date ON Payment (date)")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS archive.Lease (
+        id INTEGER PRIMARY KEY,
+        room_id INTEGER NOT NULL,
+        tenant_id INTEGER NOT NULL,
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL,
+        status TEXT
+    );
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS archive.idx_lease_end_date ON Lease (end_date)")
+
+
+def archive_closed_periods(before_date):
+    """Move history older than before_date (YYYY-MM-DD) into per-year archives.
+
+    Paid payments dated before the cut-off and Completed/Canceled leases
+    that ended before it are copied to archive/rental_archive_<year>.db, summed
+    into PaymentRollup/LeaseRollup and removed from the live tables. Each
+    year is moved in its own transaction.
+
+    Returns {"payments": n, "leases": n} moved.
+    """
+    os.makedirs(_archive_dir(), exist_ok=True)
+    statuses = ", ".join("?" for _ in CLOSED_LEASE_STATUSES)
+    payment_statuses = ", ".join("?" for _ in SETTLED_PAYMENT_STATUSES)
+    payment_filter = f"date < ? AND strftime('%Y', date) = ? AND payment_status IN ({payment_statuses})"
+    lease_filter = f"end_date < ? AND strftime('%Y', end_date) = ? AND status IN ({statuses})"
+
+    connection = connect()
+    cursor = connection.cursor()
+    moved = {"payments": 0, "leases": 0}
+    try:
+        cursor.execute(f"""
+        SELECT strftime('%Y', date) FROM Payment WHERE date < ? AND payment_status IN ({payment_statuses})
+        UNION
+        SELECT strftime('%Y', end_date) FROM Lease WHERE end_date < ? AND status IN ({statuses})
+        """, (before_date, *SETTLED_PAYMENT_STATUSES, before_date, *CLOSED_LEASE_STATUSES))
+        years = sorted(row[0] for row in cursor.fetchall() if row[0])
+
+        for year in years:
+            payment_params = (before_date, year, *SETTLED_PAYMENT_STATUSES)
+            lease_params = (before_date, year, *CLOSED_LEASE_STATUSES)
+            cursor.execute("ATTACH DATABASE ? AS archive", (archive_path(year),))
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                _create_archive_tables(cursor)
+
+                cursor.execute(f"""
+                INSERT INTO archive.Payment ({PAYMENT_COLUMNS})
+                SELECT {PAYMENT_COLUMNS} FROM main.Payment WHERE {payment_filter}
+                """, payment_params)
+                cursor.execute(f"""
+                INSERT INTO PaymentRollup (period, room_id, tenant_id, payment_status, total_amount, payment_count)
+                SELECT strftime('%Y-%m', date), room_id, tenant_id, COALESCE(payment_status, 'Pending'),
+                       SUM(amount), COUNT(*)
+                FROM main.Payment
+                WHERE {payment_filter}
+                GROUP BY 1, 2, 3, 4
+                ON CONFLICT (period, room_id, tenant_id, payment_status) DO UPDATE SET
+                    total_amount = total_amount + excluded.total_amount,
+                    payment_count = payment_count + excluded.payment_count
+                """, payment_params)
+                cursor.execute(f"DELETE FROM main.Payment WHERE {payment_filter}", payment_params)
+                moved["payments"] += cursor.rowcount
+
+                cursor.execute(f"""
+                INSERT INTO archive.Lease ({LEASE_COLUMNS})
+                SELECT {LEASE_COLUMNS} FROM main.Lease WHERE {lease_filter}
+                """, lease_params)
+                cursor.execute(f"""
+                INSERT INTO LeaseRollup (period, room_id, status, lease_count, lease_days)
+                SELECT strftime('%Y', end_date), room_id, status,
+                       COUNT(*), SUM(julianday(end_date) - julianday(start_date))
+                FROM main.Lease
+                WHERE {lease_filter}
+                GROUP BY 1, 2, 3
+                ON CONFLICT (period, room_id, status) DO UPDATE SET
+                    lease_count = lease_count + excluded.lease_count,
+                    lease_days = lease_days + excluded.lease_days
+                """, lease_params)
+                cursor.execute(f"DELETE FROM main.Lease WHERE {lease_filter}", lease_params)
+                moved["leases"] += cursor.rowcount
+
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.execute("DETACH DATABASE archive")
+        return moved
+    except Exception as e:
+        logger.exception("Error archiving closed periods: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+def attach_archives(connection):
+    """Expose live and archived rows on a report connection.
+
+    Attaches every archive file and creates the temp views AllPayment and
+    AllLease (UNION ALL across main and the archives). Returns the years
+    attached.
+    """
+    archives = list_archives()
+    limit = connection.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    if len(archives) > limit:
+        raise ValueError(
+            f"{len(archives)} archive years exceed SQLite's limit of {limit} attached databases."
+        )
+
+    # A shared report connection may have them attached already
+    attached = {row[1] for row in connection.execute("PRAGMA database_list")}
+    payment_parts = [f"SELECT {PAYMENT_COLUMNS} FROM main.Payment"]
+    lease_parts = [f"SELECT {LEASE_COLUMNS} FROM main.Lease"]
+    for year, path in archives:
+        schema = f"archive_{year}"
+        if schema not in attached:
+            connection.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+        payment_parts.append(f"SELECT {PAYMENT_COLUMNS} FROM {schema}.Payment")
+        lease_parts.append(f"SELECT {LEASE_COLUMNS} FROM {schema}.Lease")
+
+    connection.execute("DROP VIEW IF EXISTS temp.AllPayment")
+    connection.execute(f"CREATE TEMP VIEW AllPayment AS {' UNION ALL '.join(payment_parts)}")
+    connection.execute("DROP VIEW IF EXISTS temp.AllLease")
+    connection.execute(f"CREATE TEMP VIEW AllLease AS {' UNION ALL '.join(lease_parts)}")
+    return [year for year, _path in archives]
@@ -0,0 +1,188 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from controllers import database
+from controllers.reference_cache import invalidate_reference_data
+
+logger = logging.getLogger(__name__)
+
+BACKUP_DIR = "backups"
+SNAPSHOTS_TO_KEEP = 24
+
+# Pages copied per backup step; writers can get the lock between steps
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.01
+
+# Snapshot files are named after when they were taken and a content marker
+# of the live file at that time: snapshot_<time>_g<generation>c<counter>.db.
+# counter is SQLite's file change counter, which every committed write
+# bumps, whatever the table. A restore copies an older counter back, so
+# the restore generation (kept in BACKUP_DIR, outside the database) is
+# bumped too, and markers from before a restore never match one after it.
+# Older snapshots are named ..._seq<n>.db; their marker matches nothing.
+_SNAPSHOT_PATTERN = re.compile(r"^snapshot_(\d{8}_\d{6})(?:_(\d{6}))?_(seq\d+|g\d+c\d+)\.db$")
+_SNAPSHOT_TIME_FORMAT = "%Y%m%d_%H%M%S_%f"
+GENERATION_FILE = "restore_generation"
+_snapshot_lock = threading.Lock()
+
+
+def backup_database(destination, source=None, progress=None):
+    """Copy a database with the online backup API, a few pages at a time.
+
+    The application can keep reading and writing while this runs.
+    progress(status, remaining, total) is called after every step.
+    """
+    source_connection = sqlite3.connect(source or database.DATABASE)
+    target_connection = sqlite3.connect(destination)
+    try:
+        source_connection.backup(
+            target_connection,
+            pages=BACKUP_PAGES_PER_STEP,
+            progress=progress,
+            sleep=BACKUP_STEP_SLEEP,
+        )
+    except Exception as e:
+        logger.exception("Error backing up database to %s: %s", destination, e)
+        raise
+    finally:
+        target_connection.close()
+        source_connection.close()
+
+
+def _restore_generation():
+    path = os.path.join(BACKUP_DIR, GENERATION_FILE)
+    try:
+        with open(path, encoding="utf-8") as file:
+            return int(file.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _bump_restore_generation():
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    path = os.path.join(BACKUP_DIR, GENERATION_FILE)
+    with open(path + ".partial", "w", encoding="utf-8") as file:
+        file.write(str(_restore_generation() + 1))
+    os.replace(path + ".partial", path)
+
+
+def _file_change_counter(path):
+    """SQLite's file change counter (header bytes 24-27) for a committed state.
+
+    Read under a shared lock, so no write can commit halfway through.
+    """
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute("BEGIN")
+        connection.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        with open(path, "rb") as file:
+            header = file.read(28)
+        return int.from_bytes(header[24:28], "big")
+    finally:
+        connection.rollback()
+        connection.close()
+
+
+def content_marker():
+    """Marker of the live database's current contents, e.g. 'g2c1734'."""
+    return f"g{_restore_generation()}c{_file_change_counter(database.DATABASE)}"
+
+
+def list_snapshots():
+    """Return (path, taken_at, marker) for every snapshot, newest first."""
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    snapshots = []
+    for name in os.listdir(BACKUP_DIR):
+        match = _SNAPSHOT_PATTERN.match(name)
+        if match:
+            seconds, microseconds, marker = match.groups()
+            taken_at = datetime.strptime(f"{seconds}_{microseconds or '000000'}", _SNAPSHOT_TIME_FORMAT)
+            snapshots.append((os.path.join(BACKUP_DIR, name), taken_at, marker))
+    return sorted(snapshots, key=lambda snapshot: snapshot[1], reverse=True)
+
+
+def create_snapshot(force=False):
+    """Take a point-in-time snapshot unless nothing changed since the last one.
+
+    Snapshots are tagged with the content marker of the state they copy,
+    so repeated calls on an idle database cost a header read, not a copy.
+    Returns the path of the snapshot covering the current state.
+    """
+    with _snapshot_lock:
+        marker = content_marker()
+        snapshots = list_snapshots()
+        if snapshots and snapshots[0][2] == marker and not force:
+            return snapshots[0][0]
+
+        os.makedirs(BACKUP_DIR, exist_ok=True)
+        taken_at = datetime.now().strftime(_SNAPSHOT_TIME_FORMAT)
+        path = os.path.join(BACKUP_DIR, f"snapshot_{taken_at}_{marker}.db")
+        partial_path = path + ".partial"
+        backup_database(partial_path)
+        os.replace(partial_path, path)
+        prune_snapshots()
+        return path
+
+
+def create_snapshot_in_background():
+    """Start create_snapshot() on a worker thread so the UI stays responsive."""
+    def run():
+        try:
+            create_snapshot()
+        except Exception as e:
+            logger.exception("Error taking background snapshot: %s", e)
+
+    worker = threading.Thread(target=run, name="snapshot", daemon=True)
+    worker.start()
+    return worker
+
+
+def prune_snapshots(keep=SNAPSHOTS_TO_KEEP):
+    """Delete all but the `keep` most recently taken snapshots."""
+    for path, _taken_at, _marker in list_snapshots()[keep:]:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.exception("Error removing old snapshot %s: %s", path, e)
+
+
+def restore_snapshot(path):
+    """Copy a snapshot back over the live database.
+
+    Open views should do a full reload afterwards: the change log is
+    restored along with the data.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Snapshot not found: {path}")
+    # Before the copy, so no snapshot can be tagged with a marker the
+    # restored file is about to repeat
+    with _snapshot_lock:
+        _bump_restore_generation()
+        backup_database(database.DATABASE, source=path)
+    # The restored change log may be behind what the caches have seen
+    invalidate_reference_data()
+
+
+def open_snapshot(path):
+    """Open a snapshot read-only; it never contends with the live database."""
+    return sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+
+
+@contextmanager
+def report_snapshot():
+    """Point report queries at a fresh read-only snapshot for the block.
+
+        with report_snapshot():
+            df = fetch_financial_performance()
+    """
+    path = create_snapshot()
+    previous = database.set_report_snapshot(path)
+    try:
+        yield path
+    finally:
+        database.set_report_snapshot(previous)
@@ -0,0 +1,126 @@
+import logging
+import threading
+import weakref
+from controllers.database import connect, database_path
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps bound parameters per statement; stay well below the limit
+ID_CHUNK_SIZE = 500
+
+# Every live ChangeSubscription, so the log can be pruned up to the oldest
+# change one of them still has to read
+_subscriptions = weakref.WeakSet()
+_subscriptions_lock = threading.Lock()
+
+
+def id_chunks(ids, size=ID_CHUNK_SIZE):
+    """Split ids into lists small enough for an IN (?, ...) clause."""
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def fetch_latest_change_seq():
+    """Return the highest change sequence number recorded so far."""
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM ChangeLog")
+        return cursor.fetchone()[0]
+    except Exception as e:
+        logger.exception("Error fetching latest change sequence: %s", e)
+        return 0
+    finally:
+        connection.close()
+
+
+def fetch_changes_since(last_seq, tables):
+    """Fetch (seq, table_name, row_id, operation) entries newer than last_seq."""
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        placeholders = ", ".join("?" for _ in tables)
+        cursor.execute(f"""
+        SELECT seq, table_name, row_id, operation
+        FROM ChangeLog
+        WHERE seq > ? AND table_name IN ({placeholders})
+        ORDER BY seq
+        """, (last_seq, *tables))
+        return cursor.fetchall()
+    except Exception as e:
+        logger.exception("Error fetching changes: %s", e)
+        return []
+    finally:
+        connection.close()
+
+
+def prune_changes(before_seq):
+    """Drop change log entries every subscriber has already seen."""
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM ChangeLog WHERE seq < ?", (before_seq,))
+        removed = cursor.rowcount
+        connection.commit()
+        return removed
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error pruning change log: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+def prune_seen_changes():
+    """Drop the current database file's change log entries no subscriber still needs.
+
+    Keeps everything after the lowest last_seq of the subscriptions on
+    this file (all but the latest entry when there are none), so nothing
+    is lost before a poll reads it. Returns the number of entries removed.
+    """
+    path = database_path()
+    with _subscriptions_lock:
+        needed = [subscription.last_seq for subscription in _subscriptions if subscription.database == path]
+    before_seq = min(needed) if needed else fetch_latest_change_seq()
+    try:
+        return prune_changes(before_seq)
+    except Exception:
+        return 0  # Logged by prune_changes; the next run tries again
+
+
+class ChangeSubscription:
+    """Tracks the last seen change for a set of tables.
+
+    Each poll() returns the ids touched since the previous poll, grouped by
+    table, so a view can re-read just those rows instead of reloading.
+    After a poll, inserted and deleted hold the ids among them that were
+    inserted or deleted, grouped the same way.
+    """
+
+    def __init__(self, tables, last_seq=None):
+        self.tables = list(tables)
+        self.database = database_path()
+        self.last_seq = fetch_latest_change_seq() if last_seq is None else last_seq
+        self.inserted = {}
+        self.deleted = {}
+        with _subscriptions_lock:
+            _subscriptions.add(self)
+
+    def reset(self):
+        """Skip everything recorded so far, e.g. after a full reload."""
+        self.database = database_path()
+        self.last_seq = fetch_latest_change_seq()
+
+    def poll(self):
+        """Return {table_name: set(row_ids)} changed since the last poll."""
+        changes = {}
+        self.inserted, self.deleted = {}, {}
+        for seq, table_name, row_id, operation in fetch_changes_since(self.last_seq, self.tables):
+            changes.setdefault(table_name, set()).add(row_id)
+            if operation == "INSERT":
+                self.inserted.setdefault(table_name, set()).add(row_id)
+            elif operation == "DELETE":
+                self.deleted.setdefault(table_name, set()).add(row_id)
+            self.last_seq = seq
+        return changes
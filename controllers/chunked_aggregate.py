@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from controllers.database import connect_report, on_shard
+from controllers.shard_controller import fans_out, list_shards
+from controllers.typed_frames import apply_types
+
+# Rows per chunk when a report dataset is streamed rather than loaded whole
+CHUNK_ROWS = 50_000
+
+# Distinct counts are HyperLogLog sketches of 2**SKETCH_PRECISION one-byte
+# registers per group: 4 KiB each, within about 1.6% of the exact count
+# (exact in practice for a few hundred values). Meant for coarse groups
+# such as months or statuses, not one group per payment.
+SKETCH_PRECISION = 12
+
+AGGREGATIONS = ("sum", "count", "distinct")
+
+
+def _open_stream(build_query):
+    # Opened eagerly, so each shard's connection is made while it is selected
+    connection = connect_report()
+    try:
+        query, params = build_query(connection)
+        return connection, connection.execute(query, params)
+    except Exception:
+        connection.close()
+        raise
+
+
+def stream_frames(build_query, types=None, chunk_size=CHUNK_ROWS):
+    """Yield a query's result as DataFrames of at most chunk_size rows.
+
+    build_query(connection) returns (query, params); it may attach
+    databases to the connection first. In sharded portfolio mode every
+    shard is read in turn. types are typed_frames column types applied to
+    each chunk. Only one chunk per stream is in memory at a time.
+    """
+    opened = []
+    try:
+        if not fans_out():
+            opened.append(_open_stream(build_query))
+        else:
+            for property_id in list_shards():
+                with on_shard(property_id):
+                    opened.append(_open_stream(build_query))
+        for _connection, cursor in opened:
+            columns = [description[0] for description in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield apply_types(pd.DataFrame.from_records(rows, columns=columns), types or {})
+    finally:
+        for connection, _cursor in opened:
+            connection.close()
+
+
+def _sketch(values, precision=SKETCH_PRECISION):
+    """Register index and rank of each hashed value (HyperLogLog)."""
+    hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+    index = (hashes & np.uint64((1 << precision) - 1)).astype(np.intp)
+    # 52 further bits convert to float exactly, so frexp gives their bit length
+    rest = ((hashes >> np.uint64(precision)) & np.uint64((1 << 52) - 1)).astype(np.float64)
+    rank = 53 - np.frexp(rest)[1]
+    return index, rank.astype(np.uint8)
+
+
+def _estimate(registers):
+    """Distinct counts from HyperLogLog registers, one row per group."""
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.power(2.0, -registers.astype(np.float64)).sum(axis=1)
+    zeros = (registers == 0).sum(axis=1)
+    # Small counts: linear counting over the empty registers
+    with np.errstate(divide="ignore"):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw).round().astype(np.int64)
+
+
+class GroupAggregate:
+    """Group-by aggregation merged chunk by chunk, in memory bounded by the groups.
+
+    by is the grouping column(s); each keyword is an output column given as
+    (input column, "sum" | "count" | "distinct"), like pandas' named
+    aggregation. Sums and counts (non-null values) match a groupby on the
+    whole dataset; distinct counts are sketches (see SKETCH_PRECISION).
+    Rows with a null group key are left out, as in pandas.
+    """
+
+    def __init__(self, by, **aggregations):
+        for column, function in aggregations.values():
+            if function not in AGGREGATIONS:
+                raise ValueError(f"Unknown aggregation {function!r} for {column}")
+        self.by = [by] if isinstance(by, str) else list(by)
+        self.aggregations = aggregations
+        self._totals = None
+        self._integer = set()
+        self._sketches = {}
+
+    def update(self, chunk):
+        grouped = chunk.groupby(self.by, observed=True, sort=False)
+        totals = {name: getattr(grouped[column], function)()
+                  for name, (column, function) in self.aggregations.items() if function != "distinct"}
+        partial = pd.DataFrame(totals, index=grouped.size().index)
+        if self._totals is None:
+            self._totals = partial
+            self._integer = {name for name, dtype in partial.dtypes.items() if pd.api.types.is_integer_dtype(dtype)}
+        else:
+            self._totals = self._totals.add(partial, fill_value=0)
+        for name, (column, function) in self.aggregations.items():
+            if function == "distinct":
+                self._update_sketches(name, chunk, grouped.ngroup(), column)
+
+    def _update_sketches(self, name, chunk, codes, column):
+        # Rows with a null key have no group number
+        codes = codes.fillna(-1).to_numpy(dtype=np.int64)
+        present = chunk[column].notna().to_numpy() & (codes >= 0)
+        if not present.any():
+            return
+        registers = np.zeros((codes.max() + 1, 1 << SKETCH_PRECISION), dtype=np.uint8)
+        index, rank = _sketch(chunk.loc[present, column])
+        np.maximum.at(registers, (codes[present], index), rank)
+        # One row per group of the chunk, merged into that group's sketch
+        first = np.unique(codes[present], return_index=True)[1]
+        keys = chunk.loc[present, self.by].iloc[first]
+        sketches = self._sketches.setdefault(name, {})
+        for key, code in zip(keys.itertuples(index=False, name=None), codes[present][first]):
+            if key in sketches:
+                np.maximum(sketches[key], registers[code], out=sketches[key])
+            else:
+                sketches[key] = registers[code].copy()
+
+    def result(self):
+        """The aggregated DataFrame: the by columns, then one column per aggregation, sorted by group."""
+        names = list(self.aggregations)
+        if self._totals is None:
+            return pd.DataFrame(columns=[*self.by, *names])
+        result = self._totals.copy()
+        for name, (column, function) in self.aggregations.items():
+            if function == "count" or name in self._integer:
+                result[name] = result[name].astype(np.int64)
+            elif function == "distinct":
+                sketches = self._sketches.get(name, {})
+                keys = [key if len(self.by) > 1 else key[0] for key in sketches]
+                counts = _estimate(np.array(list(sketches.values()))) if sketches else []
+                result[name] = pd.Series(counts, index=pd.Index(keys) if len(self.by) == 1
+                                         else pd.MultiIndex.from_tuples(keys), dtype=np.float64)
+                result[name] = result[name].fillna(0).astype(np.int64)
+        result = result.sort_index().reset_index()
+        result.columns = [*self.by, *result.columns[len(self.by):]]
+        return result[[*self.by, *names]]
+
+
+class Histogram:
+    """Value counts in fixed-width buckets, merged chunk by chunk.
+
+    Bucket n holds column values in [n * width, (n + 1) * width); only
+    buckets with values are listed, as from a GROUP BY. Rows where the
+    column is null are left out.
+    """
+
+    def __init__(self, column, width, by=()):
+        if width <= 0:
+            raise ValueError("Histogram bucket width must be positive")
+        self.column = column
+        self.width = width
+        self.by = [by] if isinstance(by, str) else list(by)
+        self._counts = GroupAggregate([*self.by, "bucket"], count=(column, "count"))
+
+    def update(self, chunk):
+        values = pd.to_numeric(chunk[self.column])
+        buckets = chunk[self.by].assign(bucket=np.floor(values / self.width))
+        buckets[self.column] = values
+        self._counts.update(buckets[buckets["bucket"].notna()].astype({"bucket": np.int64}))
+
+    def result(self):
+        """Columns: the by columns, bucket, min_value, max_value (exclusive), count."""
+        counts = self._counts.result()
+        counts.insert(len(self.by) + 1, "min_value", counts["bucket"] * self.width)
+        counts.insert(len(self.by) + 2, "max_value", (counts["bucket"] + 1) * self.width)
+        return counts
+
+
+def aggregate(chunks, *aggregators):
+    """Feed every chunk to each aggregator in one pass; returns their results in order."""
+    for chunk in chunks:
+        for aggregator in aggregators:
+            aggregator.update(chunk)
+    return [aggregator.result() for aggregator in aggregators]
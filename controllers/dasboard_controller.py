@@ -1,27 +1,44 @@
-import sqlite3
+import logging
+from controllers.database import connect, connect_report
+from controllers.archive_controller import attach_archives
+from controllers.property_controller import property_scope
+from controllers.shard_controller import federated, concat_rows
 import csv
 
-def get_rent_collection_report():
-    connection = sqlite3.connect('rental_management_v2.db')
-    cursor = connection.cursor()
-    cursor.execute("""
-    SELECT 
-        (SELECT first_name || ' ' || last_name FROM Tenant WHERE id = p.tenant_id) AS tenant,
-        (SELECT name FROM Room WHERE id = l.room_id) AS room,
-        p.amount, p.date,
-        CASE WHEN p.amount >= r.rental_price THEN 'Completed' ELSE 'Pending' END AS payment_status
-    FROM Payment p
-    JOIN Lease l ON p.lease_id = l.id
-    JOIN Room r ON l.room_id = r.id
-    """)
-    data = cursor.fetchall()
-    connection.close()
-    return data
+logger = logging.getLogger(__name__)
+
+@federated(concat_rows)
+def get_rent_collection_report(include_archive=False):
+    connection = connect_report()
+    try:
+        payment_table = "Payment"
+        if include_archive:
+            attach_archives(connection)
+            payment_table = "AllPayment"
+        scope, params = property_scope("r.property_id")
+        cursor = connection.cursor()
+        # Payment carries room_id itself; there is no Payment.lease_id column
+        cursor.execute(f"""
+        SELECT 
+            t.first_name || ' ' || t.last_name AS tenant,
+            r.name AS room,
+            p.amount, p.date,
+            CASE WHEN p.amount >= r.rental_price THEN 'Completed' ELSE 'Pending' END AS payment_status
+        FROM {payment_table} p
+        JOIN Tenant t ON p.tenant_id = t.id
+        JOIN Room r ON p.room_id = r.id
+        WHERE 1 = 1{scope}
+        """, params)
+        return cursor.fetchall()
+    finally:
+        connection.close()
 
+@federated(concat_rows)
 def get_occupancy_rates():
-    connection = sqlite3.connect('rental_management_v2.db')
+    connection = connect()
     cursor = connection.cursor()
-    cursor.execute("""
+    scope, params = property_scope("p.id")
+    cursor.execute(f"""
     SELECT 
         p.name AS property_name,
         r.type AS room_type,
@@ -31,8 +48,9 @@ def get_occupancy_rates():
     FROM Room r
     JOIN Property p ON r.property_id = p.id
     LEFT JOIN Lease l ON r.id = l.room_id
+    WHERE 1 = 1{scope}
     GROUP BY p.name, r.type
-    """)
+    """, params)
     data = cursor.fetchall()
     connection.close()
     return data
@@ -48,4 +66,4 @@ def export_to_csv(report_type):
     with open(filename, mode="w", newline="") as file:
         writer = csv.writer(file)
         writer.writerows(data)
-    print(f"Report exported to {filename}")
+    logger.info("Report exported to %s", filename)
@@ -0,0 +1,318 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DATABASE = "rental_management_v2.db"
+
+_local = threading.local()
+
+# Idle connections kept per thread and database file. sqlite3 connections
+# stay on the thread that opened them, so each thread has its own pool.
+POOL_SIZE = 4
+# Prepared statements kept per connection (sqlite3 keys them by SQL text)
+STATEMENT_CACHE_SIZE = 256
+
+# Read-only snapshot that report queries use instead of the live file, if set
+_report_snapshot = None
+
+# Sharded mode: set to a directory to keep each property's rooms, tenants,
+# leases and payments in a file of its own there. DATABASE then holds only
+# the Property catalogue and rooms not yet assigned to a property.
+SHARD_DIRECTORY = None
+# Shard ids start at property_id * SHARD_ID_SPAN, so ids stay unique
+# across the portfolio when shard results are merged
+SHARD_ID_SPAN = 1 << 32
+
+# Property whose shard controller calls use, unless a thread overrides it
+_selected_shard = None
+_NO_OVERRIDE = object()
+
+
+def shard_path(property_id):
+    return os.path.join(SHARD_DIRECTORY, f"property_{property_id}.db")
+
+
+def database_path():
+    """Database file the current thread's controller calls go to."""
+    property_id = getattr(_local, "shard", _NO_OVERRIDE)
+    if property_id is _NO_OVERRIDE:
+        property_id = _selected_shard
+    if SHARD_DIRECTORY is None or property_id is None:
+        return DATABASE
+    return shard_path(property_id)
+
+
+def select_shard(property_id):
+    """Route controller calls to a property's shard (None for the main file)."""
+    global _selected_shard
+    _selected_shard = property_id
+
+
+@contextmanager
+def on_shard(property_id):
+    """Route this thread's controller calls to one shard for a block.
+
+    None means the main file. Used for writes filed under a property other
+    than the selected one and by the report fan-out workers; a no-op when
+    sharding is off.
+    """
+    previous = getattr(_local, "shard", _NO_OVERRIDE)
+    _local.shard = property_id
+    try:
+        yield
+    finally:
+        if previous is _NO_OVERRIDE:
+            del _local.shard
+        else:
+            _local.shard = previous
+
+
+def connect():
+    """Open a connection for one controller call.
+
+    Outside a unit of work this borrows a long-lived connection from the
+    thread's pool, so statements prepared by earlier calls are reused;
+    close() hands it back. Inside a unit of work the call shares the
+    unit's connection and runs in its own savepoint.
+    """
+    unit = getattr(_local, "unit", None)
+    if unit is not None:
+        return _SavepointConnection(unit)
+    database = database_path()
+    pool = _pool(database)
+    connection = pool.pop() if pool else _open(database)
+    return _PooledConnection(database, connection)
+
+
+def connect_report():
+    """Open a connection for a report query.
+
+    Uses the read-only report snapshot when one is active (see
+    controllers.backup_controller.report_snapshot), otherwise the live file.
+    Snapshots are of the main file, so shard reads always go live.
+    Report connections are plain sqlite3 connections rather than pooled
+    ones: pandas expects the real type, and reports may ATTACH archives.
+    Inside report_transaction every call shares that block's connection.
+    """
+    database = database_path()
+    shared = getattr(_local, "report", None)
+    if shared is not None and shared.database == database:
+        return shared
+    if _report_snapshot is not None and database == DATABASE:
+        return sqlite3.connect(f"file:{os.path.abspath(_report_snapshot)}?mode=ro", uri=True)
+    if getattr(_local, "unit", None) is not None:
+        return connect()
+    return sqlite3.connect(database)
+
+
+class _SharedReportConnection(sqlite3.Connection):
+    """Report connection shared by every report query in a report_transaction.
+
+    A real sqlite3.Connection, as pandas requires; close() is a no-op while
+    the transaction is open, so each fetch can close it as usual.
+    """
+
+    database = None
+    held = False
+
+    def close(self):
+        if not self.held:
+            super().close()
+
+
+@contextmanager
+def report_transaction(before_snapshot=None):
+    """Run the block's report queries on one connection and one read transaction.
+
+        with report_transaction():
+            statuses = fetch_lease_status_breakdown()
+            occupancy = fetch_lease_occupancy()
+
+    Every connect_report() on this thread (for the current database file)
+    returns the same connection, so all the datasets come from the same
+    database state and share one page cache. In WAL mode that state is a
+    snapshot and writers carry on; in rollback-journal mode writers wait
+    for the block to end. before_snapshot(connection) runs before the
+    transaction starts, for work SQLite refuses inside one (ATTACH).
+    Nested blocks join the outer one.
+    """
+    if getattr(_local, "report", None) is not None:
+        yield _local.report
+        return
+    database = database_path()
+    if _report_snapshot is not None and database == DATABASE:
+        connection = sqlite3.connect(f"file:{os.path.abspath(_report_snapshot)}?mode=ro", uri=True,
+                                     factory=_SharedReportConnection)
+    else:
+        connection = sqlite3.connect(database, factory=_SharedReportConnection)
+    connection.database = database
+    try:
+        if before_snapshot is not None:
+            before_snapshot(connection)
+        connection.execute("BEGIN")
+        # A deferred transaction fixes its snapshot at the first read
+        connection.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        connection.held = True
+        _local.report = connection
+        yield connection
+    finally:
+        _local.report = None
+        connection.held = False
+        if connection.in_transaction:
+            connection.rollback()
+        connection.close()
+
+
+def set_report_snapshot(path):
+    """Route report queries to a snapshot file (None for live); returns the previous path."""
+    global _report_snapshot
+    previous, _report_snapshot = _report_snapshot, path
+    return previous
+
+
+def _open(database):
+    return sqlite3.connect(database, cached_statements=STATEMENT_CACHE_SIZE)
+
+
+def _pool(database):
+    pools = getattr(_local, "pools", None)
+    if pools is None:
+        pools = _local.pools = {}
+    return pools.setdefault(database, [])
+
+
+class _PooledConnection:
+    """sqlite3.Connection borrowed from the pool for one controller call.
+
+    close() rolls back anything left uncommitted, as closing a plain
+    connection would, and returns the connection to the pool.
+    """
+
+    def __init__(self, database, connection):
+        self._database = database
+        self._connection = connection
+
+    def close(self):
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except sqlite3.Error:
+            connection.close()
+            return
+        pool = _pool(self._database)
+        if len(pool) < POOL_SIZE:
+            pool.append(connection)
+        else:
+            connection.close()
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(self._connection, name)
+
+
+class UnitOfWork:
+    """One connection and one transaction shared by several controller calls."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._savepoint_count = 0
+
+    def open_savepoint(self):
+        self._savepoint_count += 1
+        name = f"sp_{self._savepoint_count}"
+        self.connection.execute(f"SAVEPOINT {name}")
+        return name
+
+    def release(self, name):
+        self.connection.execute(f"RELEASE SAVEPOINT {name}")
+
+    def rollback_to(self, name):
+        self.connection.execute(f"ROLLBACK TO SAVEPOINT {name}")
+        self.connection.execute(f"RELEASE SAVEPOINT {name}")
+
+    @contextmanager
+    def savepoint(self):
+        """Run a block that can fail without undoing the rest of the unit."""
+        name = self.open_savepoint()
+        try:
+            yield self
+        except Exception:
+            self.rollback_to(name)
+            raise
+        else:
+            self.release(name)
+
+
+class _SavepointConnection:
+    """Stand-in for sqlite3.Connection handed to controllers in a unit of work.
+
+    commit() releases the call's savepoint, rollback() undoes only this call
+    and close() leaves the shared connection open. The real COMMIT happens
+    once, when the unit of work exits.
+    """
+
+    def __init__(self, unit):
+        self._unit = unit
+        self._savepoint = unit.open_savepoint()
+
+    def cursor(self):
+        return self._unit.connection.cursor()
+
+    def execute(self, *args):
+        return self._unit.connection.execute(*args)
+
+    def executemany(self, *args):
+        return self._unit.connection.executemany(*args)
+
+    def commit(self):
+        if self._savepoint is not None:
+            self._unit.release(self._savepoint)
+            self._savepoint = None
+
+    def rollback(self):
+        if self._savepoint is not None:
+            self._unit.rollback_to(self._savepoint)
+            self._savepoint = None
+
+    def close(self):
+        self.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._unit.connection, name)
+
+
+@contextmanager
+def unit_of_work():
+    """Batch several controller operations into one connection and one commit.
+
+        with unit_of_work():
+            set_rental_price_and_terms(...)
+            update_occupancy_status(...)
+
+    Everything inside commits together or not at all. Nested blocks join the
+    outer unit inside a savepoint of their own.
+    """
+    unit = getattr(_local, "unit", None)
+    if unit is not None:
+        with unit.savepoint():
+            yield unit
+        return
+
+    connection = sqlite3.connect(database_path())
+    unit = UnitOfWork(connection)
+    _local.unit = unit
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        yield unit
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        _local.unit = None
+        connection.close()
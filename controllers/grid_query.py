@@ -0,0 +1,99 @@
+import logging
+from controllers.database import connect
+from controllers.row_store import RowStore
+from controllers.property_controller import property_scope
+
+logger = logging.getLogger(__name__)
+
+# Filter modes for a grid column:
+#   exact    column = value
+#   prefix   value* as an index range (column >= value AND column < value + max char)
+#   contains *value* via LIKE; cannot use an index, meant for computed names
+FILTER_MODES = ("exact", "prefix", "contains")
+
+_MAX_CHAR = "\U0010ffff"
+
+
+class GridQuery:
+    """Sortable, filterable and pageable SELECT behind a management grid.
+
+    columns is one (sql expression, filter mode) pair per displayed column,
+    in display order. Sorting and filtering are accepted only by column
+    number, so no caller-supplied text ever reaches the SQL; filter values
+    are always bound as parameters. Rows are ordered by the sort column and
+    then by id_column, so paging is stable. scope is a (column, kind) pair
+    for property_scope; when a property is selected only its rows are read.
+    """
+
+    def __init__(self, select, from_clause, columns, id_column, default_sort=(0, False), scope=None):
+        for _expression, mode in columns:
+            if mode not in FILTER_MODES:
+                raise ValueError(f"Unknown filter mode: {mode}")
+        self.select = select
+        self.from_clause = from_clause
+        self.columns = list(columns)
+        self.id_column = id_column
+        self.default_sort = default_sort
+        self.scope = scope
+
+    def where(self, filters):
+        """Build the WHERE clause and parameters for {column number: text}."""
+        clauses = []
+        params = []
+        if self.scope is not None:
+            condition, params = property_scope(*self.scope)
+            if condition:
+                clauses.append(condition.removeprefix(" AND "))
+        for column, text in sorted((filters or {}).items()):
+            text = str(text).strip()
+            if not text:
+                continue
+            expression, mode = self.columns[column]
+            if mode == "exact":
+                clauses.append(f"{expression} = ?")
+                params.append(text)
+            elif mode == "prefix":
+                clauses.append(f"{expression} >= ? AND {expression} < ?")
+                params.extend([text, text + _MAX_CHAR])
+            else:
+                escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                clauses.append(f"{expression} LIKE ? ESCAPE '\\'")
+                params.append(f"%{escaped}%")
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def order_by(self, sort_column=None, descending=None):
+        if sort_column is None:
+            sort_column, descending = self.default_sort
+        expression, _mode = self.columns[sort_column]
+        direction = "DESC" if descending else "ASC"
+        return f"ORDER BY {expression} {direction}, {self.id_column} {direction}"
+
+    def count(self, filters=None):
+        """Number of rows matching the filters."""
+        where, params = self.where(filters)
+        connection = connect()
+        try:
+            cursor = connection.execute(f"SELECT COUNT(*) {self.from_clause} {where}", params)
+            return cursor.fetchone()[0]
+        except Exception as e:
+            logger.exception("Error counting grid rows: %s", e)
+            raise
+        finally:
+            connection.close()
+
+    def fetch_page(self, offset, limit, sort_column=None, descending=None, filters=None):
+        """Fetch one page of rows as a RowStore."""
+        where, params = self.where(filters)
+        query = (
+            f"{self.select} {self.from_clause} {where} "
+            f"{self.order_by(sort_column, descending)} LIMIT ? OFFSET ?"
+        )
+        connection = connect()
+        try:
+            cursor = connection.execute(query, [*params, limit, offset])
+            return RowStore.from_cursor(cursor)
+        except Exception as e:
+            logger.exception("Error fetching grid page: %s", e)
+            raise
+        finally:
+            connection.close()
@@ -1,161 +1,576 @@
-import sqlite3
+import logging
+import json
+from datetime import date
 import pandas as pd
-DATABASE = "rental_management_v2.db"
+from controllers.change_feed_controller import id_chunks
+from controllers.database import connect, connect_report
+from controllers.queries import register, execute
+from controllers.archive_controller import attach_archives
+from controllers.row_store import RowStore
+from controllers.grid_query import GridQuery
+from controllers.property_controller import property_scope, register_scoped, execute_scoped
+from controllers.shard_controller import federated, concat_frames
+from controllers.typed_frames import read_typed, CATEGORY, DATE, INTEGER
+from controllers.chunked_aggregate import stream_frames, CHUNK_ROWS
 
-def fetch_leases():
-    """Fetch all leases."""
-    connection = sqlite3.connect(DATABASE)
+logger = logging.getLogger(__name__)
+
+# Occupancy a room should have given its leases; used wherever leases change
+ROOM_STATUS_FROM_LEASES = """
+CASE
+    WHEN EXISTS (SELECT 1 FROM Lease l WHERE l.room_id = Room.id AND l.status = 'Active') THEN 'Rented'
+    WHEN occupancy_status = 'Maintenance' THEN 'Maintenance'
+    ELSE 'Available'
+END
+"""
+
+# Lease Management grid: same columns as fetch_leases, sorted and filtered
+# in SQL by displayed column number
+LEASE_GRID = GridQuery(
+    select="""
+    SELECT l.id AS lease_id, r.name AS room_name, t.first_name || ' ' || t.last_name AS tenant_name,
+           l.start_date, l.end_date, l.status""",
+    from_clause="""
+    FROM Lease l
+    JOIN Room r ON l.room_id = r.id
+    JOIN Tenant t ON l.tenant_id = t.id""",
+    columns=[
+        ("l.id", "exact"),
+        ("r.name", "prefix"),
+        ("t.first_name || ' ' || t.last_name", "contains"),
+        ("l.start_date", "prefix"),
+        ("l.end_date", "prefix"),
+        ("l.status", "exact"),
+    ],
+    id_column="l.id",
+    default_sort=(3, True),
+    scope=("r.property_id", "property"),
+)
+
+register_scoped("lease.fetch_all", """
+SELECT l.id AS lease_id, r.name AS room_name, t.first_name || ' ' || t.last_name AS tenant_name,
+       l.start_date, l.end_date, l.status
+FROM Lease l
+JOIN Room r ON l.room_id = r.id
+JOIN Tenant t ON l.tenant_id = t.id{where}
+ORDER BY l.start_date DESC
+""", "r.property_id")
+
+def fetch_leases(as_store=False):
+    """Fetch all leases (as a compact RowStore when as_store is set)."""
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        SELECT l.id AS lease_id, r.name AS room_name, t.first_name || ' ' || t.last_name AS tenant_name,
-               l.start_date, l.end_date, l.status
-        FROM Lease l
-        JOIN Room r ON l.room_id = r.id
-        JOIN Tenant t ON l.tenant_id = t.id
-        ORDER BY l.start_date DESC
-        """)
+        execute_scoped(cursor, "lease.fetch_all")
+        if as_store:
+            return RowStore.from_cursor(cursor)
         return cursor.fetchall()
     except Exception as e:
-        print(f"Error fetching leases: {e}")
-        return []
+        logger.exception("Error fetching leases: %s", e)
+        return RowStore() if as_store else []
+    finally:
+        connection.close()
+
+def fetch_leases_affected(lease_ids=(), room_ids=(), tenant_ids=(), shown_ids=None):
+    """Fetch leases that changed or whose room/tenant changed.
+
+    shown_ids, if given, limits the room/tenant matches to those leases
+    (e.g. the ones a view has loaded).
+
+    Returns {lease_id: row}; lease ids that are missing were deleted or
+    are outside the selected property.
+    """
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        scope, scope_params = property_scope("r.property_id")
+        leases = {}
+        for column, ids in (("l.id", lease_ids), ("l.room_id", room_ids), ("l.tenant_id", tenant_ids)):
+            if not ids:
+                continue
+            # Room and tenant changes are only looked up among the shown rows
+            shown_only = shown_ids is not None and column != "l.id"
+            for chunk in id_chunks(shown_ids if shown_only else ids):
+                placeholders = ", ".join("?" for _ in chunk)
+                if shown_only:
+                    condition = f"l.id IN ({placeholders}) AND {column} IN (SELECT value FROM json_each(?))"
+                    condition_params = [*chunk, json.dumps(list(ids))]
+                else:
+                    condition, condition_params = f"{column} IN ({placeholders})", chunk
+                cursor.execute(f"""
+                SELECT l.id AS lease_id, r.name AS room_name, t.first_name || ' ' || t.last_name AS tenant_name,
+                       l.start_date, l.end_date, l.status
+                FROM Lease l
+                JOIN Room r ON l.room_id = r.id
+                JOIN Tenant t ON l.tenant_id = t.id
+                WHERE {condition}{scope}
+                """, [*condition_params, *scope_params])
+                for lease in cursor.fetchall():
+                    leases[lease[0]] = lease
+        return leases
+    except Exception as e:
+        logger.exception("Error fetching changed leases: %s", e)
+        raise
     finally:
         connection.close()
 
+register("lease.cancel", """
+UPDATE Lease
+SET status = 'Canceled'
+WHERE id = ?
+""")
+
+register("room.release_for_lease", """
+UPDATE Room
+SET occupancy_status = 'Available'
+WHERE id = (SELECT room_id FROM Lease WHERE id = ?)
+""")
+
 def cancel_lease(lease_id):
     """Cancel a lease and update the room's status."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
         # Update lease status to "Canceled"
-        cursor.execute("""
-        UPDATE Lease
-        SET status = 'Canceled'
-        WHERE id = ?
-        """, (lease_id,))
+        execute(cursor, "lease.cancel", (lease_id,))
 
         # Set the associated room's occupancy status to "Available"
-        cursor.execute("""
-        UPDATE Room
-        SET occupancy_status = 'Available'
-        WHERE id = (SELECT room_id FROM Lease WHERE id = ?)
-        """, (lease_id,))
+        execute(cursor, "room.release_for_lease", (lease_id,))
         connection.commit()
     except Exception as e:
-        print(f"Error canceling lease: {e}")
+        logger.exception("Error canceling lease: %s", e)
         raise
     finally:
         connection.close()
 
+register("lease.fetch_room", "SELECT room_id FROM Lease WHERE id = ?")
+
+register("lease.delete", "DELETE FROM Lease WHERE id = ?")
+
 def delete_lease(lease_id):
-    """Delete a lease."""
-    connection = sqlite3.connect(DATABASE)
+    """Delete a lease and reset its room's occupancy."""
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("DELETE FROM Lease WHERE id = ?", (lease_id,))
+        execute(cursor, "lease.fetch_room", (lease_id,))
+        lease = cursor.fetchone()
+        execute(cursor, "lease.delete", (lease_id,))
+        if lease is not None:
+            cursor.execute(f"""
+            UPDATE Room
+            SET occupancy_status = {ROOM_STATUS_FROM_LEASES}
+            WHERE id = ?
+            """, (lease[0],))
         connection.commit()
     except Exception as e:
-        print(f"Error deleting lease: {e}")
+        connection.rollback()
+        logger.exception("Error deleting lease: %s", e)
         raise
     finally:
         connection.close()
         
+register_scoped("lease.fetch_available_rooms", "SELECT id, name FROM Room WHERE occupancy_status = 'Available'{scope}", "property_id")
+
 def fetch_available_rooms():
     """Fetch all available rooms."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        SELECT id, name FROM Room WHERE occupancy_status = 'Available'
-        """)
+        execute_scoped(cursor, "lease.fetch_available_rooms")
         return cursor.fetchall()
     except Exception as e:
-        print(f"Error fetching available rooms: {e}")
+        logger.exception("Error fetching available rooms: %s", e)
         return []
     finally:
         connection.close()
 
+register("lease.fetch_tenants", "SELECT id, first_name || ' ' || last_name AS name FROM Tenant")
+
 def fetch_tenants():
     """Fetch all tenants."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        SELECT id, first_name || ' ' || last_name AS name FROM Tenant
-        """)
+        execute(cursor, "lease.fetch_tenants")
         return cursor.fetchall()
     except Exception as e:
-        print(f"Error fetching tenants: {e}")
+        logger.exception("Error fetching tenants: %s", e)
         return []
     finally:
         connection.close()
 
+register("lease.count_overlapping", """
+SELECT COUNT(*) FROM Lease
+WHERE room_id = ? AND status = 'Active'
+AND (start_date BETWEEN ? AND ? OR end_date BETWEEN ? AND ?)
+""")
+
+register("lease.insert", """
+INSERT INTO Lease (room_id, tenant_id, start_date, end_date, status)
+VALUES (?, ?, ?, ?, 'Active')
+""")
+
+register("room.mark_rented", "UPDATE Room SET occupancy_status = 'Rented' WHERE id = ?")
+
 def create_lease(room_id, tenant_id, start_date, end_date):
     """Create a new lease."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
         # Check for overlapping leases
-        cursor.execute("""
-        SELECT COUNT(*) FROM Lease
-        WHERE room_id = ? AND status = 'Active'
-        AND (start_date BETWEEN ? AND ? OR end_date BETWEEN ? AND ?)
-        """, (room_id, start_date, end_date, start_date, end_date))
+        execute(cursor, "lease.count_overlapping", (room_id, start_date, end_date, start_date, end_date))
         if cursor.fetchone()[0] > 0:
             raise Exception("This room already has an active lease in the selected period.")
 
         # Insert lease and update room status
-        cursor.execute("""
-        INSERT INTO Lease (room_id, tenant_id, start_date, end_date, status)
-        VALUES (?, ?, ?, ?, 'Active')
-        """, (room_id, tenant_id, start_date, end_date))
-        cursor.execute("""
-        UPDATE Room SET occupancy_status = 'Rented' WHERE id = ?
-        """, (room_id,))
+        execute(cursor, "lease.insert", (room_id, tenant_id, start_date, end_date))
+        execute(cursor, "room.mark_rented", (room_id,))
         connection.commit()
     except Exception as e:
         connection.rollback()
-        print(f"Error creating lease: {e}")
+        logger.exception("Error creating lease: %s", e)
         raise
     finally:
         connection.close()     
         
+register("lease.update", """
+UPDATE Lease
+SET start_date = ?, end_date = ?, status = ?
+WHERE id = ?
+""")
+
+register("room.rent_for_lease", """
+UPDATE Room
+SET occupancy_status = 'Rented'
+WHERE id = (SELECT room_id FROM Lease WHERE id = ?)
+""")
+
 def update_lease(lease_id, start_date, end_date, status):
     """Update lease details and handle automatic updates."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
         # Update lease details
-        cursor.execute("""
-        UPDATE Lease
-        SET start_date = ?, end_date = ?, status = ?
-        WHERE id = ?
-        """, (start_date, end_date, status, lease_id))
+        execute(cursor, "lease.update", (start_date, end_date, status, lease_id))
 
         # Handle automatic updates for room status
         if status == "Completed":
-            cursor.execute("""
-            UPDATE Room
-            SET occupancy_status = 'Available'
-            WHERE id = (SELECT room_id FROM Lease WHERE id = ?)
-            """, (lease_id,))
+            execute(cursor, "room.release_for_lease", (lease_id,))
         elif status == "Canceled":
-            cursor.execute("""
-            UPDATE Room
-            SET occupancy_status = 'Available'
-            WHERE id = (SELECT room_id FROM Lease WHERE id = ?)
-            """, (lease_id,))
+            execute(cursor, "room.release_for_lease", (lease_id,))
         elif status == "Active":
-            cursor.execute("""
-            UPDATE Room
-            SET occupancy_status = 'Rented'
-            WHERE id = (SELECT room_id FROM Lease WHERE id = ?)
-            """, (lease_id,))    
+            execute(cursor, "room.rent_for_lease", (lease_id,))    
+
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error updating lease: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+## bulk operations
+register("lease.bulk_create_temp", "CREATE TEMP TABLE IF NOT EXISTS BulkLease (id INTEGER PRIMARY KEY)")
 
+register("lease.bulk_clear_temp", "DELETE FROM temp.BulkLease")
+
+def _select_bulk_leases(cursor, lease_ids=None, status=None, end_date_from=None, end_date_to=None, room_ids=None,
+                        property_id=None):
+    """Collect the target lease ids into the temp.BulkLease table.
+
+    Explicit lease_ids and the filters combine with AND; every filter is
+    optional, but at least one must be given.
+    """
+    conditions, params = [], []
+    if status is not None:
+        conditions.append("status = ?")
+        params.append(status)
+    if end_date_from is not None:
+        conditions.append("end_date >= ?")
+        params.append(end_date_from)
+    if end_date_to is not None:
+        conditions.append("end_date <= ?")
+        params.append(end_date_to)
+    if room_ids is not None:
+        conditions.append("room_id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(list(room_ids)))
+    if property_id is not None:
+        conditions.append("room_id IN (SELECT id FROM Room WHERE property_id = ?)")
+        params.append(property_id)
+    if lease_ids is not None:
+        conditions.append("id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(list(lease_ids)))
+    if not conditions:
+        raise ValueError("Bulk lease operations need lease ids or at least one filter.")
+
+    execute(cursor, "lease.bulk_create_temp")
+    execute(cursor, "lease.bulk_clear_temp")
+    cursor.execute(f"""
+    INSERT INTO temp.BulkLease (id)
+    SELECT id FROM Lease
+    WHERE {" AND ".join(conditions)}
+    """, params)
+
+
+def _sync_bulk_room_status(cursor):
+    """Recompute occupancy for every room touched by the bulk selection."""
+    cursor.execute(f"""
+    UPDATE Room
+    SET occupancy_status = {ROOM_STATUS_FROM_LEASES}
+    WHERE id IN (
+        SELECT DISTINCT l.room_id FROM Lease l JOIN temp.BulkLease b ON b.id = l.id
+    )
+    """)
+
+
+register("lease.bulk_set_status", """
+UPDATE Lease
+SET status = ?
+WHERE id IN (SELECT id FROM temp.BulkLease)
+""")
+
+def bulk_update_lease_status(new_status, **filters):
+    """Set the status of many leases in one transaction.
+
+    filters: lease_ids, status (the leases' current status), end_date_from,
+    end_date_to, room_ids, property_id.
+    Returns the number of leases updated.
+    """
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        _select_bulk_leases(cursor, **filters)
+        execute(cursor, "lease.bulk_set_status", (new_status,))
+        updated = cursor.rowcount
+        _sync_bulk_room_status(cursor)
         connection.commit()
+        return updated
     except Exception as e:
         connection.rollback()
-        print(f"Error updating lease: {e}")
+        logger.exception("Error updating leases in bulk: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+def bulk_cancel_leases(**filters):
+    """Cancel many leases and free their rooms in one transaction."""
+    return bulk_update_lease_status("Canceled", **filters)
+
+
+# End date of a renewed lease: :new_end_date, or the current one moved
+# :extend_days later
+RENEWED_END_DATE = "COALESCE(:new_end_date, date(l.end_date, :extend_days || ' days'))"
+
+# Active leases on the same room that a renewal would run into: ones
+# starting after the selected lease ends, on or before its new end date
+register("lease.count_renewal_overlaps", f"""
+SELECT COUNT(*)
+FROM temp.BulkLease b
+JOIN Lease l ON l.id = b.id
+JOIN Lease o ON o.room_id = l.room_id AND o.id != l.id AND o.status = 'Active'
+WHERE l.status = 'Active'
+AND o.start_date > l.end_date AND o.start_date <= {RENEWED_END_DATE}
+""")
+
+register("lease.renew_selected", f"""
+UPDATE Lease AS l
+SET end_date = {RENEWED_END_DATE}
+WHERE l.id IN (SELECT id FROM temp.BulkLease) AND l.status = 'Active'
+""")
+
+def bulk_renew_leases(new_end_date=None, extend_days=None, **filters):
+    """Renew many active leases, either to a fixed end date or by a number of days.
+
+    filters are those of bulk_update_lease_status; leases that are not
+    Active are left alone, and nothing is renewed if a renewal would
+    overlap another active lease on the same room. Rooms stay rented to
+    the same tenants. Returns the number of leases renewed.
+    """
+    if (new_end_date is None) == (extend_days is None):
+        raise ValueError("Give exactly one of new_end_date or extend_days.")
+    params = {
+        "new_end_date": new_end_date,
+        "extend_days": None if extend_days is None else f"+{int(extend_days)}",
+    }
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        _select_bulk_leases(cursor, **filters)
+        execute(cursor, "lease.count_renewal_overlaps", params)
+        if cursor.fetchone()[0] > 0:
+            raise Exception("Renewing would overlap another active lease on the same room.")
+        execute(cursor, "lease.renew_selected", params)
+        renewed = cursor.rowcount
+        connection.commit()
+        return renewed
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error renewing leases in bulk: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+## termination
+# Settlement of every Active lease in temp.BulkLease at :termination_date
+# (clamped to the lease's own dates); a lease settled before and renewed
+# since is settled again. Rent is charged per period of 1, 3 or
+# 12 months from the lease start, by the room's payment_frequency:
+#   prorated_rent      share of the final period's rent for the days used
+#   unpaid_balance     Pending/Overdue payments dated before the final period
+#   final_period_paid  Paid payments dated in the final period (credited)
+# The security deposit covers what is owed; the rest is refunded, or is
+# left as balance_due when the deposit falls short.
+register("lease.settle_selected", """
+INSERT INTO LeaseSettlement (
+    lease_id, room_id, tenant_id, termination_date, prorated_rent, unpaid_balance,
+    final_period_paid, security_deposit, deposit_refund, balance_due
+)
+WITH target AS (
+    SELECT l.id AS lease_id, l.room_id, l.tenant_id, l.start_date,
+           MAX(l.start_date, MIN(:termination_date, l.end_date)) AS termination_date,
+           COALESCE(r.rental_price, 0) AS rental_price,
+           COALESCE(r.security_deposit, 0) AS security_deposit,
+           CASE r.payment_frequency WHEN 'Quarterly' THEN 3 WHEN 'Yearly' THEN 12 ELSE 1 END AS period_months
+    FROM temp.BulkLease b
+    JOIN Lease l ON l.id = b.id
+    JOIN Room r ON r.id = l.room_id
+    WHERE l.status = 'Active'
+),
+elapsed AS (
+    SELECT *,
+           ((CAST(strftime('%Y', termination_date) AS INTEGER) - CAST(strftime('%Y', start_date) AS INTEGER)) * 12
+            + CAST(strftime('%m', termination_date) AS INTEGER) - CAST(strftime('%m', start_date) AS INTEGER)
+            - (strftime('%d', termination_date) < strftime('%d', start_date))) / period_months AS periods
+    FROM target
+),
+final_period AS (
+    SELECT *,
+           date(start_date, '+' || (periods * period_months) || ' months') AS period_start,
+           date(start_date, '+' || ((periods + 1) * period_months) || ' months') AS period_end
+    FROM elapsed
+),
+amounts AS (
+    SELECT f.lease_id, f.room_id, f.tenant_id, f.termination_date, f.security_deposit,
+           ROUND(f.rental_price * (julianday(f.termination_date) - julianday(f.period_start))
+                 / (julianday(f.period_end) - julianday(f.period_start)), 2) AS prorated_rent,
+           COALESCE(SUM(p.amount) FILTER (
+               WHERE p.payment_status IN ('Pending', 'Overdue') AND p.date < f.period_start
+           ), 0) AS unpaid_balance,
+           COALESCE(SUM(p.amount) FILTER (
+               WHERE p.payment_status = 'Paid' AND p.date >= f.period_start
+           ), 0) AS final_period_paid
+    FROM final_period f
+    LEFT JOIN Payment p
+           ON p.room_id = f.room_id AND p.tenant_id = f.tenant_id
+          AND p.date >= f.start_date AND p.date < f.period_end
+    GROUP BY f.lease_id
+)
+SELECT lease_id, room_id, tenant_id, termination_date, prorated_rent, unpaid_balance,
+       final_period_paid, security_deposit,
+       ROUND(MAX(security_deposit - (prorated_rent + unpaid_balance - final_period_paid), 0), 2) AS deposit_refund,
+       ROUND(MAX(prorated_rent + unpaid_balance - final_period_paid - security_deposit, 0), 2) AS balance_due
+FROM amounts
+WHERE 1
+ON CONFLICT (lease_id) DO UPDATE SET
+    termination_date = excluded.termination_date,
+    prorated_rent = excluded.prorated_rent,
+    unpaid_balance = excluded.unpaid_balance,
+    final_period_paid = excluded.final_period_paid,
+    security_deposit = excluded.security_deposit,
+    deposit_refund = excluded.deposit_refund,
+    balance_due = excluded.balance_due,
+    settled_at = CURRENT_TIMESTAMP
+""")
+
+register("lease.end_settled", """
+UPDATE Lease
+SET status = 'Completed',
+    end_date = (SELECT termination_date FROM LeaseSettlement s WHERE s.lease_id = Lease.id)
+WHERE status = 'Active'
+  AND id IN (SELECT id FROM temp.BulkLease)
+""")
+
+register("lease.fetch_settlement", """
+SELECT lease_id, room_id, tenant_id, termination_date, prorated_rent, unpaid_balance,
+       final_period_paid, security_deposit, deposit_refund, balance_due
+FROM LeaseSettlement
+WHERE lease_id = ?
+""")
+
+SETTLEMENT_FIELDS = [
+    "lease_id", "room_id", "tenant_id", "termination_date", "prorated_rent", "unpaid_balance",
+    "final_period_paid", "security_deposit", "deposit_refund", "balance_due",
+]
+
+
+def _terminate_selected(cursor, termination_date):
+    """Settle and end the Active leases in temp.BulkLease; returns how many."""
+    execute(cursor, "lease.settle_selected", {"termination_date": termination_date})
+    execute(cursor, "lease.end_settled")
+    terminated = cursor.rowcount
+    # Free the rooms and point them at the tenant of any lease still active
+    cursor.execute(f"""
+    UPDATE Room
+    SET occupancy_status = {ROOM_STATUS_FROM_LEASES},
+        tenant_id = (
+            SELECT l.tenant_id FROM Lease l
+            WHERE l.room_id = Room.id AND l.status = 'Active'
+            ORDER BY l.start_date DESC, l.id DESC
+            LIMIT 1
+        )
+    WHERE id IN (
+        SELECT DISTINCT l.room_id FROM Lease l JOIN temp.BulkLease b ON b.id = l.id
+    )
+    """)
+    return terminated
+
+
+def terminate_lease(lease_id, termination_date=None):
+    """End an active lease early and settle it in one transaction.
+
+    termination_date is YYYY-MM-DD (default today). The settlement (prorated
+    rent, unpaid balance, deposit refund) is stored in LeaseSettlement and
+    returned as a dict; the lease becomes Completed on that date and its
+    room is released.
+    """
+    termination_date = termination_date or date.today().isoformat()
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        _select_bulk_leases(cursor, lease_ids=[lease_id])
+        if not _terminate_selected(cursor, termination_date):
+            raise ValueError(f"Lease {lease_id} is not active.")
+        execute(cursor, "lease.fetch_settlement", (lease_id,))
+        settlement = dict(zip(SETTLEMENT_FIELDS, cursor.fetchone()))
+        connection.commit()
+        return settlement
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error terminating lease: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+def bulk_terminate_leases(termination_date, **filters):
+    """Terminate and settle many active leases on one date, in one transaction.
+
+    filters are those of bulk_update_lease_status; leases that are not
+    Active are left alone. Returns the number of leases terminated.
+    """
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        _select_bulk_leases(cursor, **filters)
+        terminated = _terminate_selected(cursor, termination_date)
+        connection.commit()
+        return terminated
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error terminating leases in bulk: %s", e)
         raise
     finally:
         connection.close()
@@ -163,7 +578,7 @@ def update_lease(lease_id, start_date, end_date, status):
   ## for report
 # def fetch_lease_data():
 #     """Fetch detailed lease data for the Lease Report."""
-#     connection = sqlite3.connect(DATABASE)
+#     connection = connect()
 #     try:
 #         query = """
 #         SELECT
@@ -191,36 +606,70 @@ def update_lease(lease_id, start_date, end_date, status):
 #         connection.close()    
 
 
-def fetch_lease_data():
-    """Fetch detailed lease data for the Lease Report."""
-    connection = sqlite3.connect(DATABASE)
+LEASE_DATA_TYPES = {
+    "lease_id": INTEGER,
+    "room_id": INTEGER,
+    "room_name": CATEGORY,
+    "tenant_name": CATEGORY,
+    "tenant_id": INTEGER,
+    "start_date": DATE,
+    "end_date": DATE,
+    "status": CATEGORY,
+    "active_lease_flag": INTEGER,
+}
+
+
+def _lease_data_query(connection, include_archive):
+    scope, params = property_scope("r.property_id")
+    lease_table = "Lease"
+    if include_archive:
+        attach_archives(connection)
+        lease_table = "AllLease"
+    query = f"""
+    SELECT
+        l.id AS lease_id,
+        r.id AS room_id,  -- Explicitly select room_id
+        r.name AS room_name,
+        t.first_name || ' ' || t.last_name AS tenant_name,
+        t.id AS tenant_id,
+        l.start_date,
+        l.end_date,
+        l.status,
+        (julianday(l.end_date) - julianday(l.start_date)) AS lease_duration,
+        CASE
+            WHEN l.status = 'Active' THEN 1
+            ELSE 0
+        END AS active_lease_flag
+    FROM {lease_table} l
+    JOIN Room r ON l.room_id = r.id
+    JOIN Tenant t ON l.tenant_id = t.id
+    WHERE 1 = 1{scope}
+    """
+    return query, params
+
+
+@federated(concat_frames)
+def fetch_lease_data(include_archive=False):
+    """Fetch detailed lease data for the Lease Report.
+
+    Live leases only, unless include_archive adds the archived years.
+    Limited to the selected property's rooms.
+    """
+    connection = connect_report()
     try:
-        query = """
-        SELECT
-            l.id AS lease_id,
-            r.id AS room_id,  -- Explicitly select room_id
-            r.name AS room_name,
-            t.first_name || ' ' || t.last_name AS tenant_name,
-            t.id AS tenant_id,
-            l.start_date,
-            l.end_date,
-            l.status,
-            (julianday(l.end_date) - julianday(l.start_date)) AS lease_duration,
-            CASE
-                WHEN l.status = 'Active' THEN 1
-                ELSE 0
-            END AS active_lease_flag
-        FROM Lease l
-        JOIN Room r ON l.room_id = r.id
-        JOIN Tenant t ON l.tenant_id = t.id
-        """
-        df = pd.read_sql_query(query, connection)
-        return df
+        query, params = _lease_data_query(connection, include_archive)
+        return read_typed(query, connection, LEASE_DATA_TYPES, params)
     except Exception as e:
-        print(f"Error fetching lease data for report: {e}")
+        logger.exception("Error fetching lease data for report: %s", e)
         return pd.DataFrame()  # Return empty DataFrame on error
     finally:
         connection.close()
+
+
+def iter_lease_data(include_archive=False, chunk_size=CHUNK_ROWS):
+    """fetch_lease_data's rows as DataFrames of at most chunk_size rows."""
+    return stream_frames(lambda connection: _lease_data_query(connection, include_archive),
+                         LEASE_DATA_TYPES, chunk_size)
   
         
            
@@ -1,60 +1,171 @@
-# import pandas as pd
-# from matplotlib import pyplot as plt
-# ##import from other
-# from controllers.tenant_controller import  fetch_tenant_data  # Assume these fetch data from the database
-# from controllers.room_controller import fetch_room_data
-# from controllers.lease_management_controller import fetch_lease_data
-# class LeaseReportController:
-#     def __init__(self):
-#         self.lease_data = pd.DataFrame(fetch_lease_data())
-#         self.room_data = pd.DataFrame(fetch_room_data())
-#         self.tenant_data = pd.DataFrame(fetch_tenant_data())
-
-#     def get_lease_summary(self):
-#         total_leases = len(self.lease_data)
-#         active_leases = len(self.lease_data[self.lease_data['status'] == 'Active'])
-#         completed_leases = len(self.lease_data[self.lease_data['status'] == 'Completed'])
-#         canceled_leases = len(self.lease_data[self.lease_data['status'] == 'Canceled'])
-
-#         total_rooms = len(self.room_data)
-#         rented_rooms = len(self.lease_data[self.lease_data['status'] == 'Active']['room_id'].unique())
-#         occupancy_rate = (rented_rooms / total_rooms) * 100 if total_rooms > 0 else 0
-
-#         return {
-#             "total_leases": total_leases,
-#             "active_leases": active_leases,
-#             "completed_leases": completed_leases,
-#             "canceled_leases": canceled_leases,
-#             "occupancy_rate": occupancy_rate
-#         }
-
-#     def generate_status_pie_chart(self):
-#         statuses = self.lease_data['status'].value_counts()
-#         labels = statuses.index
-#         sizes = statuses.values
-#         colors = ['green', 'blue', 'red']
-
-#         plt.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
-#         plt.title("Lease Status Breakdown")
-#         plt.savefig("lease_status_pie_chart.png")
-#         plt.close()
-
-#     def generate_revenue_bar_chart(self):
-#         revenue_by_room = self.lease_data.groupby('room_id')['revenue'].sum().reset_index()
-#         revenue_by_room.columns = ['Room ID', 'Total Revenue']
-
-#         plt.bar(revenue_by_room['Room ID'], revenue_by_room['Total Revenue'], color='orange')
-#         plt.title("Revenue Contribution by Room")
-#         plt.xlabel("Room ID")
-#         plt.ylabel("Total Revenue")
-#         plt.savefig("room_revenue_bar_chart.png")
-#         plt.close()
-
-#     def generate_lease_duration_histogram(self):
-#         lease_durations = self.lease_data['duration']
-#         plt.hist(lease_durations, bins=10, color='purple')
-#         plt.title("Lease Duration Distribution")
-#         plt.xlabel("Duration (days)")
-#         plt.ylabel("Number of Leases")
-#         plt.savefig("lease_duration_histogram.png")
-#         plt.close()
+import logging
+import sqlite3
+import pandas as pd
+
+from controllers.database import connect_report
+from controllers.archive_controller import attach_archives
+from controllers.property_controller import property_scope
+from controllers.shard_controller import federated, sum_frames
+from controllers.report_loader import load_report_datasets
+from controllers.revenue_cube_controller import fetch_revenue_by_room
+
+logger = logging.getLogger(__name__)
+
+# Every lease report is one grouped query; none returns more than a few
+# hundred rows, however many leases there are.
+REVENUE_ROOM_LIMIT = 25
+DURATION_BUCKET_DAYS = 30
+
+
+def _int_columns(df, *columns):
+    # An empty result carries no SQLite types, so its columns come back as
+    # object; charts and sums need the counts numeric either way
+    return df.astype({column: "int64" for column in columns})
+
+
+def _lease_source(conn, include_archive):
+    if include_archive:
+        attach_archives(conn)
+        return "AllLease"
+    return "Lease"
+
+
+@federated(sum_frames("status"))
+def fetch_lease_status_breakdown(include_archive=False):
+    """Number of leases per status."""
+    conn = connect_report()
+    try:
+        lease_table = _lease_source(conn, include_archive)
+        scope, params = property_scope("room_id", "room")
+        query = f"""
+        SELECT COALESCE(status, 'Active') AS status, COUNT(*) AS lease_count
+        FROM {lease_table}
+        WHERE 1 = 1{scope}
+        GROUP BY 1
+        ORDER BY 1
+        """
+        df = _int_columns(pd.read_sql_query(query, conn, params=params), "lease_count")
+    except (sqlite3.Error, pd.errors.DatabaseError) as error:
+        logger.exception("Error fetching lease status breakdown: %s", error)
+        df = _int_columns(pd.DataFrame(columns=["status", "lease_count"]), "lease_count")
+    finally:
+        conn.close()
+    return df
+
+
+@federated(sum_frames("bucket", "min_days", "max_days"))
+def fetch_lease_duration_histogram(bucket_days=DURATION_BUCKET_DAYS, include_archive=False):
+    """Lease count per duration bucket of bucket_days days.
+
+    min_days and max_days bound the bucket (max_days exclusive). Leases
+    whose dates do not parse have no duration and are left out.
+    """
+    conn = connect_report()
+    try:
+        lease_table = _lease_source(conn, include_archive)
+        scope, params = property_scope("room_id", "room", named=True)
+        query = f"""
+        SELECT bucket,
+               bucket * :bucket_days AS min_days,
+               (bucket + 1) * :bucket_days AS max_days,
+               COUNT(*) AS lease_count
+        FROM (
+            SELECT CAST((julianday(end_date) - julianday(start_date)) / :bucket_days AS INTEGER) AS bucket
+            FROM {lease_table}
+            WHERE julianday(start_date) IS NOT NULL AND julianday(end_date) IS NOT NULL{scope}
+        )
+        GROUP BY bucket
+        ORDER BY bucket
+        """
+        df = pd.read_sql_query(query, conn, params={**params, "bucket_days": bucket_days})
+        df = _int_columns(df, "bucket", "min_days", "max_days", "lease_count")
+    except (sqlite3.Error, pd.errors.DatabaseError) as error:
+        logger.exception("Error fetching lease duration histogram: %s", error)
+        df = _int_columns(pd.DataFrame(columns=["bucket", "min_days", "max_days", "lease_count"]),
+                          "bucket", "min_days", "max_days", "lease_count")
+    finally:
+        conn.close()
+    return df
+
+
+@federated(sum_frames("room_type"))
+def fetch_lease_occupancy():
+    """Rooms and rooms under an active lease, per room type."""
+    conn = connect_report()
+    try:
+        scope, params = property_scope("r.property_id")
+        query = f"""
+        SELECT COALESCE(r.type, 'Unknown') AS room_type,
+               COUNT(*) AS total_rooms,
+               SUM(EXISTS (
+                   SELECT 1 FROM Lease l WHERE l.room_id = r.id AND l.status = 'Active'
+               )) AS leased_rooms
+        FROM Room r
+        WHERE 1 = 1{scope}
+        GROUP BY 1
+        ORDER BY 1
+        """
+        df = _int_columns(pd.read_sql_query(query, conn, params=params), "total_rooms", "leased_rooms")
+    except (sqlite3.Error, pd.errors.DatabaseError) as error:
+        logger.exception("Error fetching lease occupancy: %s", error)
+        df = _int_columns(pd.DataFrame(columns=["room_type", "total_rooms", "leased_rooms"]),
+                          "total_rooms", "leased_rooms")
+    finally:
+        conn.close()
+    return df
+
+
+class LeaseReportController:
+    def load_report(self, report, include_archive=False):
+        """The summary and one report's data, read from the same database state.
+
+        report is a name from the view's selector. Returns (summary dict, DataFrame).
+        """
+        fetch = {
+            "Status Breakdown": lambda: self.get_status_breakdown(include_archive),
+            "Revenue by Room": lambda: self.get_revenue_by_room(include_archive=include_archive),
+            "Lease Duration": lambda: self.get_duration_histogram(include_archive=include_archive),
+            "Occupancy Rate": self.get_occupancy_rate,
+        }[report]
+        datasets = load_report_datasets({
+            "statuses": lambda: fetch_lease_status_breakdown(include_archive),
+            "occupancy": self.get_occupancy_rate,
+            "data": fetch,
+        }, include_archive)
+        return _summarize(datasets["statuses"], datasets["occupancy"]), datasets["data"]
+
+    def get_lease_summary(self, include_archive=False):
+        """Totals per lease status and the share of rooms under an active lease."""
+        datasets = load_report_datasets({
+            "statuses": lambda: fetch_lease_status_breakdown(include_archive),
+            "occupancy": self.get_occupancy_rate,
+        }, include_archive)
+        return _summarize(datasets["statuses"], datasets["occupancy"])
+
+    def get_status_breakdown(self, include_archive=False):
+        return fetch_lease_status_breakdown(include_archive)
+
+    def get_revenue_by_room(self, limit=REVENUE_ROOM_LIMIT, include_archive=False):
+        return fetch_revenue_by_room(limit, include_archive).head(limit)
+
+    def get_duration_histogram(self, bucket_days=DURATION_BUCKET_DAYS, include_archive=False):
+        return fetch_lease_duration_histogram(bucket_days, include_archive)
+
+    def get_occupancy_rate(self):
+        """Occupancy per room type; the rate is worked out after the shards are added up."""
+        df = fetch_lease_occupancy()
+        df["occupancy_rate"] = (df["leased_rooms"] / df["total_rooms"] * 100).round(1)
+        return df
+
+
+def _summarize(statuses, occupancy):
+    counts = dict(zip(statuses["status"], statuses["lease_count"]))
+    total_rooms = int(occupancy["total_rooms"].sum())
+    leased_rooms = int(occupancy["leased_rooms"].sum())
+    return {
+        "total_leases": int(statuses["lease_count"].sum()),
+        "active_leases": int(counts.get("Active", 0)),
+        "completed_leases": int(counts.get("Completed", 0)),
+        "canceled_leases": int(counts.get("Canceled", 0)),
+        "occupancy_rate": leased_rooms / total_rooms * 100 if total_rooms else 0.0,
+    }
@@ -1,168 +1,338 @@
+import logging
+import json
 import sqlite3
 import pandas as pd
+from controllers.change_feed_controller import id_chunks
 
-DATABASE = "rental_management_v2.db"
+from controllers.database import connect, connect_report
+from controllers.queries import register, execute
+from controllers.archive_controller import attach_archives
+from controllers.row_store import RowStore
+from controllers.grid_query import GridQuery
+from controllers.property_controller import property_scope, register_scoped, execute_scoped
+from controllers.shard_controller import federated, concat_frames, sum_frames
+from controllers.typed_frames import read_typed, CATEGORY, DATE, INTEGER
+from controllers.chunked_aggregate import stream_frames, CHUNK_ROWS
 
-def fetch_payments():
-    """Fetch all payments."""
-    connection = sqlite3.connect(DATABASE)
+logger = logging.getLogger(__name__)
+
+# Payment Management grid: same columns as fetch_payments, sorted and
+# filtered in SQL by displayed column number
+PAYMENT_GRID = GridQuery(
+    select="""
+    SELECT p.id, r.name AS room_name, t.first_name || ' ' || t.last_name AS tenant_name,
+           p.amount, p.date, p.due_date, p.method, p.payment_status, p.reference_number, p.notes""",
+    from_clause="""
+    FROM Payment p
+    JOIN Room r ON p.room_id = r.id
+    JOIN Tenant t ON p.tenant_id = t.id""",
+    columns=[
+        ("p.id", "exact"),
+        ("r.name", "prefix"),
+        ("t.first_name || ' ' || t.last_name", "contains"),
+        ("p.amount", "exact"),
+        ("p.date", "prefix"),
+        ("p.due_date", "prefix"),
+        ("p.method", "exact"),
+        ("p.payment_status", "exact"),
+    ],
+    id_column="p.id",
+    default_sort=(4, True),
+    scope=("r.property_id", "property"),
+)
+
+register_scoped("payment.fetch_all", """
+SELECT p.id, r.name AS room_name, t.first_name || ' ' || t.last_name AS tenant_name,
+       p.amount, p.date, p.due_date, p.method, p.payment_status, p.reference_number, p.notes
+FROM Payment p
+JOIN Room r ON p.room_id = r.id
+JOIN Tenant t ON p.tenant_id = t.id{where}
+ORDER BY p.date DESC
+""", "r.property_id")
+
+def fetch_payments(as_store=False):
+    """Fetch all payments (as a compact RowStore when as_store is set)."""
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        SELECT p.id, r.name AS room_name, t.first_name || ' ' || t.last_name AS tenant_name,
-               p.amount, p.date, p.due_date, p.method, p.payment_status, p.reference_number, p.notes
-        FROM Payment p
-        JOIN Room r ON p.room_id = r.id
-        JOIN Tenant t ON p.tenant_id = t.id
-        ORDER BY p.date DESC
-        """)
+        execute_scoped(cursor, "payment.fetch_all")
+        if as_store:
+            return RowStore.from_cursor(cursor)
         return cursor.fetchall()
     except Exception as e:
-        print(f"Error fetching payments: {e}")
-        return []
+        logger.exception("Error fetching payments: %s", e)
+        return RowStore() if as_store else []
     finally:
         connection.close()
 
+def fetch_payments_affected(payment_ids=(), room_ids=(), tenant_ids=(), shown_ids=None):
+    """Fetch payments that changed or whose room/tenant changed.
+
+    shown_ids, if given, limits the room/tenant matches to those payments
+    (e.g. the ones a view has loaded).
+
+    Returns {payment_id: row}; payment ids that are missing were deleted
+    or are outside the selected property.
+    """
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        scope, scope_params = property_scope("r.property_id")
+        payments = {}
+        for column, ids in (("p.id", payment_ids), ("p.room_id", room_ids), ("p.tenant_id", tenant_ids)):
+            if not ids:
+                continue
+            # Room and tenant changes are only looked up among the shown rows
+            shown_only = shown_ids is not None and column != "p.id"
+            for chunk in id_chunks(shown_ids if shown_only else ids):
+                placeholders = ", ".join("?" for _ in chunk)
+                if shown_only:
+                    condition = f"p.id IN ({placeholders}) AND {column} IN (SELECT value FROM json_each(?))"
+                    condition_params = [*chunk, json.dumps(list(ids))]
+                else:
+                    condition, condition_params = f"{column} IN ({placeholders})", chunk
+                cursor.execute(f"""
+                SELECT p.id, r.name AS room_name, t.first_name || ' ' || t.last_name AS tenant_name,
+                       p.amount, p.date, p.due_date, p.method, p.payment_status, p.reference_number, p.notes
+                FROM Payment p
+                JOIN Room r ON p.room_id = r.id
+                JOIN Tenant t ON p.tenant_id = t.id
+                WHERE {condition}{scope}
+                """, [*condition_params, *scope_params])
+                for payment in cursor.fetchall():
+                    payments[payment[0]] = payment
+        return payments
+    except Exception as e:
+        logger.exception("Error fetching changed payments: %s", e)
+        raise
+    finally:
+        connection.close()
+
+register("payment.insert", """
+INSERT INTO Payment (tenant_id, room_id, amount, date, due_date, method, reference_number, notes, payment_status)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'Paid')
+""")
+
+register("room.add_rent_collected", """
+UPDATE Room
+SET total_rent_collected = total_rent_collected + ?
+WHERE id = ?
+""")
+
 def create_payment(tenant_id, room_id, amount, date, due_date, method, reference, notes):
     """Create a new payment."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        INSERT INTO Payment (tenant_id, room_id, amount, date, due_date, method, reference_number, notes, payment_status)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'Paid')
-        """, (tenant_id, room_id, amount, date, due_date, method, reference, notes))
-        cursor.execute("""
-        UPDATE Room
-        SET total_rent_collected = total_rent_collected + ?
-        WHERE id = ?
-        """, (amount, room_id))
+        execute(cursor, "payment.insert", (tenant_id, room_id, amount, date, due_date, method, reference, notes))
+        execute(cursor, "room.add_rent_collected", (amount, room_id))
         connection.commit()
     except Exception as e:
         connection.rollback()
-        print(f"Error creating payment: {e}")
+        logger.exception("Error creating payment: %s", e)
         raise
     finally:
         connection.close()
 
+register("payment.fetch_room_amount", "SELECT room_id, amount FROM Payment WHERE id = ?")
+
+register("payment.update", """
+UPDATE Payment
+SET amount = ?, date = ?, due_date = ?, method = ?, reference_number = ?, notes = ?, payment_status = ?
+WHERE id = ?
+""")
+
+register("room.adjust_rent_collected", """
+UPDATE Room
+SET total_rent_collected = total_rent_collected - ? + ?
+WHERE id = ?
+""")
+
 def update_payment(payment_id, amount, date, due_date, method, reference, notes, status):
     """Update payment details."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
         # Fetch the original payment amount
-        cursor.execute("SELECT room_id, amount FROM Payment WHERE id = ?", (payment_id,))
+        execute(cursor, "payment.fetch_room_amount", (payment_id,))
         room_id, original_amount = cursor.fetchone()
 
         # Update payment details
-        cursor.execute("""
-        UPDATE Payment
-        SET amount = ?, date = ?, due_date = ?, method = ?, reference_number = ?, notes = ?, payment_status = ?
-        WHERE id = ?
-        """, (amount, date, due_date, method, reference, notes, status, payment_id))
+        execute(cursor, "payment.update", (amount, date, due_date, method, reference, notes, status, payment_id))
 
         # Adjust room's total rent collected
-        cursor.execute("""
-        UPDATE Room
-        SET total_rent_collected = total_rent_collected - ? + ?
-        WHERE id = ?
-        """, (original_amount, amount, room_id))
+        execute(cursor, "room.adjust_rent_collected", (original_amount, amount, room_id))
         connection.commit()
     except Exception as e:
         connection.rollback()
-        print(f"Error updating payment: {e}")
+        logger.exception("Error updating payment: %s", e)
         raise
     finally:
         connection.close()
 
+register("payment.delete", "DELETE FROM Payment WHERE id = ?")
+
+register("room.subtract_rent_collected", """
+UPDATE Room
+SET total_rent_collected = total_rent_collected - ?
+WHERE id = ?
+""")
+
 def delete_payment(payment_id):
     """Delete a payment."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
         # Fetch the original payment amount
-        cursor.execute("SELECT room_id, amount FROM Payment WHERE id = ?", (payment_id,))
+        execute(cursor, "payment.fetch_room_amount", (payment_id,))
         room_id, amount = cursor.fetchone()
 
         # Delete the payment
-        cursor.execute("DELETE FROM Payment WHERE id = ?", (payment_id,))
+        execute(cursor, "payment.delete", (payment_id,))
 
         # Adjust room's total rent collected
-        cursor.execute("""
-        UPDATE Room
-        SET total_rent_collected = total_rent_collected - ?
-        WHERE id = ?
-        """, (amount, room_id))
+        execute(cursor, "room.subtract_rent_collected", (amount, room_id))
         connection.commit()
     except Exception as e:
         connection.rollback()
-        print(f"Error deleting payment: {e}")
+        logger.exception("Error deleting payment: %s", e)
         raise
     finally:
         connection.close()
         
         
+register_scoped("payment.fetch_available_rooms", """
+SELECT id, name 
+FROM Room 
+WHERE occupancy_status = 'Available'{scope}
+""", "property_id")
+
 def fetch_available_rooms():
     """Fetch all available rooms."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        SELECT id, name 
-        FROM Room 
-        WHERE occupancy_status = 'Available'
-        """)
+        execute_scoped(cursor, "payment.fetch_available_rooms")
         return cursor.fetchall()
     except Exception as e:
-        print(f"Error fetching available rooms: {e}")
+        logger.exception("Error fetching available rooms: %s", e)
         return []
     finally:
         connection.close()    
             
+register("payment.fetch_tenants", """
+SELECT id, first_name || ' ' || last_name AS name
+FROM Tenant
+""")
+
 def fetch_tenants():
     """Fetch all tenants."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        SELECT id, first_name || ' ' || last_name AS name
-        FROM Tenant
-        """)
+        execute(cursor, "payment.fetch_tenants")
         return cursor.fetchall()
     except Exception as e:
-        print(f"Error fetching tenants: {e}")
+        logger.exception("Error fetching tenants: %s", e)
         return []
     finally:
         connection.close()  
          
 ## for mapyemnt_report_controller        
-def fetch_payment_data():
-    """Fetch detailed payment data for Payment Report."""
-    connection = sqlite3.connect(DATABASE)
+# A room or tenant name repeats on every one of its payments
+PAYMENT_DATA_TYPES = {
+    "payment_id": INTEGER,
+    "room_id": INTEGER,
+    "room_name": CATEGORY,
+    "tenant_id": INTEGER,
+    "tenant_name": CATEGORY,
+    "due_date": DATE,
+    "payment_date": DATE,
+    "status": CATEGORY,
+}
+
+
+def _payment_data_query(connection, include_archive):
+    scope, params = property_scope("r.property_id")
+    payment_table = "Payment"
+    if include_archive:
+        attach_archives(connection)
+        payment_table = "AllPayment"
+    query = f"""
+    SELECT 
+        p.id AS payment_id,
+        r.id AS room_id,
+        r.name AS room_name,
+        t.id AS tenant_id,
+        t.first_name || ' ' || t.last_name AS tenant_name,
+        p.amount AS amount_paid,
+        p.due_date,
+        p.date AS payment_date,
+        p.payment_status AS status,
+        (CASE 
+            WHEN p.payment_status = 'Overdue' THEN p.amount 
+            ELSE 0 
+        END) AS overdue_amount
+    FROM {payment_table} p
+    JOIN Room r ON p.room_id = r.id
+    JOIN Tenant t ON p.tenant_id = t.id
+    WHERE 1 = 1{scope}
+    """
+    return query, params
+
+
+@federated(concat_frames)
+def fetch_payment_data(include_archive=False):
+    """Fetch detailed payment data for Payment Report.
+
+    Live payments only, unless include_archive adds the archived years.
+    Limited to the selected property's rooms.
+    """
+    connection = connect_report()
     try:
-        query = """
-        SELECT 
-            p.id AS payment_id,
-            r.id AS room_id,
-            r.name AS room_name,
-            t.id AS tenant_id,
-            t.first_name || ' ' || t.last_name AS tenant_name,
-            p.amount AS amount_paid,
-            p.due_date,
-            p.date AS payment_date,
-            p.payment_status AS status,
-            (CASE 
-                WHEN p.payment_status = 'Overdue' THEN p.amount 
-                ELSE 0 
-            END) AS overdue_amount
-        FROM Payment p
-        JOIN Room r ON p.room_id = r.id
-        JOIN Tenant t ON p.tenant_id = t.id
-        """
-        df = pd.read_sql_query(query, connection)
-        return df
+        query, params = _payment_data_query(connection, include_archive)
+        return read_typed(query, connection, PAYMENT_DATA_TYPES, params)
     except Exception as e:
-        print(f"Error fetching payment data for report: {e}")
+        logger.exception("Error fetching payment data for report: %s", e)
         return pd.DataFrame()  # Return empty DataFrame on error
     finally:
-        connection.close()             
+        connection.close() 
+
+
+def iter_payment_data(include_archive=False, chunk_size=CHUNK_ROWS):
+    """fetch_payment_data's rows as DataFrames of at most chunk_size rows.
+
+    For aggregating (see chunked_aggregate) payment histories too large
+    to load at once.
+    """
+    return stream_frames(lambda connection: _payment_data_query(connection, include_archive),
+                         PAYMENT_DATA_TYPES, chunk_size)
+            
+
+
+@federated(sum_frames("bucket", "min_value", "max_value"))
+def fetch_amount_distribution(bucket_width):
+    """Number of live payments per amount bucket, as one grouped SQL pass.
+
+    Bucket n holds amounts in [n * bucket_width, (n + 1) * bucket_width);
+    only buckets with payments are listed. Columns: bucket, min_value,
+    max_value (exclusive), count.
+    """
+    scope, params = property_scope("room_id", "room", named=True)
+    query = f"""
+    SELECT bucket, bucket * :width AS min_value, (bucket + 1) * :width AS max_value, COUNT(*) AS count
+    FROM (
+        SELECT CAST(scaled AS INTEGER) - (scaled < 0 AND scaled != CAST(scaled AS INTEGER)) AS bucket
+        FROM (SELECT amount * 1.0 / :width AS scaled FROM Payment WHERE amount IS NOT NULL{scope})
+    )
+    GROUP BY bucket
+    ORDER BY bucket
+    """
+    connection = connect_report()
+    try:
+        return pd.read_sql_query(query, connection, params={**params, "width": bucket_width})
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        logger.exception("Error fetching payment amount distribution: %s", e)
+        return pd.DataFrame(columns=["bucket", "min_value", "max_value", "count"])
+    finally:
+        connection.close()
@@ -1,61 +1,70 @@
-import pandas as pd
-from matplotlib import pyplot as plt
-#from database import fetch_payment_data, fetch_tenant_data, fetch_room_data  # Assume these fetch data from the database
-from controllers.payment_management_controller import fetch_payment_data;
-from controllers.tenant_controller import fetch_tenant_data;
-from controllers.room_controller import fetch_room_data;
+from controllers.revenue_cube_controller import fetch_revenue, fetch_monthly_payers, fetch_revenue_by_room
+from controllers.report_loader import load_report_datasets
+from controllers.payment_management_controller import fetch_amount_distribution
+
+# Payments not yet settled count towards the outstanding balance
+OUTSTANDING_STATUSES = ("Pending", "Overdue")
+TOP_ROOM_LIMIT = 20
+AMOUNT_BUCKET = 100
+
+
 class PaymentReportController:
-    def __init__(self):
-        self.payment_data = pd.DataFrame(fetch_payment_data())
-        self.tenant_data = pd.DataFrame(fetch_tenant_data())
-        self.room_data = pd.DataFrame(fetch_room_data())
+    """Payment report figures, read from the revenue cube.
+
+    The status and monthly figures come from RevenueByMonth (a few cells
+    per month), the payer counts and the room ranking (the same as the
+    lease report's) from RevenueCube. Only the amount distribution reads
+    Payment, as a grouped SQL query.
+    """
+
+    def load_report(self, report):
+        """The summary and one report's data, read from the same database state.
+
+        report is a name from the view's selector. Returns (summary dict, DataFrame).
+        """
+        fetch = {
+            "Payment Status": self.get_status_breakdown,
+            "Revenue by Room": self.get_revenue_by_room,
+            "Monthly Trends": self.get_monthly_trends,
+            "Monthly Payers": self.get_monthly_payers,
+            "Payment Amounts": self.get_amount_distribution,
+        }[report]
+        datasets = load_report_datasets({"by_status": self.get_status_breakdown, "data": fetch})
+        return _summarize(datasets["by_status"]), datasets["data"]
 
     def get_payment_summary(self):
-        total_payments = len(self.payment_data)
-        total_income = self.payment_data['amount_paid'].sum()
-        outstanding_balances = self.payment_data['outstanding_balance'].sum()
-        overdue_payments = self.payment_data[self.payment_data['status'] == 'Overdue']
-
-        return {
-            "total_payments": total_payments,
-            "total_income": total_income,
-            "outstanding_balances": outstanding_balances,
-            "overdue_count": len(overdue_payments),
-            "overdue_total": overdue_payments['amount_paid'].sum()
-        }
-
-    def generate_status_pie_chart(self):
-        status_counts = self.payment_data['status'].value_counts()
-        plt.pie(
-            status_counts,
-            labels=status_counts.index,
-            autopct='%1.1f%%',
-            startangle=140,
-            colors=['green', 'orange', 'red']
-        )
-        plt.title("Payment Status Breakdown")
-        plt.savefig("payment_status_pie_chart.png")
-        plt.close()
-
-    def generate_revenue_by_room_chart(self):
-        revenue_by_room = self.payment_data.groupby('room_id')['amount_paid'].sum().reset_index()
-        revenue_by_room.columns = ['Room ID', 'Total Revenue']
-
-        plt.bar(revenue_by_room['Room ID'], revenue_by_room['Total Revenue'], color='blue')
-        plt.title("Revenue Contribution by Room")
-        plt.xlabel("Room ID")
-        plt.ylabel("Total Revenue")
-        plt.savefig("revenue_by_room_bar_chart.png")
-        plt.close()
-
-    def generate_monthly_trends_line_chart(self):
-        self.payment_data['payment_date'] = pd.to_datetime(self.payment_data['payment_date'])
-        monthly_trends = self.payment_data.groupby(self.payment_data['payment_date'].dt.to_period('M'))['amount_paid'].sum()
-
-        monthly_trends.plot(kind='line', marker='o', color='purple')
-        plt.title("Monthly Payment Trends")
-        plt.xlabel("Month")
-        plt.ylabel("Total Payments")
-        plt.xticks(rotation=45)
-        plt.savefig("monthly_trends_line_chart.png")
-        plt.close()
+        return _summarize(self.get_status_breakdown())
+
+    def get_status_breakdown(self):
+        """Payment count and amount per status."""
+        return fetch_revenue(("payment_status",))
+
+    def get_revenue_by_room(self, limit=TOP_ROOM_LIMIT):
+        """The rooms that brought in the most rent, highest first."""
+        return fetch_revenue_by_room(limit).head(limit)
+
+    def get_monthly_trends(self, start_period=None, end_period=None):
+        """Payment total and count per YYYY-MM period."""
+        return fetch_revenue(("period",), start_period, end_period)
+
+    def get_monthly_payers(self):
+        """Payment total and count, and how many tenants paid, per YYYY-MM period."""
+        return fetch_monthly_payers()
+
+    def get_amount_distribution(self, bucket_width=AMOUNT_BUCKET):
+        """Number of payments per amount bucket of bucket_width dollars."""
+        return fetch_amount_distribution(bucket_width)
+
+
+def _summarize(by_status):
+    by_status = by_status.set_index('payment_status')
+    amounts = by_status['total_amount']
+    counts = by_status['payment_count']
+    outstanding = amounts[amounts.index.isin(OUTSTANDING_STATUSES)]
+    return {
+        "total_payments": int(counts.sum()),
+        "total_income": float(amounts.sum()),
+        "outstanding_balances": float(outstanding.sum()),
+        "overdue_count": int(counts.get('Overdue', 0)),
+        "overdue_total": float(amounts.get('Overdue', 0.0)),
+    }
@@ -0,0 +1,151 @@
+import logging
+import sqlite3
+import json
+from controllers.database import connect, on_shard, select_shard
+from controllers.shard_controller import sharding_enabled, create_shard
+from controllers.queries import register, execute
+
+logger = logging.getLogger(__name__)
+
+# Property the screens are limited to; None shows the whole portfolio
+_current_property = None
+
+# Conditions for each kind of scoped column; {p} is the property placeholder.
+#   property  a Room.property_id column (the query reads Room)
+#   room      a room id column of a table that only carries room_id
+#   tenant    a tenant id column: tenants leasing or living in the property
+_SCOPES = {
+    "property": "{column} = {p}",
+    "room": "{column} IN (SELECT id FROM Room WHERE property_id = {p})",
+    "tenant": """{column} IN (
+        SELECT tenant_id FROM Lease WHERE room_id IN (SELECT id FROM Room WHERE property_id = {p})
+        UNION
+        SELECT tenant_id FROM Room WHERE property_id = {p}
+    )""",
+}
+
+# Placeholders the scoped variant of each registered statement appends
+_scoped_param_counts = {}
+
+
+def set_current_property(property_id):
+    """Limit every scoped fetch to one property (None for all); returns the previous one.
+
+    In sharded mode this also routes controller calls to the property's shard.
+    """
+    global _current_property
+    previous, _current_property = _current_property, property_id
+    select_shard(property_id)
+    return previous
+
+
+def current_property():
+    return _current_property
+
+
+def property_scope(column, kind="property", named=False):
+    """AND condition and parameters limiting a query to the selected property.
+
+    Returns ("", []) when no property is selected. With named set the
+    condition uses :property_id and the parameters are a dict, to merge
+    with other named parameters.
+    """
+    if _current_property is None:
+        return "", ({} if named else [])
+    condition = _SCOPES[kind].format(column=column, p=":property_id" if named else "?")
+    if named:
+        return f" AND {condition}", {"property_id": _current_property}
+    return f" AND {condition}", [_current_property] * condition.count("?")
+
+
+def register_scoped(name, sql, column, kind="property"):
+    """Register a statement and its property-scoped variant.
+
+    sql marks where the condition goes with {scope} (after an existing
+    WHERE) or {where} (when it has none). Run it with execute_scoped, which
+    picks the variant for the current selection, so both stay prepared.
+    """
+    condition = _SCOPES[kind].format(column=column, p="?")
+    register(name, sql.format(scope="", where=""))
+    register(f"{name}.property", sql.format(scope=f" AND {condition}", where=f" WHERE {condition}"))
+    _scoped_param_counts[name] = condition.count("?")
+    return name
+
+
+def execute_scoped(cursor, name, params=()):
+    """Run a statement added with register_scoped for the selected property."""
+    if _current_property is None:
+        return execute(cursor, name, params)
+    scoped_params = (*params, *[_current_property] * _scoped_param_counts[name])
+    return execute(cursor, f"{name}.property", scoped_params)
+
+
+register("property.fetch_all", "SELECT id, name, address FROM Property ORDER BY name")
+
+def fetch_properties():
+    """Fetch all properties, by name."""
+    with on_shard(None):  # The catalogue lives in the main file
+        connection = connect()
+    cursor = connection.cursor()
+    try:
+        execute(cursor, "property.fetch_all")
+        return cursor.fetchall()
+    except Exception as e:
+        logger.exception("Error fetching properties: %s", e)
+        return []
+    finally:
+        connection.close()
+
+
+register("property.insert", "INSERT INTO Property (name, address) VALUES (?, ?)")
+
+# The shard keeps a copy of its own catalogue row, under the same id
+register("property.insert_with_id", "INSERT INTO Property (id, name, address) VALUES (?, ?, ?)")
+
+def add_property(name, address=None):
+    """Add a property (and its shard in sharded mode); returns its id."""
+    with on_shard(None):
+        connection = connect()
+    cursor = connection.cursor()
+    try:
+        execute(cursor, "property.insert", (name, address))
+        property_id = cursor.lastrowid
+        if sharding_enabled():
+            create_shard(property_id)
+            with on_shard(property_id):
+                shard = connect()
+            try:
+                execute(shard, "property.insert_with_id", (property_id, name, address))
+                shard.commit()
+            finally:
+                shard.close()
+        connection.commit()
+        return property_id
+    except sqlite3.IntegrityError as e:
+        logger.exception("Error adding property: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+register("property.assign_rooms", """
+UPDATE Room
+SET property_id = ?
+WHERE id IN (SELECT value FROM json_each(?))
+""")
+
+def assign_rooms_to_property(property_id, room_ids):
+    """Move rooms into a property (None detaches them)."""
+    if sharding_enabled():
+        raise ValueError("Rooms cannot move between properties in sharded mode; each property is a separate file.")
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        execute(cursor, "property.assign_rooms", (property_id, json.dumps(list(room_ids))))
+        connection.commit()
+        return cursor.rowcount
+    except Exception as e:
+        logger.exception("Error assigning rooms to property: %s", e)
+        raise
+    finally:
+        connection.close()
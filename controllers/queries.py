@@ -0,0 +1,45 @@
+import textwrap
+import threading
+from collections import Counter
+
+# Named controller statements. Each name maps to one fixed SQL text, so on a
+# pooled connection every call after the first reuses the prepared statement
+# from sqlite3's per-connection cache instead of parsing and planning again.
+QUERIES = {}
+
+_call_counts = Counter()
+_counts_lock = threading.Lock()
+
+
+def register(name, sql):
+    """Add a named statement; returns the name for use with execute()."""
+    sql = textwrap.dedent(sql).strip()
+    if QUERIES.get(name, sql) != sql:
+        raise ValueError(f"Query {name!r} is already registered with different SQL.")
+    QUERIES[name] = sql
+    return name
+
+
+def execute(cursor, name, params=()):
+    """Run a registered statement on a cursor (or connection) and count the call."""
+    with _counts_lock:
+        _call_counts[name] += 1
+    return cursor.execute(QUERIES[name], params)
+
+
+def executemany(cursor, name, seq_of_params):
+    with _counts_lock:
+        _call_counts[name] += 1
+    return cursor.executemany(QUERIES[name], seq_of_params)
+
+
+def query_stats():
+    """Return (name, calls) for every registered statement, busiest first."""
+    with _counts_lock:
+        counts = dict(_call_counts)
+    return sorted(((name, counts.get(name, 0)) for name in QUERIES), key=lambda stat: (-stat[1], stat[0]))
+
+
+def reset_query_stats():
+    with _counts_lock:
+        _call_counts.clear()
@@ -0,0 +1,108 @@
+import logging
+from controllers.database import connect
+from controllers.shard_controller import federated, concat_rows
+
+logger = logging.getLogger(__name__)
+
+# Derived Room fields recomputed from Lease and Payment in one grouped pass:
+#   occupancy_status     Rented with an active lease, Maintenance kept, else Available
+#   tenant_id            tenant of the most recent active lease, else NULL
+#   total_rent_collected sum of the room's payments, live plus archived rollups
+ROOM_DRIFT_QUERY = """
+WITH active_lease AS (
+    -- SQLite takes bare columns from the row holding the MAX(), i.e. the
+    -- latest active lease per room (ties broken by lease id)
+    SELECT room_id, tenant_id, MAX(start_date || printf('%012d', id)) AS latest
+    FROM Lease
+    WHERE status = 'Active'
+    GROUP BY room_id
+),
+collected AS (
+    SELECT room_id, SUM(total) AS total
+    FROM (
+        SELECT room_id, SUM(amount) AS total FROM Payment GROUP BY room_id
+        UNION ALL
+        SELECT room_id, SUM(total_amount) AS total FROM PaymentRollup GROUP BY room_id
+    )
+    GROUP BY room_id
+),
+expected AS (
+    SELECT
+        r.id AS room_id,
+        r.occupancy_status,
+        CASE
+            WHEN a.room_id IS NOT NULL THEN 'Rented'
+            WHEN r.occupancy_status = 'Maintenance' THEN 'Maintenance'
+            ELSE 'Available'
+        END AS expected_status,
+        r.tenant_id,
+        a.tenant_id AS expected_tenant_id,
+        r.total_rent_collected,
+        COALESCE(c.total, 0) AS expected_total
+    FROM Room r
+    LEFT JOIN active_lease a ON a.room_id = r.id
+    LEFT JOIN collected c ON c.room_id = r.id
+)
+SELECT
+    room_id,
+    occupancy_status, expected_status,
+    tenant_id, expected_tenant_id,
+    total_rent_collected, expected_total
+FROM expected
+WHERE occupancy_status IS NOT expected_status
+   OR tenant_id IS NOT expected_tenant_id
+   OR ABS(COALESCE(total_rent_collected, 0) - expected_total) > 0.005
+   OR total_rent_collected IS NULL
+"""
+
+
+@federated(concat_rows)
+def find_room_drift():
+    """Report rooms whose derived fields disagree with Lease and Payment.
+
+    Each row is (room_id, occupancy_status, expected_status, tenant_id,
+    expected_tenant_id, total_rent_collected, expected_total).
+    """
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(ROOM_DRIFT_QUERY)
+        return cursor.fetchall()
+    except Exception as e:
+        logger.exception("Error checking room consistency: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+@federated(concat_rows)
+def reconcile_rooms(repair=True):
+    """Recompute derived Room state and optionally repair it in one UPDATE.
+
+    Returns the drift rows found (see find_room_drift).
+    """
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DROP TABLE IF EXISTS temp.RoomDrift")
+        cursor.execute(f"CREATE TEMP TABLE RoomDrift AS {ROOM_DRIFT_QUERY}")
+        cursor.execute("SELECT * FROM temp.RoomDrift ORDER BY room_id")
+        drift = cursor.fetchall()
+        if repair and drift:
+            cursor.execute("""
+            UPDATE Room
+            SET occupancy_status = d.expected_status,
+                tenant_id = d.expected_tenant_id,
+                total_rent_collected = d.expected_total
+            FROM temp.RoomDrift d
+            WHERE Room.id = d.room_id
+            """)
+        cursor.execute("DROP TABLE temp.RoomDrift")
+        connection.commit()
+        return drift
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error reconciling rooms: %s", e)
+        raise
+    finally:
+        connection.close()
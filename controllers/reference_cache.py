@@ -0,0 +1,109 @@
+import logging
+import threading
+from controllers.database import connect, database_path
+from controllers.change_feed_controller import ChangeSubscription, id_chunks
+from controllers.queries import register, execute
+
+logger = logging.getLogger(__name__)
+
+# Columns the cache keeps per table
+_CHOICE_COLUMNS = {
+    "Tenant": "id, first_name || ' ' || last_name AS name",
+    "Room": "id, name, occupancy_status, property_id",
+}
+
+for _table, _columns in _CHOICE_COLUMNS.items():
+    register(f"reference.{_table}", f"SELECT {_columns} FROM {_table}")
+
+
+def _fetch_all(table):
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        execute(cursor, f"reference.{table}")
+        return cursor.fetchall()
+    except Exception as e:
+        logger.exception("Error loading %s reference data: %s", table, e)
+        raise
+    finally:
+        connection.close()
+
+
+def _fetch_by_ids(table, ids):
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        rows = []
+        for chunk in id_chunks(ids):
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"""
+            SELECT {_CHOICE_COLUMNS[table]}
+            FROM {table}
+            WHERE id IN ({placeholders})
+            """, chunk)
+            rows.extend(cursor.fetchall())
+        return rows
+    except Exception as e:
+        logger.exception("Error reloading %s reference data: %s", table, e)
+        raise
+    finally:
+        connection.close()
+
+
+class ReferenceData:
+    """Process-wide copy of a lookup table used to fill dropdowns.
+
+    The first read loads the whole table. Later reads ask the change log
+    (fed by the triggers on every write path) which ids changed since, and
+    re-read only those. version goes up whenever the rows change, so
+    widgets can tell whether what they show is stale. Switching to another
+    database file (a property shard) reloads from scratch.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.rows = {}  # id -> row
+        self.version = 0
+        self._subscription = None
+        self._database = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Bring the cached rows up to date; returns the current version."""
+        with self._lock:
+            if self._subscription is None or self._database != database_path():
+                self._database = database_path()
+                self._subscription = ChangeSubscription([self.table])
+                self.rows = {row[0]: row for row in _fetch_all(self.table)}
+                self.version += 1
+                return self.version
+
+            changed_ids = self._subscription.poll().get(self.table)
+            if changed_ids:
+                fresh = {row[0]: row for row in _fetch_by_ids(self.table, changed_ids)}
+                for row_id in changed_ids:
+                    if row_id in fresh:
+                        self.rows[row_id] = fresh[row_id]
+                    else:
+                        self.rows.pop(row_id, None)
+                self.version += 1
+            return self.version
+
+    def invalidate(self):
+        """Force a full reload on the next read (e.g. after a restore)."""
+        with self._lock:
+            self._subscription = None
+
+    def values(self):
+        """Fresh rows, in no particular order."""
+        self.refresh()
+        return list(self.rows.values())
+
+
+tenant_choices = ReferenceData("Tenant")
+room_choices = ReferenceData("Room")
+
+
+def invalidate_reference_data():
+    tenant_choices.invalidate()
+    room_choices.invalidate()
@@ -0,0 +1,71 @@
+import logging
+from controllers.database import connect
+from controllers.queries import register, execute
+
+logger = logging.getLogger(__name__)
+
+# Rental-terms edits are usually made together from EditRentalView; wrap them
+# in controllers.database.unit_of_work() so they share one commit.
+
+
+register("room.set_rental_terms", """
+UPDATE Room
+SET rental_price = ?, payment_frequency = ?, security_deposit = ?, grace_period = ?
+WHERE id = ?
+""")
+
+def set_rental_price_and_terms(room_id, rental_price, payment_frequency, security_deposit, grace_period):
+    """Update a room's rent and payment terms."""
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        execute(cursor, "room.set_rental_terms", (rental_price, payment_frequency, security_deposit, grace_period, room_id))
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error setting rental terms: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+register("room.set_occupancy_status", """
+UPDATE Room
+SET occupancy_status = ?
+WHERE id = ?
+""")
+
+def update_occupancy_status(room_id, occupancy_status):
+    """Set a room's occupancy status (Available, Rented, Maintenance)."""
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        execute(cursor, "room.set_occupancy_status", (occupancy_status, room_id))
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error updating occupancy status: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+register("room.set_tenant", """
+UPDATE Room
+SET tenant_id = ?
+WHERE id = ?
+""")
+
+def update_tenant_for_room(room_id, tenant_id):
+    """Assign a tenant to a room, or clear it when tenant_id is None."""
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        execute(cursor, "room.set_tenant", (tenant_id, room_id))
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error updating tenant for room: %s", e)
+        raise
+    finally:
+        connection.close()
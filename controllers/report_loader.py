@@ -0,0 +1,18 @@
+from controllers.database import report_transaction
+from controllers.archive_controller import attach_archives
+
+
+def load_report_datasets(datasets, include_archive=False):
+    """Fetch several report datasets from one consistent database state.
+
+    datasets maps a name to a zero-argument fetch (bind arguments with a
+    lambda or functools.partial). All of them run inside one
+    report_transaction, so they read the same snapshot through one
+    connection instead of opening a connection each. Set include_archive
+    when any fetch reads the archives: they are attached up front, as
+    SQLite cannot attach inside the transaction.
+
+    Returns {name: result} in the order given.
+    """
+    with report_transaction(attach_archives if include_archive else None):
+        return {name: fetch() for name, fetch in datasets.items()}
@@ -0,0 +1,203 @@
+import logging
+import sqlite3
+import pandas as pd
+from controllers.database import connect, connect_report
+from controllers.property_controller import current_property, property_scope
+from controllers.shard_controller import federated, concat_frames, sum_frames
+
+logger = logging.getLogger(__name__)
+
+# Dimensions a revenue read can group by. RevenueCube holds all of them;
+# RevenueByMonth only those a trend, status or method chart needs, a few
+# thousand cells for the whole history.
+CUBE_DIMENSIONS = ("period", "property_id", "room_id", "tenant_id", "method", "payment_status")
+MONTHLY_DIMENSIONS = ("period", "property_id", "method", "payment_status")
+
+# Recompute both tables from the live Payment rows
+REVENUE_CUBE_REBUILD = [
+    "DELETE FROM RevenueCube",
+    "DELETE FROM RevenueByMonth",
+    """
+    INSERT INTO RevenueCube (period, room_id, tenant_id, method, payment_status, total_amount, payment_count)
+    SELECT strftime('%Y-%m', date), room_id, tenant_id, COALESCE(method, ''),
+           COALESCE(payment_status, 'Pending'), SUM(amount), COUNT(*)
+    FROM Payment
+    GROUP BY 1, 2, 3, 4, 5
+    """,
+    """
+    INSERT INTO RevenueByMonth (period, property_id, method, payment_status, total_amount, payment_count)
+    SELECT c.period, COALESCE(r.property_id, 0), c.method, c.payment_status,
+           SUM(c.total_amount), SUM(c.payment_count)
+    FROM RevenueCube c
+    LEFT JOIN Room r ON r.id = c.room_id
+    GROUP BY 1, 2, 3, 4
+    """,
+]
+
+
+def rebuild_revenue_cube():
+    """Recompute the revenue cube from scratch (e.g. after a bulk import)."""
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        for statement in REVENUE_CUBE_REBUILD:
+            cursor.execute(statement)
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error rebuilding revenue cube: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+def _merge_shard_revenue(parts):
+    # Every column before the two measures is a dimension
+    merged = concat_frames(parts)
+    keys = list(merged.columns[:-2])
+    if merged.empty or not keys:
+        return merged.sum().to_frame().T if not merged.empty else merged
+    return sum_frames(*keys)(parts)
+
+
+@federated(_merge_shard_revenue)
+def fetch_revenue(dimensions=("period",), start_period=None, end_period=None, include_archive=False):
+    """Total revenue and payment count grouped by the given dimensions.
+
+    dimensions are names from CUBE_DIMENSIONS; periods are YYYY-MM and
+    either bound is optional. Reads the small RevenueByMonth table when the
+    dimensions allow it, otherwise RevenueCube; neither touches Payment.
+    With a property selected only its rooms count. include_archive adds
+    the archived monthly rollups (which carry no method).
+
+    Returns a DataFrame with one column per dimension, then total_amount
+    and payment_count, ordered by the dimensions.
+    """
+    unknown = set(dimensions) - set(CUBE_DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown revenue dimensions: {sorted(unknown)}")
+    monthly = set(dimensions) <= set(MONTHLY_DIMENSIONS) and not include_archive
+
+    period = ""
+    params = {}
+    if start_period is not None:
+        period += " AND period >= :start_period"
+        params["start_period"] = start_period
+    if end_period is not None:
+        period += " AND period <= :end_period"
+        params["end_period"] = end_period
+
+    if monthly:
+        scope = ""
+        if current_property() is not None:
+            scope = " AND property_id = :property_id"
+            params["property_id"] = current_property()
+        source = f"SELECT * FROM RevenueByMonth WHERE 1 = 1{period}{scope}"
+    else:
+        # The cube is keyed by room; the property comes from Room
+        scope, scope_params = property_scope("c.room_id", "room", named=True)
+        params.update(scope_params)
+        source = f"""
+            SELECT c.period, COALESCE(r.property_id, 0) AS property_id, c.room_id, c.tenant_id,
+                   c.method, c.payment_status, c.total_amount, c.payment_count
+            FROM RevenueCube c
+            LEFT JOIN Room r ON r.id = c.room_id
+            WHERE 1 = 1{period}{scope}"""
+        if include_archive:
+            source += f"""
+            UNION ALL
+            SELECT c.period, COALESCE(r.property_id, 0), c.room_id, c.tenant_id,
+                   NULL, c.payment_status, c.total_amount, c.payment_count
+            FROM PaymentRollup c
+            LEFT JOIN Room r ON r.id = c.room_id
+            WHERE 1 = 1{period}{scope}"""
+
+    columns = ", ".join(dimensions)
+    query = f"""
+    SELECT {columns + ',' if dimensions else ''}
+           SUM(total_amount) AS total_amount, SUM(payment_count) AS payment_count
+    FROM ({source})
+    {f"GROUP BY {columns} ORDER BY {columns}" if dimensions else ""}
+    """
+    connection = connect_report()
+    try:
+        return pd.read_sql_query(query, connection, params=params)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        logger.exception("Error fetching revenue cube: %s", e)
+        return pd.DataFrame(columns=[*dimensions, "total_amount", "payment_count"])
+    finally:
+        connection.close()
+
+
+def _top_revenue(parts):
+    # Each shard sends its own top rooms; the overall top is among them
+    merged = concat_frames(parts)
+    if merged.empty:
+        return merged
+    return merged.sort_values("revenue", ascending=False, kind="stable").reset_index(drop=True)
+
+
+@federated(_top_revenue)
+def fetch_revenue_by_room(limit, include_archive=False):
+    """The rooms that brought in the most revenue, highest first.
+
+    Reads the revenue cube (plus the archived rollups on request) rather
+    than the payments themselves. Shared by the lease and payment reports,
+    so their room rankings agree.
+    """
+    connection = connect_report()
+    try:
+        scope, params = property_scope("room_id", "room", named=True)
+        source = f"SELECT room_id, total_amount, payment_count FROM RevenueCube WHERE 1 = 1{scope}"
+        if include_archive:
+            source += f"""
+            UNION ALL
+            SELECT room_id, total_amount, payment_count FROM PaymentRollup WHERE 1 = 1{scope}"""
+        query = f"""
+        WITH revenue AS (
+            SELECT room_id, SUM(total_amount) AS revenue, SUM(payment_count) AS payment_count
+            FROM ({source})
+            GROUP BY room_id
+            ORDER BY revenue DESC
+            LIMIT :limit
+        )
+        SELECT v.room_id, r.name AS room_name, v.revenue, v.payment_count
+        FROM revenue v
+        LEFT JOIN Room r ON r.id = v.room_id
+        ORDER BY v.revenue DESC
+        """
+        df = pd.read_sql_query(query, connection, params={**params, "limit": limit})
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        logger.exception("Error fetching revenue by room: %s", e)
+        df = pd.DataFrame(columns=["room_id", "room_name", "revenue", "payment_count"])
+    finally:
+        connection.close()
+    return df
+
+
+@federated(sum_frames("period"))
+def fetch_monthly_payers():
+    """Payment total and count, and how many tenants made payments, per YYYY-MM period.
+
+    One grouped pass over RevenueCube, which has a cell per tenant and
+    month, so the tenant counts are exact and Payment is never read.
+    Across shards a tenant renting in several properties counts once per
+    property, as in the tenant ranking.
+    """
+    scope, params = property_scope("room_id", "room", named=True)
+    query = f"""
+    SELECT period, SUM(total_amount) AS total_amount, SUM(payment_count) AS payment_count,
+           COUNT(DISTINCT tenant_id) AS tenants
+    FROM RevenueCube
+    WHERE 1 = 1{scope}
+    GROUP BY period
+    ORDER BY period
+    """
+    connection = connect_report()
+    try:
+        return pd.read_sql_query(query, connection, params=params)
+    except (sqlite3.Error, pd.errors.DatabaseError) as e:
+        logger.exception("Error fetching monthly payers: %s", e)
+        return pd.DataFrame(columns=["period", "total_amount", "payment_count", "tenants"])
+    finally:
+        connection.close()
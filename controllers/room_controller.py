@@ -1,130 +1,266 @@
 
 
+import logging
 import sqlite3
 import pandas as pd
-DATABASE = "rental_management_v2.db"
+from controllers.change_feed_controller import id_chunks
+from controllers.database import connect, connect_report, on_shard
+from controllers.queries import register, execute
+from controllers.row_store import RowStore
+from controllers.grid_query import GridQuery
+from controllers.property_controller import current_property, property_scope, register_scoped, execute_scoped
+from controllers.shard_controller import federated, concat_frames
+from controllers.typed_frames import read_typed, CATEGORY, INTEGER
 
-def add_room(name, room_type, size, rental_price, amenities):
-    """Add a new room."""
-    connection = sqlite3.connect(DATABASE)
+logger = logging.getLogger(__name__)
+
+# Room Management grid: same columns as fetch_rooms, sorted and filtered in
+# SQL by displayed column number
+ROOM_GRID = GridQuery(
+    select="SELECT id, name, type, size, rental_price, occupancy_status, amenities",
+    from_clause="FROM Room",
+    columns=[
+        ("id", "exact"),
+        ("name", "prefix"),
+        ("type", "exact"),
+        ("size", "exact"),
+        ("rental_price", "exact"),
+        ("occupancy_status", "exact"),
+    ],
+    id_column="id",
+    scope=("property_id", "property"),
+)
+
+register("room.insert", """
+INSERT INTO Room (name, type, size, rental_price, amenities, property_id)
+VALUES (?, ?, ?, ?, ?, ?)
+""")
+
+def add_room(name, room_type, size, rental_price, amenities, property_id=None):
+    """Add a new room, in the selected property unless property_id is given."""
+    if property_id is None:
+        property_id = current_property()
+    with on_shard(property_id):
+        connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        INSERT INTO Room (name, type, size, rental_price, amenities)
-        VALUES (?, ?, ?, ?, ?)
-        """, (name, room_type, size, rental_price, amenities))
+        execute(cursor, "room.insert", (name, room_type, size, rental_price, amenities, property_id))
         connection.commit()
     except sqlite3.IntegrityError as e:
-        print(f"Error adding room: {e}")
+        logger.exception("Error adding room: %s", e)
         raise
     finally:
         connection.close()
 
 
+register("room.update", """
+UPDATE Room
+SET name = ?, type = ?, size = ?, rental_price = ?, amenities = ?, occupancy_status = ?
+WHERE id = ?;
+""")
+
 def update_room(room_id, name, room_type, size, rental_price, amenities, occupancy_status):
-    connection = sqlite3.connect(DATABASE)  # Replace with your database file name
+    connection = connect()  # Replace with your database file name
     cursor = connection.cursor()
     try:
         # Update query to include `occupancy_status`
-        cursor.execute("""
-        UPDATE Room
-        SET name = ?, type = ?, size = ?, rental_price = ?, amenities = ?, occupancy_status = ?
-        WHERE id = ?;
-        """, (name, room_type, size, rental_price, amenities, occupancy_status, room_id))
+        execute(cursor, "room.update", (name, room_type, size, rental_price, amenities, occupancy_status, room_id))
         connection.commit()
     except Exception as e:
-        print(f"Error updating room: {e}")
+        logger.exception("Error updating room: %s", e)
         raise
     finally:
         connection.close()
 
+register("room.delete", "DELETE FROM Room WHERE id = ?")
+
 def delete_room(room_id):
     """Delete a room."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("DELETE FROM Room WHERE id = ?", (room_id,))
+        execute(cursor, "room.delete", (room_id,))
         connection.commit()
     except sqlite3.IntegrityError as e:
-        print(f"Error deleting room: {e}")
+        logger.exception("Error deleting room: %s", e)
         raise
     finally:
         connection.close()
 
 
-def fetch_rooms():
-    """Fetch all room details."""
-    connection = sqlite3.connect(DATABASE)
+register_scoped("room.fetch_all", """
+SELECT
+    id, name, type, size, rental_price, occupancy_status, amenities
+FROM Room{where}
+""", "property_id")
+
+def fetch_rooms(as_store=False):
+    """Fetch the selected property's rooms (as a compact RowStore when as_store is set)."""
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        SELECT
-            id, name, type, size, rental_price, occupancy_status, amenities
-        FROM Room
-        """)
+        execute_scoped(cursor, "room.fetch_all")
+        if as_store:
+            return RowStore.from_cursor(cursor)
         rooms = cursor.fetchall()
         return rooms
     except Exception as e:
-        print(f"Error fetching rooms: {e}")
-        return []
+        logger.exception("Error fetching rooms: %s", e)
+        return RowStore() if as_store else []
+    finally:
+        connection.close()
+
+
+def fetch_rooms_by_ids(room_ids):
+    """Fetch room details for the given ids.
+
+    Missing ids were deleted or belong to another property.
+    """
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        scope, scope_params = property_scope("property_id")
+        rooms = []
+        for chunk in id_chunks(room_ids):
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"""
+            SELECT
+                id, name, type, size, rental_price, occupancy_status, amenities
+            FROM Room
+            WHERE id IN ({placeholders}){scope}
+            """, [*chunk, *scope_params])
+            rooms.extend(cursor.fetchall())
+        return rooms
+    except Exception as e:
+        logger.exception("Error fetching rooms by id: %s", e)
+        raise
     finally:
         connection.close()
 
 
+register_scoped("room.fetch_available", """
+SELECT id, name 
+FROM Room
+WHERE occupancy_status = 'Available'{scope}
+""", "property_id")
+
 def fetch_available_rooms():
     """Fetch available rooms."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        SELECT id, name 
-        FROM Room
-        WHERE occupancy_status = 'Available'
-        """)
+        execute_scoped(cursor, "room.fetch_available")
         available_rooms = cursor.fetchall()
         return available_rooms
     except Exception as e:
-        print(f"Error fetching available rooms: {e}")
+        logger.exception("Error fetching available rooms: %s", e)
         return []
     finally:
         connection.close()
 
 
+register_scoped("room.fetch_with_booking", """
+SELECT
+    r.id, r.name, r.type, r.rental_price, r.payment_frequency,
+    r.security_deposit, r.grace_period, r.occupancy_status,
+    t.first_name || ' ' || t.last_name AS tenant_name,
+    CASE
+        WHEN b.status IS NULL THEN r.occupancy_status
+        ELSE b.status
+    END AS dynamic_status -- Dynamic status based on bookings
+FROM Room r
+LEFT JOIN Tenant t ON r.tenant_id = t.id
+LEFT JOIN (
+    SELECT room_id, status
+    FROM Booking
+    WHERE status IN ('Pending', 'Active') -- Only consider relevant booking statuses
+) b ON r.id = b.room_id{where}
+""", "r.property_id")
+
 def fetch_room_details_with_booking():
     """Fetch room details with booking information."""
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        SELECT
-            r.id, r.name, r.type, r.rental_price, r.payment_frequency,
-            r.security_deposit, r.grace_period, r.occupancy_status,
-            t.first_name || ' ' || t.last_name AS tenant_name,
-            CASE
-                WHEN b.status IS NULL THEN r.occupancy_status
-                ELSE b.status
-            END AS dynamic_status -- Dynamic status based on bookings
-        FROM Room r
-        LEFT JOIN Tenant t ON r.tenant_id = t.id
-        LEFT JOIN (
-            SELECT room_id, status
-            FROM Booking
-            WHERE status IN ('Pending', 'Active') -- Only consider relevant booking statuses
-        ) b ON r.id = b.room_id
-        """)
+        execute_scoped(cursor, "room.fetch_with_booking")
         return cursor.fetchall()
     except Exception as e:
-        print(f"Error fetching room details with booking info: {e}")
+        logger.exception("Error fetching room details with booking info: %s", e)
         return []
     finally:
         connection.close()
         
         
-def fetch_room_data():
-    """Fetch detailed room data for the Payment Report."""
-    connection = sqlite3.connect(DATABASE)
+def report_period_filters(start_date=None, end_date=None):
+    """WHERE fragments and parameters limiting a report to a date range.
+
+    Returns (payment_clause, lease_clause, params): Payment.date in the
+    range and Lease start_date/end_date overlapping it. Omitted bounds add no condition, so an
+    open range reads all history and a closed one can use the date indexes.
+    Both clauses also keep only the rooms of the selected property.
+    """
+    payment_conditions, lease_conditions, params = [], [], {}
+    scope, scope_params = property_scope("room_id", "room", named=True)
+    if scope:
+        payment_conditions.append(scope.removeprefix(" AND "))
+        lease_conditions.append(scope.removeprefix(" AND "))
+        params.update(scope_params)
+    if start_date is not None:
+        payment_conditions.append("date >= :start_date")
+        lease_conditions.append("end_date >= :start_date")
+        params["start_date"] = start_date
+    if end_date is not None:
+        payment_conditions.append("date <= :end_date")
+        lease_conditions.append("start_date <= :end_date")
+        params["end_date"] = end_date
+    return (
+        "".join(f" AND {condition}" for condition in payment_conditions),
+        "".join(f" AND {condition}" for condition in lease_conditions),
+        params,
+    )
+
+
+ROOM_DATA_TYPES = {
+    "room_id": INTEGER,
+    "room_type": CATEGORY,
+    "occupancy_status": CATEGORY,
+    "amenities": CATEGORY,
+    "active_lease_count": INTEGER,
+    "overdue_payments": INTEGER,
+}
+
+
+@federated(lambda parts: concat_frames(parts, sort_by="room_id"))
+def fetch_room_data(start_date=None, end_date=None):
+    """Fetch detailed room data for the Payment Report.
+
+    Payments and active leases are grouped per room once and joined, instead
+    of three correlated subqueries per room. start_date/end_date (YYYY-MM-DD,
+    either optional) restrict the figures to payments dated in the period and
+    active leases overlapping it. Only the selected property's rooms are
+    listed.
+    """
+    connection = connect_report()
     try:
-        query = """
+        payment_period, lease_period, params = report_period_filters(start_date, end_date)
+        room_scope, scope_params = property_scope("r.property_id", named=True)
+        params.update(scope_params)
+        query = f"""
+        WITH payments AS (
+            SELECT
+                room_id,
+                SUM(amount) AS total_rent_collected,
+                SUM(payment_status = 'Overdue') AS overdue_payments
+            FROM Payment
+            WHERE 1 = 1{payment_period}
+            GROUP BY room_id
+        ),
+        active_leases AS (
+            SELECT room_id, COUNT(*) AS active_lease_count
+            FROM Lease
+            WHERE status = 'Active'{lease_period}
+            GROUP BY room_id
+        )
         SELECT 
             r.id AS room_id,
             r.name AS room_name,
@@ -133,21 +269,18 @@ def fetch_room_data():
             r.occupancy_status,
             r.size AS room_size,
             r.amenities,
-            (SELECT SUM(p.amount) 
-             FROM Payment p 
-             WHERE p.room_id = r.id) AS total_rent_collected,
-            (SELECT COUNT(*) 
-             FROM Lease l 
-             WHERE l.room_id = r.id AND l.status = 'Active') AS active_lease_count,
-            (SELECT COUNT(*) 
-             FROM Payment p 
-             WHERE p.room_id = r.id AND p.payment_status = 'Overdue') AS overdue_payments
+            p.total_rent_collected,
+            COALESCE(l.active_lease_count, 0) AS active_lease_count,
+            COALESCE(p.overdue_payments, 0) AS overdue_payments
         FROM Room r
+        LEFT JOIN payments p ON p.room_id = r.id
+        LEFT JOIN active_leases l ON l.room_id = r.id
+        WHERE 1 = 1{room_scope}
+        ORDER BY r.id
         """
-        df = pd.read_sql_query(query, connection)
-        return df
+        return read_typed(query, connection, ROOM_DATA_TYPES, params)
     except Exception as e:
-        print(f"Error fetching room data for report: {e}")
+        logger.exception("Error fetching room data for report: %s", e)
         return pd.DataFrame()  # Return empty DataFrame on error
     finally:
         connection.close()        
@@ -1,41 +1,57 @@
 
+import logging
 import sqlite3
 import pandas as pd
 
-DATABASE = "rental_management_v2.db"
+from controllers.database import connect_report
+from controllers.archive_controller import attach_archives
+from controllers.property_controller import property_scope
+from controllers.shard_controller import federated, concat_frames, sum_frames
 
+logger = logging.getLogger(__name__)
+
+@federated(concat_frames)
 def fetch_room_summary():
     """Fetch room details for the summary report."""
+    conn = connect_report()
     try:
-        conn = sqlite3.connect(DATABASE)
-        query = """
+        scope, params = property_scope("property_id")
+        query = f"""
         SELECT id AS room_id, name, type, size, rental_price, occupancy_status
         FROM Room
+        WHERE 1 = 1{scope}
         """
-        df = pd.read_sql_query(query, conn)
-    except sqlite3.Error as error:
-        print("Error fetching room summary:", error)
+        df = pd.read_sql_query(query, conn, params=params)
+    except (sqlite3.Error, pd.errors.DatabaseError) as error:
+        logger.exception("Error fetching room summary: %s", error)
         df = pd.DataFrame()  # Return an empty DataFrame on error
     finally:
         conn.close()
     return df
 
 
-def fetch_financial_performance():
-    """Fetch financial data for each room."""
+@federated(concat_frames)
+def fetch_financial_performance(include_archive=False):
+    """Fetch financial data for each room (archived years on request)."""
+    conn = connect_report()
     try:
-        conn = sqlite3.connect(DATABASE)
-        query = """
+        payment_table = "Payment"
+        if include_archive:
+            attach_archives(conn)
+            payment_table = "AllPayment"
+        scope, params = property_scope("r.property_id")
+        query = f"""
         SELECT r.id AS room_id, r.name, r.type, r.rental_price,
                SUM(p.amount) as total_income, 
                r.rental_price * COUNT(p.id) - SUM(p.amount) as outstanding
         FROM Room r
-        LEFT JOIN Payment p ON r.id = p.room_id
+        LEFT JOIN {payment_table} p ON r.id = p.room_id
+        WHERE 1 = 1{scope}
         GROUP BY r.id
         """
-        df = pd.read_sql_query(query, conn)
-    except sqlite3.Error as error:
-        print("Error fetching financial performance:", error)
+        df = pd.read_sql_query(query, conn, params=params)
+    except (sqlite3.Error, pd.errors.DatabaseError) as error:
+        logger.exception("Error fetching financial performance: %s", error)
         df = pd.DataFrame()  # Return an empty DataFrame on error
     finally:
         conn.close()
@@ -43,21 +59,22 @@ def fetch_financial_performance():
 
 
 
+@federated(sum_frames("occupancy_status"))
 def fetch_occupancy_analysis():
     """Fetch room occupancy data for analysis."""
+    conn = connect_report()
     try:
-        conn = sqlite3.connect(DATABASE)
-        query = """
+        scope, params = property_scope("property_id")
+        query = f"""
         SELECT occupancy_status, COUNT(*) as count
         FROM Room
+        WHERE 1 = 1{scope}
         GROUP BY occupancy_status
         """
-        df = pd.read_sql_query(query, conn)
-    except sqlite3.Error as error:
-        print("Error fetching room occupancy analysis:", error)
+        df = pd.read_sql_query(query, conn, params=params)
+    except (sqlite3.Error, pd.errors.DatabaseError) as error:
+        logger.exception("Error fetching room occupancy analysis: %s", error)
         df = pd.DataFrame()  # Return an empty DataFrame on error
     finally:
         conn.close()
     return df
-
-
@@ -0,0 +1,200 @@
+import sys
+from array import array
+
+# Rows pulled from the cursor per fetchmany(); the full result is never
+# held as a list of tuples
+FETCH_BATCH_SIZE = 5000
+
+
+class RowStore:
+    """Fetched rows held column by column in typed arrays.
+
+    Integer columns are stored in array('q'), real columns in array('d') and
+    everything else as int codes into one table of interned strings, so each
+    cell costs 4-8 bytes instead of a Python object. A column's type comes
+    from its first non-NULL value and widens (int -> real -> text) if a later
+    value does not fit. Rows are rebuilt as tuples only when asked for.
+    """
+
+    def __init__(self, column_count=0):
+        self.column_count = 0
+        self.kinds = []  # per column: "q", "d", "text" or None (all NULL so far)
+        self.columns = []
+        self.nulls = []
+        self._add_columns(column_count)
+        self.strings = []
+        self.string_codes = {}
+        self.row_count = 0
+
+    @classmethod
+    def from_cursor(cls, cursor, batch_size=FETCH_BATCH_SIZE):
+        """Build a store from an executed cursor, batch by batch."""
+        store = cls(len(cursor.description))
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return store
+            store.extend(batch)
+
+    @classmethod
+    def from_rows(cls, rows, column_count):
+        """Build a store from any iterable of row tuples."""
+        store = cls(column_count)
+        store.extend(rows)
+        return store
+
+    def __len__(self):
+        return self.row_count
+
+    def __iter__(self):
+        for row in range(self.row_count):
+            yield self.row(row)
+
+    def extend(self, rows):
+        """Add many rows, converting one column at a time."""
+        rows = rows if isinstance(rows, list) else list(rows)
+        if not rows:
+            return
+        if not self.column_count:
+            self._add_columns(len(rows[0]))
+        for col, values in enumerate(zip(*rows)):
+            self._extend_column(col, values)
+        self.row_count += len(rows)
+
+    def append(self, values):
+        """Add a row at the end."""
+        if not self.column_count:
+            # An empty store (e.g. a failed fetch) takes its width from the first row
+            self._add_columns(len(values))
+        for col, value in enumerate(values):
+            encoded = self._encode(col, value)  # may swap in a wider array
+            self.columns[col].append(encoded)
+            self.nulls[col].append(value is None)
+        self.row_count += 1
+
+    def set_row(self, row, values):
+        """Overwrite a row in place."""
+        for col, value in enumerate(values):
+            encoded = self._encode(col, value)
+            self.columns[col][row] = encoded
+            self.nulls[col][row] = value is None
+
+    def remove_rows(self, rows):
+        """Delete the given row positions."""
+        for row in sorted(set(rows), reverse=True):
+            for col in range(self.column_count):
+                del self.columns[col][row]
+                del self.nulls[col][row]
+            self.row_count -= 1
+
+    def value(self, row, col):
+        """Return one cell as the Python value it was fetched as."""
+        if self.nulls[col][row]:
+            return None
+        value = self.columns[col][row]
+        if self.kinds[col] == "text":
+            return self.strings[value]
+        return value
+
+    def row(self, row):
+        """Return one row as a tuple."""
+        return tuple(self.value(row, col) for col in range(self.column_count))
+
+    def find(self, value, col=0):
+        """Row position of the first row whose column equals value, else None.
+
+        Meant for the integer id column, where the scan runs in C.
+        """
+        if self.kinds[col] == "text":
+            value = self.string_codes.get(value)
+            if value is None:
+                return None
+        try:
+            return self.columns[col].index(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+    def memory_usage(self):
+        """Approximate bytes used by the arrays and interned strings."""
+        total = sum(column.itemsize * len(column) for column in self.columns)
+        total += sum(len(mask) for mask in self.nulls)
+        total += sum(sys.getsizeof(text) for text in self.strings)
+        return total
+
+    def _add_columns(self, count):
+        self.column_count += count
+        self.kinds.extend(None for _ in range(count))
+        self.columns.extend(array("i") for _ in range(count))
+        self.nulls.extend(bytearray() for _ in range(count))
+
+    def _extend_column(self, col, values):
+        has_nulls = None in values
+        if has_nulls:
+            self.nulls[col].extend(value is None for value in values)
+        else:
+            self.nulls[col].extend(bytes(len(values)))
+
+        kind = self.kinds[col]
+        if kind == "text":
+            intern = self._intern
+            self.columns[col].extend(0 if value is None else intern(value) for value in values)
+            return
+        if kind is not None and not has_nulls:
+            try:
+                # Building the array first keeps a type error from leaving a partial extend
+                self.columns[col].extend(array(kind, values))
+                return
+            except (TypeError, OverflowError):
+                pass
+        for value in values:
+            encoded = self._encode(col, value)
+            self.columns[col].append(encoded)
+
+    def _encode(self, col, value):
+        """Convert a value to what the column's array stores, widening if needed."""
+        if value is None:
+            return 0
+        kind = self.kinds[col]
+        if kind is None:
+            kind = self._set_kind(col, self._kind_of(value))
+        if kind == "q":
+            if isinstance(value, int) and -2**63 <= value < 2**63:
+                return value
+            kind = self._set_kind(col, "d" if isinstance(value, float) else "text")
+        if kind == "d":
+            if isinstance(value, (int, float)):
+                return float(value)
+            kind = self._set_kind(col, "text")
+        return self._intern(value)
+
+    def _kind_of(self, value):
+        if isinstance(value, int):
+            return "q"
+        if isinstance(value, float):
+            return "d"
+        return "text"
+
+    def _set_kind(self, col, kind):
+        """Switch a column to a wider type, re-encoding what it already holds."""
+        old_kind = self.kinds[col]
+        old_column = self.columns[col]
+        if old_kind is None:
+            converted = [0] * len(old_column)
+        elif kind == "text":
+            converted = [
+                0 if self.nulls[col][row] else self._intern(old_column[row])
+                for row in range(len(old_column))
+            ]
+        else:
+            converted = old_column
+        self.columns[col] = array("i" if kind == "text" else kind, converted)
+        self.kinds[col] = kind
+        return kind
+
+    def _intern(self, value):
+        code = self.string_codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(value)
+            self.string_codes[value] = code
+        return code
@@ -0,0 +1,136 @@
+import logging
+import os
+import sqlite3
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from controllers import database
+
+logger = logging.getLogger(__name__)
+
+# Shards a portfolio report reads at the same time
+SHARD_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def sharding_enabled():
+    return database.SHARD_DIRECTORY is not None
+
+
+def list_shards():
+    """Property ids that have a shard file, in id order."""
+    if not sharding_enabled() or not os.path.isdir(database.SHARD_DIRECTORY):
+        return []
+    property_ids = []
+    for name in os.listdir(database.SHARD_DIRECTORY):
+        if name.startswith("property_") and name.endswith(".db"):
+            property_id = name[len("property_"):-len(".db")]
+            if property_id.isdigit():
+                property_ids.append(int(property_id))
+    return sorted(property_ids)
+
+
+def create_shard(property_id):
+    """Create an empty shard for a property with the main file's schema.
+
+    The AUTOINCREMENT counters start at property_id * SHARD_ID_SPAN, so rows
+    added in different shards never share an id. Returns the shard path.
+    """
+    path = database.shard_path(property_id)
+    if os.path.exists(path):
+        raise FileExistsError(f"Shard for property {property_id} already exists: {path}")
+    os.makedirs(database.SHARD_DIRECTORY, exist_ok=True)
+
+    source = sqlite3.connect(database.DATABASE)
+    try:
+        schema = source.execute("""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'
+        """).fetchall()
+    finally:
+        source.close()
+
+    connection = sqlite3.connect(path)
+    cursor = connection.cursor()
+    try:
+        # Tables first; indexes and triggers refer to them
+        for _type, _name, sql in sorted(schema, key=lambda entry: entry[0] != "table"):
+            cursor.execute(sql)
+        first_id = property_id * database.SHARD_ID_SPAN
+        for _type, name, sql in schema:
+            if _type == "table" and "AUTOINCREMENT" in sql.upper():
+                cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (name, first_id))
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        connection.close()
+        os.remove(path)
+        logger.exception("Error creating shard for property %s: %s", property_id, e)
+        raise
+    connection.close()
+    return path
+
+
+def fans_out():
+    """True when a read has to visit every shard: sharding on, no property selected."""
+    return sharding_enabled() and database.database_path() == database.DATABASE
+
+
+def fan_out(fetch, *args, **kwargs):
+    """Run fetch once per shard, in parallel; returns the per-shard results."""
+    def run(property_id):
+        with database.on_shard(property_id):
+            return fetch(*args, **kwargs)
+
+    shards = list_shards()
+    if not shards:
+        return []
+    with ThreadPoolExecutor(max_workers=min(SHARD_WORKERS, len(shards))) as pool:
+        return list(pool.map(run, shards))
+
+
+def federated(merge):
+    """Decorator for portfolio reads in sharded mode.
+
+    With sharding on and no property selected, the decorated function runs
+    against every shard in parallel and merge(results) combines the parts.
+    Otherwise it runs once on the current database file, unchanged.
+    """
+    def decorate(fetch):
+        @functools.wraps(fetch)
+        def wrapper(*args, **kwargs):
+            if not fans_out():
+                return fetch(*args, **kwargs)
+            return merge(fan_out(fetch, *args, **kwargs))
+        return wrapper
+    return decorate
+
+
+def concat_rows(parts):
+    """Merge list results (e.g. fetchall rows) shard after shard."""
+    return [row for part in parts for row in part]
+
+
+def concat_frames(parts, sort_by=None):
+    """Merge DataFrame results; row-level reports are already final per shard."""
+    frames = [frame for frame in parts if not frame.empty]
+    if not frames:
+        return parts[0] if parts else pd.DataFrame()
+    merged = pd.concat(frames, ignore_index=True)
+    # Shards' categoricals rarely share their categories, and concat turns
+    # those columns back into object strings
+    for column, dtype in frames[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) and not isinstance(merged[column].dtype, pd.CategoricalDtype):
+            merged[column] = merged[column].astype("category")
+    if sort_by is not None:
+        merged = merged.sort_values(sort_by, kind="stable").reset_index(drop=True)
+    return merged
+
+
+def sum_frames(*keys):
+    """Merger that adds up per-shard aggregates grouped by keys."""
+    def merge(parts):
+        merged = concat_frames(parts)
+        if merged.empty:
+            return merged
+        return merged.groupby(list(keys), as_index=False, sort=True).sum()
+    return merge
@@ -1,95 +1,396 @@
 
 
+import logging
 import sqlite3
+import heapq
 import pandas as pd
-DATABASE = "rental_management_v2.db"
+from controllers.change_feed_controller import id_chunks
+from controllers.database import connect, connect_report, on_shard
+from controllers.archive_controller import attach_archives
+from controllers.queries import register, execute
+from controllers.row_store import RowStore
+from controllers.room_controller import report_period_filters
+from controllers.property_controller import current_property, property_scope, register_scoped, execute_scoped
+from controllers.shard_controller import federated, concat_frames, fans_out, list_shards
+from controllers.typed_frames import read_typed, INTEGER
 
-def fetch_tenants():
-    connection = sqlite3.connect(DATABASE)
+logger = logging.getLogger(__name__)
+
+register_scoped("tenant.fetch_all", """
+SELECT id, first_name || ' ' || last_name AS name, phone, email
+FROM Tenant{where}
+""", "id", "tenant")
+
+def fetch_tenants(as_store=False):
+    """Fetch tenants; with a property selected, those leasing or living there."""
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        SELECT id, first_name || ' ' || last_name AS name, phone, email
-        FROM Tenant
-        """)
+        execute_scoped(cursor, "tenant.fetch_all")
+        if as_store:
+            return RowStore.from_cursor(cursor)
         return cursor.fetchall()
     except Exception as e:
-        print(f"Error fetching tenants: {e}")
-        return []
+        logger.exception("Error fetching tenants: %s", e)
+        return RowStore() if as_store else []
     finally:
         connection.close()
 
+def fetch_tenants_by_ids(tenant_ids):
+    """Fetch tenants for the given ids.
+
+    Missing ids were deleted or are outside the selected property.
+    """
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        scope, scope_params = property_scope("id", "tenant")
+        tenants = []
+        for chunk in id_chunks(tenant_ids):
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"""
+            SELECT id, first_name || ' ' || last_name AS name, phone, email
+            FROM Tenant
+            WHERE id IN ({placeholders}){scope}
+            """, [*chunk, *scope_params])
+            tenants.extend(cursor.fetchall())
+        return tenants
+    except Exception as e:
+        logger.exception("Error fetching tenants by id: %s", e)
+        raise
+    finally:
+        connection.close()
+
+register("tenant.insert", """
+INSERT INTO Tenant (first_name, last_name, phone, email)
+VALUES (?, ?, ?, ?)
+""")
+
 def add_tenant(first_name, last_name, phone, email):
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        INSERT INTO Tenant (first_name, last_name, phone, email)
-        VALUES (?, ?, ?, ?)
-        """, (first_name, last_name, phone, email))
+        execute(cursor, "tenant.insert", (first_name, last_name, phone, email))
         connection.commit()
     except sqlite3.IntegrityError as e:
-        print(f"Integrity Error: {e}")
+        logger.exception("Integrity Error: %s", e)
         raise
     except Exception as e:
-        print(f"Error adding tenant: {e}")
+        logger.exception("Error adding tenant: %s", e)
         raise
     finally:
         connection.close()
 
+register("tenant.update", """
+UPDATE Tenant
+SET first_name = ?, last_name = ?, phone = ?, email = ?
+WHERE id = ?
+""")
+
 def update_tenant(tenant_id, first_name, last_name, phone, email):
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
-        cursor.execute("""
-        UPDATE Tenant
-        SET first_name = ?, last_name = ?, phone = ?, email = ?
-        WHERE id = ?
-        """, (first_name, last_name, phone, email, tenant_id))
+        execute(cursor, "tenant.update", (first_name, last_name, phone, email, tenant_id))
         connection.commit()
     except Exception as e:
-        print(f"Error updating tenant: {e}")
+        logger.exception("Error updating tenant: %s", e)
         raise
     finally:
         connection.close()
 
+register("tenant.delete", """
+DELETE FROM Tenant
+WHERE id = ?
+""")
+
 def delete_tenant(tenant_id):
-    connection = sqlite3.connect(DATABASE)
+    connection = connect()
     cursor = connection.cursor()
     try:
         # Delete the tenant
-        cursor.execute("""
-        DELETE FROM Tenant
-        WHERE id = ?
-        """, (tenant_id,))
+        execute(cursor, "tenant.delete", (tenant_id,))
         connection.commit()
     except Exception as e:
-        print(f"Error deleting tenant: {e}")
+        logger.exception("Error deleting tenant: %s", e)
         raise
     finally:
         connection.close()
 #for report
 
-def fetch_tenant_data():
-    """Fetch detailed tenant data for Payment Report."""
-    connection = sqlite3.connect(DATABASE)
+# Names and contact details are unique per tenant, so they stay plain strings
+TENANT_DATA_TYPES = {
+    "tenant_id": INTEGER,
+    "active_leases": INTEGER,
+}
+
+
+@federated(lambda parts: concat_frames(parts, sort_by="tenant_id"))
+def fetch_tenant_data(start_date=None, end_date=None):
+    """Fetch detailed tenant data for Payment Report.
+
+    Active leases and overdue payments are grouped per tenant once and
+    joined. start_date/end_date (either optional) limit both to the period.
+    With a property selected, only its tenants and their leases and
+    payments there are counted.
+    """
+    connection = connect_report()
     try:
-        query = """
+        payment_period, lease_period, params = report_period_filters(start_date, end_date)
+        tenant_scope, scope_params = property_scope("t.id", "tenant", named=True)
+        params.update(scope_params)
+        query = f"""
+        WITH active_leases AS (
+            SELECT tenant_id, COUNT(*) AS active_leases
+            FROM Lease
+            WHERE status = 'Active'{lease_period}
+            GROUP BY tenant_id
+        ),
+        overdue AS (
+            SELECT tenant_id, SUM(amount) AS overdue_balance
+            FROM Payment
+            WHERE payment_status = 'Overdue'{payment_period}
+            GROUP BY tenant_id
+        )
         SELECT 
             t.id AS tenant_id,
             t.first_name || ' ' || t.last_name AS tenant_name,
             t.phone AS contact_number,
             t.email AS email_address,
-            (SELECT COUNT(*) FROM Lease WHERE Lease.tenant_id = t.id AND status = 'Active') AS active_leases,
-            (SELECT SUM(amount) FROM Payment WHERE Payment.tenant_id = t.id AND payment_status = 'Overdue') AS overdue_balance
+            COALESCE(l.active_leases, 0) AS active_leases,
+            o.overdue_balance
         FROM Tenant t
+        LEFT JOIN active_leases l ON l.tenant_id = t.id
+        LEFT JOIN overdue o ON o.tenant_id = t.id
+        WHERE 1 = 1{tenant_scope}
+        ORDER BY t.id
         """
-        df = pd.read_sql_query(query, connection)
-        return df
+        return read_typed(query, connection, TENANT_DATA_TYPES, params)
     except Exception as e:
-        print(f"Error fetching tenant data for report: {e}")
+        logger.exception("Error fetching tenant data for report: %s", e)
         return pd.DataFrame()  # Return empty DataFrame on error
     finally:
         connection.close()
 
 
+
+
+# Tenant counts for the Tenant Report. TenantSummary is one row kept current
+# by the triggers from add_tenant_summary; TenantActivity holds the per-tenant
+# counts those triggers need to tell when a tenant becomes (in)active.
+TENANT_SUMMARY_REBUILD = [
+    "DELETE FROM TenantActivity",
+    "DELETE FROM TenantSummary",
+    """
+    INSERT INTO TenantActivity (tenant_id, active_leases, overdue_payments)
+    SELECT tenant_id, SUM(active_leases), SUM(overdue_payments)
+    FROM (
+        SELECT tenant_id, COUNT(*) AS active_leases, 0 AS overdue_payments
+        FROM Lease WHERE status = 'Active' GROUP BY tenant_id
+        UNION ALL
+        SELECT tenant_id, 0, COUNT(*)
+        FROM Payment WHERE payment_status = 'Overdue' GROUP BY tenant_id
+    )
+    GROUP BY tenant_id
+    """,
+    """
+    INSERT INTO TenantSummary (id, total_tenants, active_tenants, overdue_tenants)
+    SELECT 1,
+           (SELECT COUNT(*) FROM Tenant),
+           (SELECT COUNT(*) FROM TenantActivity WHERE active_leases > 0),
+           (SELECT COUNT(*) FROM TenantActivity WHERE overdue_payments > 0)
+    """,
+]
+
+register("tenant.summary", "SELECT total_tenants, active_tenants, overdue_tenants FROM TenantSummary WHERE id = 1")
+
+@federated(lambda parts: tuple(map(sum, zip(*parts))) if parts else (0, 0, 0, 0))
+def fetch_tenant_summary():
+    """Return (total, active, inactive, overdue) tenant counts.
+
+    For the whole portfolio this reads the maintained TenantSummary row.
+    With a property selected the counts are recomputed for its tenants,
+    which only touches that property's leases and payments.
+    """
+    if current_property() is not None:
+        return compute_tenant_summary()
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        execute(cursor, "tenant.summary")
+        row = cursor.fetchone()
+        if row is None:
+            return compute_tenant_summary()
+        total, active, overdue = row
+        return total, active, total - active, overdue
+    except Exception as e:
+        logger.exception("Error fetching tenant summary: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+def compute_tenant_summary():
+    """Count (total, active, inactive, overdue) tenants from the base tables.
+
+    The full-recompute path: used for a selected property and to check the
+    maintained summary.
+    """
+    tenant_scope, tenant_params = property_scope("id", "tenant")
+    room_scope, room_params = property_scope("room_id", "room")
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"""
+        SELECT
+            (SELECT COUNT(*) FROM Tenant WHERE 1 = 1{tenant_scope}),
+            (SELECT COUNT(DISTINCT tenant_id) FROM Lease WHERE status = 'Active'{room_scope}),
+            (SELECT COUNT(DISTINCT tenant_id) FROM Payment WHERE payment_status = 'Overdue'{room_scope})
+        """, [*tenant_params, *room_params, *room_params])
+        total, active, overdue = cursor.fetchone()
+        return total, active, total - active, overdue
+    except Exception as e:
+        logger.exception("Error computing tenant summary: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+def rebuild_tenant_summary():
+    """Reset the maintained tenant summary from the base tables."""
+    connection = connect()
+    cursor = connection.cursor()
+    try:
+        for statement in TENANT_SUMMARY_REBUILD:
+            cursor.execute(statement)
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        logger.exception("Error rebuilding tenant summary: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+# Tenant payment ranking for the Tenant Report: per-tenant totals of Paid
+# payments from the revenue cube (one cell per tenant, room, month, method
+# and status), so a page costs one grouped pass over the cube and never
+# loads Payment rows. Pending and Overdue amounts are owed, not paid.
+TENANT_RANKING_COLUMNS = ["tenant_id", "tenant_name", "total_paid", "payment_count", "last_period"]
+
+
+def _tenant_ranking_query(include_archive, paged):
+    scope, params = property_scope("room_id", "room", named=True)
+    source = f"""
+    SELECT tenant_id, period, total_amount, payment_count FROM RevenueCube
+    WHERE payment_status = 'Paid'{scope}"""
+    if include_archive:
+        source += f"""
+        UNION ALL
+        SELECT tenant_id, period, total_amount, payment_count FROM PaymentRollup
+        WHERE payment_status = 'Paid'{scope}"""
+    # Rank (and cut the page) before joining Tenant for the names
+    query = f"""
+    WITH ranking AS (
+        SELECT tenant_id, SUM(total_amount) AS total_paid,
+               SUM(payment_count) AS payment_count, MAX(period) AS last_period
+        FROM ({source})
+        GROUP BY tenant_id
+        ORDER BY total_paid DESC, tenant_id
+        {"LIMIT :limit OFFSET :offset" if paged else ""}
+    )
+    SELECT k.tenant_id, t.first_name || ' ' || t.last_name AS tenant_name,
+           k.total_paid, k.payment_count, k.last_period
+    FROM ranking k
+    LEFT JOIN Tenant t ON t.id = k.tenant_id
+    ORDER BY k.total_paid DESC, k.tenant_id
+    """
+    return query, params
+
+
+def _ranking_key(row):
+    return -row[2], row[0]
+
+
+def _merge_ranking(parts):
+    # A tenant renting in several properties has a row in each shard
+    merged = {}
+    for rows in parts:
+        for tenant_id, name, total, count, last_period in rows:
+            if tenant_id in merged:
+                _id, name, seen_total, seen_count, seen_period = merged[tenant_id]
+                total, count = total + seen_total, count + seen_count
+                last_period = max(last_period, seen_period)
+            merged[tenant_id] = (tenant_id, name, total, count, last_period)
+    return sorted(merged.values(), key=_ranking_key)
+
+
+@federated(_merge_ranking)
+def _fetch_ranking_page(limit, offset, include_archive):
+    query, params = _tenant_ranking_query(include_archive, paged=True)
+    connection = connect_report()
+    try:
+        if include_archive:
+            attach_archives(connection)
+        return connection.execute(query, {**params, "limit": limit, "offset": offset}).fetchall()
+    except sqlite3.Error as e:
+        logger.exception("Error fetching tenant payment ranking: %s", e)
+        return []
+    finally:
+        connection.close()
+
+
+def fetch_tenant_payment_ranking(limit=10, offset=0, include_archive=False):
+    """One page of tenants ranked by total Paid payments, highest first.
+
+    Rows are (tenant_id, tenant_name, total_paid, payment_count, last_period),
+    counting Paid payments only; last_period is the YYYY-MM of the latest. Across shards each
+    shard returns its first offset + limit tenants, which are then merged,
+    so deep pages cost more there than on a single file.
+    """
+    if fans_out():
+        return _fetch_ranking_page(offset + limit, 0, include_archive)[offset:offset + limit]
+    return _fetch_ranking_page(limit, offset, include_archive)
+
+
+def _open_ranking_cursor(include_archive):
+    # Opened eagerly, so each shard's connection is made while it is selected
+    query, params = _tenant_ranking_query(include_archive, paged=False)
+    connection = connect_report()
+    try:
+        if include_archive:
+            attach_archives(connection)
+        return connection, connection.execute(query, params)
+    except Exception:
+        connection.close()
+        raise
+
+
+def _drain(cursor, batch_size):
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
+
+
+def iter_tenant_payment_ranking(include_archive=False, batch_size=1000):
+    """Yield the whole tenant ranking row by row, without holding it in memory.
+
+    Rows are the same as fetch_tenant_payment_ranking's. Across shards the
+    already sorted shard streams are merged in order; a tenant renting in
+    several properties then appears once per property.
+    """
+    opened = []
+    try:
+        if not fans_out():
+            opened.append(_open_ranking_cursor(include_archive))
+        else:
+            for property_id in list_shards():
+                with on_shard(property_id):
+                    opened.append(_open_ranking_cursor(include_archive))
+        streams = [_drain(cursor, batch_size) for _connection, cursor in opened]
+        yield from heapq.merge(*streams, key=_ranking_key)
+    finally:
+        for connection, _cursor in opened:
+            connection.close()
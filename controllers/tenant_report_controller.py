@@ -63,43 +63,29 @@
 
 
 
+import logging
+import csv
 import pandas as pd
 from matplotlib import pyplot as plt
-from controllers.tenant_controller import fetch_tenant_data
-from controllers.payment_management_controller import fetch_payment_data
-from controllers.lease_management_controller import fetch_lease_data
+from controllers.tenant_controller import (
+    fetch_tenant_summary, fetch_tenant_payment_ranking, iter_tenant_payment_ranking
+)
 import os
 
-class TenantReportController:
-    def __init__(self):
-        try:
-            self.tenant_data = pd.DataFrame(fetch_tenant_data())  # Fetch tenant data from DB
-            self.payment_data = pd.DataFrame(fetch_payment_data())  # Fetch payment data
-            self.lease_data = pd.DataFrame(fetch_lease_data())  # Fetch lease data
-            print("TenantReportController initialized.")  # Debug print
-        except Exception as e:
-            print(f"Error initializing TenantReportController: {e}")  # Debug print
-            self.tenant_data = pd.DataFrame()
-            self.payment_data = pd.DataFrame()
-            self.lease_data = pd.DataFrame()
+logger = logging.getLogger(__name__)
 
+PAYMENT_REPORT_HEADERS = ['Tenant ID', 'Tenant', 'Total Payments', 'Payments', 'Last Payment']
+
+class TenantReportController:
     def get_tenant_summary(self):
         """Generate tenant summary: total, active, inactive, overdue."""
         try:
-            total_tenants = len(self.tenant_data)
-            active_tenants = (
-                len(self.lease_data[self.lease_data['status'] == 'Active']['tenant_id'].unique())
-                if 'tenant_id' in self.lease_data.columns else 0
-            )
-            inactive_tenants = total_tenants - active_tenants
-            overdue_tenants = (
-                len(self.payment_data[self.payment_data['status'] == 'Overdue']['tenant_id'].unique())
-                if 'tenant_id' in self.payment_data.columns else 0
-            )
-            print(f"Tenant Summary: Total={total_tenants}, Active={active_tenants}, Inactive={inactive_tenants}, Overdue={overdue_tenants}")  # Debug print
+            # Maintained by triggers; no DataFrame filtering per call
+            total_tenants, active_tenants, inactive_tenants, overdue_tenants = fetch_tenant_summary()
+            logger.debug("Tenant Summary: Total=%s, Active=%s, Inactive=%s, Overdue=%s", total_tenants, active_tenants, inactive_tenants, overdue_tenants)
             return total_tenants, active_tenants, inactive_tenants, overdue_tenants
         except Exception as e:
-            print(f"Error in get_tenant_summary: {e}")  # Debug print
+            logger.exception("Error in get_tenant_summary: %s", e)
             return 0, 0, 0, 0
 
     def generate_bar_chart(self, active, inactive):
@@ -114,10 +100,10 @@ class TenantReportController:
             plt.ylabel("Number of Tenants")
             plt.savefig(chart_path)
             plt.close()
-            print(f"Bar chart saved at {chart_path}")  # Debug print
+            logger.debug("Bar chart saved at %s", chart_path)
             return chart_path
         except Exception as e:
-            print(f"Error in generate_bar_chart: {e}")  # Debug print
+            logger.exception("Error in generate_bar_chart: %s", e)
             return None
 
     def generate_pie_chart(self, active, inactive):
@@ -131,40 +117,53 @@ class TenantReportController:
             plt.title("Tenant Status Distribution")
             plt.savefig(chart_path)
             plt.close()
-            print(f"Pie chart saved at {chart_path}")  # Debug print
+            logger.debug("Pie chart saved at %s", chart_path)
             return chart_path
         except Exception as e:
-            print(f"Error in generate_pie_chart: {e}")  # Debug print
+            logger.exception("Error in generate_pie_chart: %s", e)
             return None
 
-    def get_tenant_payment_report(self):
-        """Generate a payment report for tenants."""
+    def get_tenant_payment_report(self, limit=10, offset=0):
+        """One page of the tenant payment ranking, highest total first."""
         try:
-            if 'amount' not in self.payment_data.columns:
-                raise KeyError("Column 'amount' not found in payment data.")
-            payments = self.payment_data.groupby('tenant_id')['amount'].sum().reset_index()
-            payments.columns = ['Tenant ID', 'Total Payments']
-            print(f"Generated tenant payment report:\n{payments}")  # Debug print
-            return payments.sort_values(by='Total Payments', ascending=False)
+            rows = fetch_tenant_payment_ranking(limit, offset)
+            payments = pd.DataFrame(rows, columns=PAYMENT_REPORT_HEADERS)
+            logger.debug("Generated tenant payment report page at %s: %s rows", offset, len(payments))
+            return payments
         except Exception as e:
-            print(f"Error in get_tenant_payment_report: {e}")  # Debug print
-            return pd.DataFrame()
+            logger.exception("Error in get_tenant_payment_report: %s", e)
+            return pd.DataFrame(columns=PAYMENT_REPORT_HEADERS)
+
+    def export_payment_report(self, file_path="reports/tenant_payment_report.csv"):
+        """Write the full ranking to CSV as it streams from the database; returns the row count."""
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        count = 0
+        with open(file_path, mode="w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(PAYMENT_REPORT_HEADERS)
+            for row in iter_tenant_payment_ranking():
+                writer.writerow(row)
+                count += 1
+        logger.info("Payment report exported to %s: %s tenants", file_path, count)
+        return count
 
     def generate_payment_bar_chart(self, payment_data):
         """Generate a bar chart for tenant payments."""
         try:
             top_tenants = payment_data.head(10)  # Top 10 tenants by total payments
+            labels = top_tenants['Tenant'].fillna('') + ' #' + top_tenants['Tenant ID'].astype(str)
             os.makedirs("reports", exist_ok=True)
             chart_path = "reports/tenant_payment_bar_chart.png"
-            plt.barh(top_tenants['Tenant ID'], top_tenants['Total Payments'], color='blue')
+            plt.barh(labels[::-1], top_tenants['Total Payments'][::-1], color='blue')
             plt.title("Top 10 Tenants by Payments")
             plt.xlabel("Total Payments")
-            plt.ylabel("Tenant ID")
+            plt.ylabel("Tenant")
+            plt.tight_layout()
             plt.savefig(chart_path)
             plt.close()
-            print(f"Payment bar chart saved at {chart_path}")  # Debug print
+            logger.debug("Payment bar chart saved at %s", chart_path)
             return chart_path
         except Exception as e:
-            print(f"Error in generate_payment_bar_chart: {e}")  # Debug print
+            logger.exception("Error in generate_payment_bar_chart: %s", e)
             return None
 
@@ -0,0 +1,52 @@
+import pandas as pd
+
+# Report datasets declare a type per column rather than taking what
+# read_sql_query infers (object strings for everything textual):
+#   "category" - few distinct values (statuses, room types)
+#   "date"     - YYYY-MM-DD text, parsed once at read time; bad or empty -> NaT
+#   "integer"  - ids and counts, downcast to the smallest integer type that fits
+#                (nullable Int64 where the column has NULLs)
+# Columns left out keep the inferred dtype; money stays float64, as float32
+# would round amounts above a few hundred thousand.
+CATEGORY = "category"
+DATE = "date"
+INTEGER = "integer"
+
+# Off, the datasets come back as pandas reads them; memory_report uses this
+# to measure what the declared types save.
+APPLY_TYPES = True
+
+
+def apply_types(df, types):
+    """Convert df's columns to the declared types, in place. Returns df."""
+    if not APPLY_TYPES:
+        return df
+    for column, kind in types.items():
+        if column not in df.columns:
+            continue
+        if kind == CATEGORY:
+            df[column] = df[column].astype("category")
+        elif kind == DATE:
+            df[column] = pd.to_datetime(df[column], format="%Y-%m-%d", errors="coerce")
+        elif kind == INTEGER:
+            values = pd.to_numeric(df[column])
+            if values.isna().any():
+                df[column] = values.astype("Int64")
+            else:
+                df[column] = pd.to_numeric(values, downcast="integer")
+        else:
+            raise ValueError(f"Unknown column type {kind!r} for {column}")
+    return df
+
+
+def read_typed(query, connection, types, params=None):
+    """pd.read_sql_query with the columns converted to the declared types."""
+    return apply_types(pd.read_sql_query(query, connection, params=params), types)
+
+
+def memory_report(df):
+    """Per-column dtype and memory (bytes, strings included) of df, largest first."""
+    usage = df.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({"dtype": df.dtypes.astype(str), "bytes": usage})
+    report.index.name = "column"
+    return report.sort_values("bytes", ascending=False)
@@ -1,7 +1,8 @@
 
-from PyQt6.QtCore import Qt
+import logging
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QStackedWidget, QVBoxLayout, QWidget, QPushButton, QDockWidget
+    QApplication, QMainWindow, QStackedWidget, QVBoxLayout, QWidget, QPushButton, QDockWidget, QComboBox, QLabel
 )
 from views.dashboard import Dashboard  # Main dashboard 
 from views.room_management import RoomManagement
@@ -9,11 +10,21 @@ from views.tenant_management import TenantManagement
 from views.payment_management import PaymentManagement
 from views.lease_management import LeaseManagement
 from views.room_report import RoomReport
+from models.db_script_v2.migrate import apply_migrations, apply_shard_migrations
+from controllers.reconciliation_controller import reconcile_rooms
+from controllers.backup_controller import create_snapshot_in_background
+from controllers.change_feed_controller import prune_seen_changes
+from controllers.property_controller import fetch_properties, set_current_property
+from controllers.app_logging import start_logging
+from views.responsiveness import EventLoopMonitor
 # from views.tenant_report import TenantReportView
-# from views.lease_report import LeaseReportView
-# from views.payment_report import PaymentReportView
+from views.lease_report import LeaseReportView
+from views.payment_report import PaymentReportView
 import sys
 import os
+
+logger = logging.getLogger(__name__)
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -32,8 +43,8 @@ class MainWindow(QMainWindow):
         self.payment_management = PaymentManagement()
         self.room_report = RoomReport()
         # self.tenant_report = TenantReportView()
-        # self.lease_report = LeaseReportView()
-        # self.payment_report = PaymentReportView()
+        self.lease_report = LeaseReportView()
+        self.payment_report = PaymentReportView()
         self.dashboard = Dashboard()
 
         # Add Views to Stack
@@ -44,17 +55,37 @@ class MainWindow(QMainWindow):
         self.central_widget.addWidget(self.payment_management)
         self.central_widget.addWidget(self.room_report)
         # self.central_widget.addWidget(self.tenant_report)
-        # self.central_widget.addWidget(self.lease_report)
-        # self.central_widget.addWidget(self.payment_report)
+        self.central_widget.addWidget(self.lease_report)
+        self.central_widget.addWidget(self.payment_report)
 
         # Sidebar Navigation
         self.init_sidebar()
 
+        # Online snapshots while the app runs; skipped when nothing changed
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.timeout.connect(create_snapshot_in_background)
+        self.snapshot_timer.start(60 * 60 * 1000)  # Hourly
+
+        # Drop change log entries every open view has already polled
+        self.change_log_timer = QTimer(self)
+        self.change_log_timer.timeout.connect(prune_seen_changes)
+        self.change_log_timer.start(10 * 60 * 1000)  # Every 10 minutes
+
     def init_sidebar(self):
         sidebar = QDockWidget("Navigation", self)
         container = QWidget()
         layout = QVBoxLayout()
 
+        # Every screen shows only the selected property's rooms and records
+        self.property_selector = QComboBox()
+        self.property_selector.setStyleSheet("font-size: 14px;")
+        self.property_selector.addItem("All Properties", None)
+        for property_id, name, _address in fetch_properties():
+            self.property_selector.addItem(name, property_id)
+        self.property_selector.currentIndexChanged.connect(self.on_property_changed)
+        layout.addWidget(QLabel("Property:"))
+        layout.addWidget(self.property_selector)
+
         # Helper function to create styled buttons
         def create_button(label, on_click):
             btn = QPushButton(label)
@@ -71,13 +102,13 @@ class MainWindow(QMainWindow):
         payment_btn = create_button("Payments Module", lambda: self.central_widget.setCurrentWidget(self.payment_management))
         room_report_btn = create_button("Room Report", lambda: self.central_widget.setCurrentWidget(self.room_report))
         # tenant_report_btn = create_button("Tenant Report", lambda: self.central_widget.setCurrentWidget(self.tenant_report))
-        # lease_report_btn = create_button("Lease Report", lambda: self.central_widget.setCurrentWidget(self.lease_report))
-        # payment_report_btn = create_button("Payment Report", lambda: self.central_widget.setCurrentWidget(self.payment_report))
+        lease_report_btn = create_button("Lease Report", lambda: self.central_widget.setCurrentWidget(self.lease_report))
+        payment_report_btn = create_button("Payment Report", lambda: self.central_widget.setCurrentWidget(self.payment_report))
         # dashboard_btn = create_button("Dashboard", lambda: self.central_widget.setCurrentWidget(self.dashboard))
 
         # Add buttons to the layout
         #for btn in [dashboard_btn, property_room_btn, tenant_btn, lease_btn, payment_btn, room_report_btn, tenant_report_btn, lease_report_btn, payment_report_btn]:
-        for btn in [ property_room_btn, tenant_btn, lease_btn, payment_btn, room_report_btn]:
+        for btn in [ property_room_btn, tenant_btn, lease_btn, payment_btn, room_report_btn, lease_report_btn, payment_report_btn]:
         
             layout.addWidget(btn)
  
@@ -85,12 +116,33 @@ class MainWindow(QMainWindow):
         sidebar.setWidget(container)
         self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, sidebar)
 
+    def on_property_changed(self, _index):
+        """Scope every screen to the chosen property and reload them."""
+        set_current_property(self.property_selector.currentData())
+        self.room_management.load_rooms()
+        self.tenant_management.load_tenants()
+        self.lease_management.load_leases()
+        self.payment_management.load_payments()
+        self.lease_report.load_summary()
+        self.payment_report.load_summary()
+
 
 if __name__ == "__main__":
     import sys
     app = QApplication(sys.argv)
+    start_logging()  # Log records are written to logs/ by a background thread
+    apply_migrations()  # Bring the database schema up to date before any view loads
+    apply_shard_migrations()  # Property shards too, in sharded mode
+    drift = reconcile_rooms()  # Repair derived room state before the views read it
+    if drift:
+        logger.info("Reconciled %s room(s) with drifted occupancy, tenant or rent totals.", len(drift))
     window = MainWindow()
     window.show()
+    # Records event-loop stalls and what caused them; the report goes to logs/ on exit
+    monitor = EventLoopMonitor()
+    monitor.start(window)
+    app.aboutToQuit.connect(monitor.stop)
+    app.aboutToQuit.connect(monitor.recorder.export)
     sys.exit(app.exec())
 
 
@@ -0,0 +1,49 @@
+import sqlite3
+
+DATABASE = "rental_management_v2.db"
+
+
+def add_archive_rollups(database=DATABASE):
+    """Create the summary tables that keep archived history in the main file."""
+    connection = sqlite3.connect(database)
+    cursor = connection.cursor()
+    try:
+        # Monthly payment totals for rows moved to the per-year archives
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS PaymentRollup (
+            period TEXT NOT NULL,  -- YYYY-MM of the payment date
+            room_id INTEGER NOT NULL,
+            tenant_id INTEGER NOT NULL,
+            payment_status TEXT NOT NULL,
+            total_amount REAL NOT NULL DEFAULT 0,
+            payment_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (period, room_id, tenant_id, payment_status)
+        );
+        """)
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_paymentrollup_room
+        ON PaymentRollup (room_id, total_amount);
+        """)
+
+        # Yearly lease counts for closed leases moved to the archives
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS LeaseRollup (
+            period TEXT NOT NULL,  -- YYYY of the lease end date
+            room_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            lease_count INTEGER NOT NULL DEFAULT 0,
+            lease_days REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (period, room_id, status)
+        );
+        """)
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        print(f"Error adding archive rollup tables: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    add_archive_rollups()
@@ -0,0 +1,63 @@
+import sqlite3
+
+DATABASE = "rental_management_v2.db"
+
+# Tables whose row changes are recorded in the change log
+TRACKED_TABLES = ["Room", "Tenant", "Lease", "Payment", "Booking"]
+
+
+def add_change_log(database=DATABASE):
+    """Create the append-only ChangeLog table and its capture triggers."""
+    connection = sqlite3.connect(database)
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ChangeLog (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            operation TEXT NOT NULL,  -- INSERT, UPDATE, DELETE
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        """)
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_changelog_table_seq
+        ON ChangeLog (table_name, seq);
+        """)
+
+        for table in TRACKED_TABLES:
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table.lower()}_change_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO ChangeLog (table_name, row_id, operation)
+                VALUES ('{table}', NEW.id, 'INSERT');
+            END;
+            """)
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table.lower()}_change_update
+            AFTER UPDATE ON {table}
+            BEGIN
+                INSERT INTO ChangeLog (table_name, row_id, operation)
+                VALUES ('{table}', NEW.id, 'UPDATE');
+            END;
+            """)
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table.lower()}_change_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO ChangeLog (table_name, row_id, operation)
+                VALUES ('{table}', OLD.id, 'DELETE');
+            END;
+            """)
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        print(f"Error adding change log: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    add_change_log()
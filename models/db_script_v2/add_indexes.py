@@ -0,0 +1,51 @@
+import sqlite3
+
+DATABASE = "rental_management_v2.db"
+
+# (index name, table, columns) for the filters and joins the controllers use
+INDEXES = [
+    ("idx_lease_status_end_date", "Lease", "status, end_date"),
+    ("idx_lease_end_date", "Lease", "end_date"),
+    ("idx_lease_room_status", "Lease", "room_id, status"),
+    ("idx_payment_room_amount", "Payment", "room_id, amount"),
+    # Sort/filter columns of the management grids
+    ("idx_payment_amount", "Payment", "amount"),
+    ("idx_payment_date", "Payment", "date"),
+    ("idx_payment_due_date", "Payment", "due_date"),
+    ("idx_payment_method_date", "Payment", "method, date"),
+    ("idx_payment_status_date", "Payment", "payment_status, date"),
+    ("idx_lease_start_date", "Lease", "start_date"),
+    ("idx_room_name", "Room", "name"),
+    ("idx_room_type", "Room", "type"),
+    ("idx_room_rental_price", "Room", "rental_price"),
+    ("idx_room_occupancy_status", "Room", "occupancy_status"),
+    ("idx_tenant_full_name", "Tenant", "(first_name || ' ' || last_name)"),
+]
+
+# Indexes no query reads any more; dropped so writes stop maintaining them
+RETIRED_INDEXES = [
+    "idx_room_rent_collected",
+    "idx_room_property_rent_collected",
+]
+
+
+def add_indexes(database=DATABASE):
+    """Create the secondary indexes used by controller queries and drop retired ones."""
+    connection = sqlite3.connect(database)
+    cursor = connection.cursor()
+    try:
+        for name, table, columns in INDEXES:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+        for name in RETIRED_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        print(f"Error adding indexes: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    add_indexes()
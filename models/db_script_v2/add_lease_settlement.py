@@ -0,0 +1,41 @@
+import sqlite3
+
+DATABASE = "rental_management_v2.db"
+
+
+def add_lease_settlement(database=DATABASE):
+    """Create the table recording the settlement of each terminated lease."""
+    connection = sqlite3.connect(database)
+    cursor = connection.cursor()
+    try:
+        # Amounts as of the termination date; written with the lease status change
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS LeaseSettlement (
+            lease_id INTEGER PRIMARY KEY,
+            room_id INTEGER NOT NULL,
+            tenant_id INTEGER NOT NULL,
+            termination_date TEXT NOT NULL,
+            prorated_rent REAL NOT NULL DEFAULT 0,      -- rent for the days used of the final period
+            unpaid_balance REAL NOT NULL DEFAULT 0,     -- Pending/Overdue payments of earlier periods
+            final_period_paid REAL NOT NULL DEFAULT 0,  -- already paid towards the final period
+            security_deposit REAL NOT NULL DEFAULT 0,
+            deposit_refund REAL NOT NULL DEFAULT 0,
+            balance_due REAL NOT NULL DEFAULT 0,        -- what the deposit does not cover
+            settled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        """)
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_leasesettlement_room
+        ON LeaseSettlement (room_id);
+        """)
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        print(f"Error adding lease settlement table: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    add_lease_settlement()
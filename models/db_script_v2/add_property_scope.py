@@ -0,0 +1,45 @@
+import sqlite3
+
+DATABASE = "rental_management_v2.db"
+
+
+def add_property_scope(database=DATABASE):
+    """Create the Property table and link every room to one property."""
+    connection = sqlite3.connect(database)
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Property (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            address TEXT
+        );
+        """)
+
+        # Rooms created before properties existed keep a NULL property and
+        # are only listed when no property is selected
+        room_columns = {row[1] for row in cursor.execute("PRAGMA table_info(Room)")}
+        if "property_id" not in room_columns:
+            cursor.execute("ALTER TABLE Room ADD COLUMN property_id INTEGER REFERENCES Property (id)")
+
+        # Property-scoped reads: the grid's default name order, available
+        # rooms and the room ids that Lease/Payment queries are limited to
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_room_property_name
+        ON Room (property_id, name);
+        """)
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_room_property_status
+        ON Room (property_id, occupancy_status);
+        """)
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        print(f"Error adding property scope: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    add_property_scope()
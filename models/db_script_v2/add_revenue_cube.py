@@ -0,0 +1,165 @@
+import sqlite3
+from controllers.revenue_cube_controller import REVENUE_CUBE_REBUILD
+
+DATABASE = "rental_management_v2.db"
+
+# Cell key of a payment row; {row} is NEW or OLD
+_CUBE_KEY = (
+    "strftime('%Y-%m', {row}.date), {row}.room_id, {row}.tenant_id, "
+    "COALESCE({row}.method, ''), COALESCE({row}.payment_status, 'Pending')"
+)
+_MONTH_KEY = (
+    "strftime('%Y-%m', {row}.date), "
+    "COALESCE((SELECT property_id FROM Room WHERE id = {row}.room_id), 0), "
+    "COALESCE({row}.method, ''), COALESCE({row}.payment_status, 'Pending')"
+)
+
+
+def _add_payment(row):
+    """Trigger statements counting a payment row into both tables."""
+    return f"""
+        INSERT INTO RevenueCube (period, room_id, tenant_id, method, payment_status, total_amount, payment_count)
+        VALUES ({_CUBE_KEY.format(row=row)}, {row}.amount, 1)
+        ON CONFLICT DO UPDATE SET
+            total_amount = total_amount + excluded.total_amount,
+            payment_count = payment_count + 1;
+        INSERT INTO RevenueByMonth (period, property_id, method, payment_status, total_amount, payment_count)
+        VALUES ({_MONTH_KEY.format(row=row)}, {row}.amount, 1)
+        ON CONFLICT DO UPDATE SET
+            total_amount = total_amount + excluded.total_amount,
+            payment_count = payment_count + 1;
+    """
+
+
+def _remove_payment(row):
+    """Trigger statements taking a payment row out of both tables."""
+    return f"""
+        UPDATE RevenueCube
+        SET total_amount = total_amount - {row}.amount, payment_count = payment_count - 1
+        WHERE (period, room_id, tenant_id, method, payment_status) = ({_CUBE_KEY.format(row=row)});
+        DELETE FROM RevenueCube
+        WHERE (period, room_id, tenant_id, method, payment_status) = ({_CUBE_KEY.format(row=row)})
+          AND payment_count <= 0;
+        UPDATE RevenueByMonth
+        SET total_amount = total_amount - {row}.amount, payment_count = payment_count - 1
+        WHERE (period, property_id, method, payment_status) = ({_MONTH_KEY.format(row=row)});
+        DELETE FROM RevenueByMonth
+        WHERE (period, property_id, method, payment_status) = ({_MONTH_KEY.format(row=row)})
+          AND payment_count <= 0;
+    """
+
+
+def add_revenue_cube(database=DATABASE):
+    """Create the revenue cube tables and the Payment triggers that keep them current."""
+    connection = sqlite3.connect(database)
+    cursor = connection.cursor()
+    try:
+        # Live payment totals per month, room, tenant, method and status
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS RevenueCube (
+            period TEXT NOT NULL,  -- YYYY-MM of the payment date
+            room_id INTEGER NOT NULL,
+            tenant_id INTEGER NOT NULL,
+            method TEXT NOT NULL,  -- '' when the payment has none
+            payment_status TEXT NOT NULL,
+            total_amount REAL NOT NULL DEFAULT 0,
+            payment_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (period, room_id, tenant_id, method, payment_status)
+        ) WITHOUT ROWID;
+        """)
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_revenuecube_room_period
+        ON RevenueCube (room_id, period);
+        """)
+        # Per-tenant totals (tenant ranking) without a temp b-tree for the grouping
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_revenuecube_tenant
+        ON RevenueCube (tenant_id, total_amount, payment_count);
+        """)
+
+        # The same totals without room and tenant, per property
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS RevenueByMonth (
+            period TEXT NOT NULL,
+            property_id INTEGER NOT NULL,  -- 0 for rooms without a property
+            method TEXT NOT NULL,
+            payment_status TEXT NOT NULL,
+            total_amount REAL NOT NULL DEFAULT 0,
+            payment_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (period, property_id, method, payment_status)
+        ) WITHOUT ROWID;
+        """)
+
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_payment_revenue_insert
+        AFTER INSERT ON Payment
+        BEGIN
+            {_add_payment("NEW")}
+        END;
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_payment_revenue_delete
+        AFTER DELETE ON Payment
+        BEGIN
+            {_remove_payment("OLD")}
+        END;
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_payment_revenue_update
+        AFTER UPDATE OF amount, date, room_id, tenant_id, method, payment_status ON Payment
+        BEGIN
+            {_remove_payment("OLD")}
+            {_add_payment("NEW")}
+        END;
+        """)
+
+        # A room changing property moves its revenue between properties
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_room_property_revenue
+        AFTER UPDATE OF property_id ON Room
+        WHEN OLD.property_id IS NOT NEW.property_id
+        BEGIN
+            UPDATE RevenueByMonth
+            SET total_amount = RevenueByMonth.total_amount - moved.total_amount,
+                payment_count = RevenueByMonth.payment_count - moved.payment_count
+            FROM (
+                SELECT period, method, payment_status,
+                       SUM(total_amount) AS total_amount, SUM(payment_count) AS payment_count
+                FROM RevenueCube
+                WHERE room_id = NEW.id
+                GROUP BY 1, 2, 3
+            ) AS moved
+            WHERE RevenueByMonth.period = moved.period
+              AND RevenueByMonth.property_id = COALESCE(OLD.property_id, 0)
+              AND RevenueByMonth.method = moved.method
+              AND RevenueByMonth.payment_status = moved.payment_status;
+            DELETE FROM RevenueByMonth WHERE payment_count <= 0;
+            INSERT INTO RevenueByMonth (period, property_id, method, payment_status, total_amount, payment_count)
+            SELECT period, COALESCE(NEW.property_id, 0), method, payment_status,
+                   SUM(total_amount), SUM(payment_count)
+            FROM RevenueCube
+            WHERE room_id = NEW.id
+            GROUP BY 1, 2, 3, 4
+            ON CONFLICT DO UPDATE SET
+                total_amount = total_amount + excluded.total_amount,
+                payment_count = payment_count + excluded.payment_count;
+        END;
+        """)
+
+        # Fill a new cube from the payments already there
+        cube_empty = cursor.execute("SELECT NOT EXISTS (SELECT 1 FROM RevenueCube)").fetchone()[0]
+        has_payments = cursor.execute("SELECT EXISTS (SELECT 1 FROM Payment)").fetchone()[0]
+        if cube_empty and has_payments:
+            for statement in REVENUE_CUBE_REBUILD:
+                cursor.execute(statement)
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        print(f"Error adding revenue cube: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    add_revenue_cube()
@@ -0,0 +1,103 @@
+import sqlite3
+from controllers.tenant_controller import TENANT_SUMMARY_REBUILD
+
+DATABASE = "rental_management_v2.db"
+
+# (counter column, summary column) a tenant gains or loses one row of
+_COUNTERS = {
+    "lease": ("active_leases", "active_tenants"),
+    "payment": ("overdue_payments", "overdue_tenants"),
+}
+
+
+def _count_in(kind, row):
+    """Trigger statements counting one more active lease / overdue payment for {row}.tenant_id."""
+    counter, summary = _COUNTERS[kind]
+    return f"""
+        UPDATE TenantSummary SET {summary} = {summary} + 1
+        WHERE id = 1 AND NOT EXISTS (
+            SELECT 1 FROM TenantActivity WHERE tenant_id = {row}.tenant_id AND {counter} > 0
+        );
+        INSERT INTO TenantActivity (tenant_id, {counter}) VALUES ({row}.tenant_id, 1)
+        ON CONFLICT DO UPDATE SET {counter} = {counter} + 1;
+    """
+
+
+def _count_out(kind, row):
+    """Trigger statements counting one less active lease / overdue payment for {row}.tenant_id."""
+    counter, summary = _COUNTERS[kind]
+    return f"""
+        UPDATE TenantActivity SET {counter} = {counter} - 1 WHERE tenant_id = {row}.tenant_id;
+        UPDATE TenantSummary SET {summary} = {summary} - 1
+        WHERE id = 1 AND EXISTS (
+            SELECT 1 FROM TenantActivity WHERE tenant_id = {row}.tenant_id AND {counter} = 0
+        );
+        DELETE FROM TenantActivity
+        WHERE tenant_id = {row}.tenant_id AND active_leases <= 0 AND overdue_payments <= 0;
+    """
+
+
+def add_tenant_summary(database=DATABASE):
+    """Create the maintained tenant summary and the triggers that keep it current."""
+    connection = sqlite3.connect(database)
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS TenantSummary (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_tenants INTEGER NOT NULL DEFAULT 0,
+            active_tenants INTEGER NOT NULL DEFAULT 0,   -- with at least one active lease
+            overdue_tenants INTEGER NOT NULL DEFAULT 0   -- with at least one overdue payment
+        );
+        """)
+        # Only tenants with an active lease or overdue payment have a row
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS TenantActivity (
+            tenant_id INTEGER PRIMARY KEY,
+            active_leases INTEGER NOT NULL DEFAULT 0,
+            overdue_payments INTEGER NOT NULL DEFAULT 0
+        );
+        """)
+
+        triggers = {
+            "trg_tenant_summary_insert": "AFTER INSERT ON Tenant BEGIN "
+                "UPDATE TenantSummary SET total_tenants = total_tenants + 1 WHERE id = 1; END",
+            "trg_tenant_summary_delete": "AFTER DELETE ON Tenant BEGIN "
+                "UPDATE TenantSummary SET total_tenants = total_tenants - 1 WHERE id = 1; END",
+        }
+        for kind, table, column, value in (
+            ("lease", "Lease", "status", "Active"),
+            ("payment", "Payment", "payment_status", "Overdue"),
+        ):
+            prefix = f"trg_{table.lower()}_tenant_summary"
+            triggers[f"{prefix}_insert"] = f"""
+            AFTER INSERT ON {table} WHEN NEW.{column} = '{value}'
+            BEGIN {_count_in(kind, "NEW")} END"""
+            triggers[f"{prefix}_delete"] = f"""
+            AFTER DELETE ON {table} WHEN OLD.{column} = '{value}'
+            BEGIN {_count_out(kind, "OLD")} END"""
+            # An update is the old row leaving and the new one arriving
+            triggers[f"{prefix}_update_old"] = f"""
+            AFTER UPDATE OF {column}, tenant_id ON {table} WHEN OLD.{column} = '{value}'
+            BEGIN {_count_out(kind, "OLD")} END"""
+            triggers[f"{prefix}_update_new"] = f"""
+            AFTER UPDATE OF {column}, tenant_id ON {table} WHEN NEW.{column} = '{value}'
+            BEGIN {_count_in(kind, "NEW")} END"""
+        for name, body in triggers.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body};")
+
+        # Fill a new summary from the rows already there
+        if cursor.execute("SELECT NOT EXISTS (SELECT 1 FROM TenantSummary)").fetchone()[0]:
+            for statement in TENANT_SUMMARY_REBUILD:
+                cursor.execute(statement)
+        connection.commit()
+    except Exception as e:
+        connection.rollback()
+        print(f"Error adding tenant summary: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    add_tenant_summary()
@@ -0,0 +1,15 @@
+import sys
+from datetime import date
+from controllers.archive_controller import archive_closed_periods
+
+
+def archive_db(before_date=None):
+    """Move closed history older than before_date (default: Jan 1 this year) to the archives."""
+    before_date = before_date or date(date.today().year, 1, 1).isoformat()
+    moved = archive_closed_periods(before_date)
+    print(f"Archived {moved['payments']} payments and {moved['leases']} leases dated before {before_date}.")
+
+
+if __name__ == "__main__":
+    # python -m models.db_script_v2.archive_db [YYYY-MM-DD]
+    archive_db(sys.argv[1] if len(sys.argv) > 1 else None)
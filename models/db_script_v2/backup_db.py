@@ -0,0 +1,27 @@
+import sys
+from controllers.backup_controller import create_snapshot, list_snapshots, restore_snapshot
+
+
+def backup_db():
+    """Take an online snapshot of the live database."""
+    path = create_snapshot()
+    print(f"Snapshot available at {path}")
+
+
+def restore_latest_snapshot():
+    """Restore the newest snapshot over the live database."""
+    snapshots = list_snapshots()
+    if not snapshots:
+        print("No snapshots found.")
+        return
+    path = snapshots[0][0]
+    restore_snapshot(path)
+    print(f"Database restored from {path}")
+
+
+if __name__ == "__main__":
+    # python -m models.db_script_v2.backup_db [--restore-latest]
+    if "--restore-latest" in sys.argv:
+        restore_latest_snapshot()
+    else:
+        backup_db()
@@ -0,0 +1,88 @@
+import sys
+import time
+import pandas as pd
+from controllers import database
+from controllers.room_controller import fetch_room_data, ROOM_DATA_TYPES
+from controllers.tenant_controller import fetch_tenant_data, TENANT_DATA_TYPES
+from controllers.typed_frames import read_typed
+
+# The report queries as they were before the grouped rewrite, kept as the
+# reference the new results must match
+LEGACY_ROOM_QUERY = """
+SELECT
+    r.id AS room_id,
+    r.name AS room_name,
+    r.type AS room_type,
+    r.rental_price,
+    r.occupancy_status,
+    r.size AS room_size,
+    r.amenities,
+    (SELECT SUM(p.amount)
+     FROM Payment p
+     WHERE p.room_id = r.id) AS total_rent_collected,
+    (SELECT COUNT(*)
+     FROM Lease l
+     WHERE l.room_id = r.id AND l.status = 'Active') AS active_lease_count,
+    (SELECT COUNT(*)
+     FROM Payment p
+     WHERE p.room_id = r.id AND p.payment_status = 'Overdue') AS overdue_payments
+FROM Room r
+"""
+
+LEGACY_TENANT_QUERY = """
+SELECT
+    t.id AS tenant_id,
+    t.first_name || ' ' || t.last_name AS tenant_name,
+    t.phone AS contact_number,
+    t.email AS email_address,
+    (SELECT COUNT(*) FROM Lease WHERE Lease.tenant_id = t.id AND status = 'Active') AS active_leases,
+    (SELECT SUM(amount) FROM Payment WHERE Payment.tenant_id = t.id AND payment_status = 'Overdue') AS overdue_balance
+FROM Tenant t
+"""
+
+
+def _timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def _legacy(query, key, types):
+    connection = database.connect_report()
+    try:
+        return read_typed(query, connection, types).sort_values(key).reset_index(drop=True)
+    finally:
+        connection.close()
+
+
+def benchmark_reports():
+    """Time the legacy and grouped report queries and check they agree.
+
+    Raises AssertionError if any dataset differs. Returns True on success.
+    """
+    cases = [
+        ("fetch_room_data", LEGACY_ROOM_QUERY, "room_id", ROOM_DATA_TYPES, fetch_room_data),
+        ("fetch_tenant_data", LEGACY_TENANT_QUERY, "tenant_id", TENANT_DATA_TYPES, fetch_tenant_data),
+    ]
+    for name, legacy_query, key, types, fetch in cases:
+        legacy, legacy_seconds = _timed(lambda: _legacy(legacy_query, key, types))
+        grouped, grouped_seconds = _timed(fetch)
+        grouped = grouped.sort_values(key).reset_index(drop=True)
+        pd.testing.assert_frame_equal(legacy, grouped, check_dtype=False)
+
+        # An all-covering period must give the same figures as no period
+        everything = fetch(start_date="0000-01-01", end_date="9999-12-31")
+        pd.testing.assert_frame_equal(grouped, everything.sort_values(key).reset_index(drop=True), check_dtype=False)
+
+        print(
+            f"{name}: {len(grouped)} rows identical; legacy {legacy_seconds:.3f}s, "
+            f"grouped {grouped_seconds:.3f}s"
+        )
+    return True
+
+
+if __name__ == "__main__":
+    # python -m models.db_script_v2.benchmark_reports [database file]
+    if len(sys.argv) > 1:
+        database.DATABASE = sys.argv[1]
+    benchmark_reports()
@@ -0,0 +1,38 @@
+from models.db_script_v2.add_change_log import add_change_log
+from models.db_script_v2.add_property_scope import add_property_scope
+from models.db_script_v2.add_indexes import add_indexes
+from models.db_script_v2.add_archive_rollups import add_archive_rollups
+from models.db_script_v2.add_revenue_cube import add_revenue_cube
+from models.db_script_v2.add_tenant_summary import add_tenant_summary
+from models.db_script_v2.add_lease_settlement import add_lease_settlement
+from controllers.database import shard_path
+from controllers.shard_controller import list_shards
+
+DATABASE = "rental_management_v2.db"
+
+# Idempotent schema upgrades, applied in order on every start-up
+MIGRATIONS = [
+    add_change_log,
+    add_property_scope,
+    add_indexes,
+    add_archive_rollups,
+    add_revenue_cube,
+    add_tenant_summary,
+    add_lease_settlement,
+]
+
+
+def apply_migrations(database=DATABASE):
+    """Bring an existing database up to the current schema."""
+    for migration in MIGRATIONS:
+        migration(database)
+
+
+def apply_shard_migrations():
+    """Bring every property shard up to the current schema (sharded mode)."""
+    for property_id in list_shards():
+        apply_migrations(shard_path(property_id))
+
+
+if __name__ == "__main__":
+    apply_migrations()
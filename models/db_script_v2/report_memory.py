@@ -0,0 +1,57 @@
+import sys
+import time
+from controllers import database, typed_frames
+from controllers.room_controller import fetch_room_data
+from controllers.tenant_controller import fetch_tenant_data
+from controllers.payment_management_controller import fetch_payment_data
+from controllers.lease_management_controller import fetch_lease_data
+
+DATASETS = [
+    ("fetch_room_data", fetch_room_data),
+    ("fetch_tenant_data", fetch_tenant_data),
+    ("fetch_payment_data", fetch_payment_data),
+    ("fetch_lease_data", fetch_lease_data),
+]
+
+
+def _load(fetch, apply_types):
+    typed_frames.APPLY_TYPES = apply_types
+    try:
+        started = time.perf_counter()
+        df = fetch()
+        return df, time.perf_counter() - started
+    finally:
+        typed_frames.APPLY_TYPES = True
+
+
+def report_memory(verbose=False):
+    """Load each report dataset as read and as typed, and print their memory.
+
+    verbose adds the per-column breakdown of the typed frames.
+    Returns {dataset: (untyped bytes, typed bytes)}.
+    """
+    sizes = {}
+    for name, fetch in DATASETS:
+        untyped, untyped_seconds = _load(fetch, False)
+        typed, typed_seconds = _load(fetch, True)
+        before = int(untyped.memory_usage(index=False, deep=True).sum())
+        after = int(typed.memory_usage(index=False, deep=True).sum())
+        sizes[name] = (before, after)
+        print(
+            f"{name}: {len(typed)} rows, {before / 2**20:.1f} MiB -> {after / 2**20:.1f} MiB "
+            f"({before / after if after else 0:.1f}x smaller); "
+            f"load {untyped_seconds:.3f}s -> {typed_seconds:.3f}s"
+        )
+        if verbose:
+            report = typed_frames.memory_report(typed)
+            report["untyped bytes"] = untyped.memory_usage(index=False, deep=True)
+            print(report.to_string())
+    return sizes
+
+
+if __name__ == "__main__":
+    # python -m models.db_script_v2.report_memory [database file] [--columns]
+    arguments = [argument for argument in sys.argv[1:] if argument != "--columns"]
+    if arguments:
+        database.DATABASE = arguments[0]
+    report_memory(verbose="--columns" in sys.argv)
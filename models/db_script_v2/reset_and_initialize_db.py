@@ -1,8 +1,20 @@
 
+import os
 import sqlite3
+from models.db_script_v2.migrate import apply_migrations
+from controllers.archive_controller import ARCHIVE_DIR
 
-def reset_and_initialize_db():
-    connection = sqlite3.connect('rental_management_v2.db')
+DATABASE = "rental_management_v2.db"
+
+def reset_and_initialize_db(database=DATABASE, archive_directory=None):
+    """Drop every table and recreate the schema empty.
+
+    The per-year archive files (see archive_controller) are separate files
+    and are kept unless archive_directory is given, in which case the
+    rental_archive_<year>.db files there are deleted too; kept archives
+    show up again in archive-inclusive reports.
+    """
+    connection = sqlite3.connect(database)
     cursor = connection.cursor()
 
     # Drop existing tables if they exist
@@ -11,6 +23,24 @@ def reset_and_initialize_db():
     cursor.execute("DROP TABLE IF EXISTS Payment;")
     cursor.execute("DROP TABLE IF EXISTS Tenant;")
     cursor.execute("DROP TABLE IF EXISTS Room;")
+    cursor.execute("DROP TABLE IF EXISTS Property;")
+    cursor.execute("DROP TABLE IF EXISTS ChangeLog;")
+    cursor.execute("DROP TABLE IF EXISTS RevenueCube;")
+    cursor.execute("DROP TABLE IF EXISTS RevenueByMonth;")
+    cursor.execute("DROP TABLE IF EXISTS TenantSummary;")
+    cursor.execute("DROP TABLE IF EXISTS TenantActivity;")
+    cursor.execute("DROP TABLE IF EXISTS LeaseSettlement;")
+    cursor.execute("DROP TABLE IF EXISTS PaymentRollup;")
+    cursor.execute("DROP TABLE IF EXISTS LeaseRollup;")
+
+    # Create Property table
+    cursor.execute("""
+    CREATE TABLE Property (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        address TEXT
+    );
+    """)
 
     # Create Room table
     cursor.execute("""
@@ -26,7 +56,8 @@ def reset_and_initialize_db():
         occupancy_status TEXT DEFAULT 'Available',
         tenant_id INTEGER REFERENCES Tenant (id) ON DELETE SET NULL,
         amenities TEXT,
-        total_rent_collected REAL DEFAULT 0
+        total_rent_collected REAL DEFAULT 0,
+        property_id INTEGER REFERENCES Property (id)
     );
     """)
 
@@ -93,6 +124,15 @@ def reset_and_initialize_db():
     connection.commit()
     connection.close()
 
+    if archive_directory is not None and os.path.isdir(archive_directory):
+        for name in os.listdir(archive_directory):
+            if name.startswith("rental_archive_") and name.endswith(".db"):
+                os.remove(os.path.join(archive_directory, name))
+
+    # Recreate change log, indexes and triggers on the fresh tables
+    apply_migrations(database)
+
 if __name__ == "__main__":
-    reset_and_initialize_db()
+    # Resetting the live database clears its archives as well
+    reset_and_initialize_db(archive_directory=ARCHIVE_DIR)
 
@@ -0,0 +1,121 @@
+import os
+import sys
+import sqlite3
+from controllers import database
+from controllers.backup_controller import backup_database
+from controllers.property_controller import fetch_properties
+from controllers.shard_controller import create_shard
+
+SHARD_DIRECTORY = "shards"
+
+# Rows each shard takes from the main file, in copy order. Rooms go by
+# property; everything else follows the rooms already copied.
+SHARD_COPIES = [
+    ("Property", "id = :property_id"),
+    ("Room", "property_id = :property_id"),
+    ("Lease", "room_id IN (SELECT id FROM main.Room)"),
+    ("Payment", "room_id IN (SELECT id FROM main.Room)"),
+    ("Booking", "room_id IN (SELECT id FROM main.Room)"),
+    ("PaymentRollup", "room_id IN (SELECT id FROM main.Room)"),
+    ("LeaseRollup", "room_id IN (SELECT id FROM main.Room)"),
+    ("LeaseSettlement", "room_id IN (SELECT id FROM main.Room)"),
+    # A tenant renting in several properties is copied to each of them
+    ("Tenant", """id IN (
+        SELECT tenant_id FROM main.Lease
+        UNION SELECT tenant_id FROM main.Payment
+        UNION SELECT tenant_id FROM main.Booking
+        UNION SELECT tenant_id FROM main.Room
+    )"""),
+]
+
+# Removed from the main file once every shard is written
+MOVED_TABLES = ["Payment", "Lease", "Booking", "PaymentRollup", "LeaseRollup", "LeaseSettlement"]
+
+
+def _copy_property(property_id):
+    connection = sqlite3.connect(database.shard_path(property_id))
+    cursor = connection.cursor()
+    try:
+        cursor.execute("ATTACH DATABASE ? AS source", (database.DATABASE,))
+        cursor.execute("BEGIN")
+        for table, condition in SHARD_COPIES:
+            cursor.execute(
+                f"INSERT INTO main.{table} SELECT * FROM source.{table} WHERE {condition}",
+                {"property_id": property_id},
+            )
+        # The copies are not changes anyone has to catch up on
+        cursor.execute("DELETE FROM main.ChangeLog")
+        connection.commit()
+        return cursor.execute("SELECT COUNT(*) FROM main.Room").fetchone()[0]
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def _remove_moved_rows():
+    connection = sqlite3.connect(database.DATABASE)
+    cursor = connection.cursor()
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        for table in MOVED_TABLES:
+            cursor.execute(f"""
+            DELETE FROM {table}
+            WHERE room_id IN (SELECT id FROM Room WHERE property_id IS NOT NULL)
+            """)
+        cursor.execute("DELETE FROM Room WHERE property_id IS NOT NULL")
+        # Tenants stay only if something left in the main file refers to them
+        cursor.execute("""
+        DELETE FROM Tenant
+        WHERE id NOT IN (
+            SELECT tenant_id FROM Lease
+            UNION SELECT tenant_id FROM Payment
+            UNION SELECT tenant_id FROM Booking
+            UNION SELECT tenant_id FROM Room WHERE tenant_id IS NOT NULL
+        )
+        """)
+        cursor.execute("DELETE FROM ChangeLog")
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    # Hand the freed pages back to the file system
+    connection = sqlite3.connect(database.DATABASE)
+    connection.execute("VACUUM")
+    connection.close()
+
+
+def split_into_shards(directory=SHARD_DIRECTORY):
+    """Move every property's rows from the main file into its own shard.
+
+    The main file is backed up first and keeps the Property catalogue plus
+    rooms not assigned to any property. Existing ids are kept, and new rows
+    in a shard start at property_id * SHARD_ID_SPAN. Run the application with
+    controllers.database.SHARD_DIRECTORY set to the same directory afterwards.
+    """
+    database.SHARD_DIRECTORY = directory
+    properties = fetch_properties()
+    existing = [property_id for property_id, _name, _address in properties
+                if os.path.exists(database.shard_path(property_id))]
+    if existing:
+        raise FileExistsError(f"Shards already exist for properties {existing} in {directory}.")
+
+    backup = f"{database.DATABASE}.before_shards"
+    backup_database(backup)
+    print(f"Backed up {database.DATABASE} to {backup}.")
+
+    for property_id, name, _address in properties:
+        create_shard(property_id)
+        rooms = _copy_property(property_id)
+        print(f"{name}: {rooms} rooms -> {database.shard_path(property_id)}")
+    _remove_moved_rows()
+
+
+if __name__ == "__main__":
+    # python -m models.db_script_v2.split_into_shards [shard directory] [database file]
+    if len(sys.argv) > 2:
+        database.DATABASE = sys.argv[2]
+    split_into_shards(sys.argv[1] if len(sys.argv) > 1 else SHARD_DIRECTORY)
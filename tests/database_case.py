@@ -0,0 +1,60 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from controllers import database
+from models.db_script_v2.reset_and_initialize_db import reset_and_initialize_db
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Runs each test against a fresh database file in a temporary directory."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.previous_database = database.DATABASE
+        database.DATABASE = os.path.join(self.directory, "rental_management_v2.db")
+        reset_and_initialize_db(database.DATABASE)
+
+    def tearDown(self):
+        for connection in database._pool(database.DATABASE):
+            connection.close()
+        database._pool(database.DATABASE).clear()
+        database.DATABASE = self.previous_database
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def query(self, sql, params=()):
+        connection = sqlite3.connect(database.DATABASE)
+        try:
+            return connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+
+    def execute(self, sql, params=()):
+        """Run and commit one statement outside the controllers; returns the last row id."""
+        connection = sqlite3.connect(database.DATABASE)
+        try:
+            row_id = connection.execute(sql, params).lastrowid
+            connection.commit()
+            return row_id
+        finally:
+            connection.close()
+
+    def add_room(self, name="Room", rental_price=1000, status="Available", tenant_id=None):
+        return self.execute(
+            "INSERT INTO Room (name, rental_price, payment_frequency, occupancy_status, tenant_id) "
+            "VALUES (?, ?, 'Monthly', ?, ?)",
+            (name, rental_price, status, tenant_id),
+        )
+
+    def add_tenant(self, name="Tenant"):
+        return self.execute(
+            "INSERT INTO Tenant (first_name, last_name, phone, email) VALUES (?, 'Test', ?, ?)",
+            (name, f"phone-{name}", f"{name}@example.com"),
+        )
+
+    def add_lease(self, room_id, tenant_id, start_date, end_date, status="Active"):
+        return self.execute(
+            "INSERT INTO Lease (room_id, tenant_id, start_date, end_date, status) VALUES (?, ?, ?, ?, ?)",
+            (room_id, tenant_id, start_date, end_date, status),
+        )
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import unittest
+from controllers import archive_controller, database
+from controllers.archive_controller import archive_closed_periods, archive_path
+from models.db_script_v2.reset_and_initialize_db import reset_and_initialize_db
+from tests.database_case import DatabaseTestCase
+
+
+class ArchiveClosedPeriodsTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.previous_archive_dir = archive_controller.ARCHIVE_DIR
+        archive_controller.ARCHIVE_DIR = os.path.join(self.directory, "archive")
+        self.tenant = self.add_tenant("Ada")
+        self.room = self.add_room("A1", status="Rented", tenant_id=self.tenant)
+        self.add_lease(self.room, self.tenant, "2022-01-01", "2022-12-31", "Completed")
+        self.add_lease(self.room, self.tenant, "2023-01-01", "2025-12-31")
+
+    def tearDown(self):
+        archive_controller.ARCHIVE_DIR = self.previous_archive_dir
+        super().tearDown()
+
+    def add_payment(self, amount, date, status):
+        return self.execute(
+            "INSERT INTO Payment (tenant_id, room_id, amount, date, payment_status) VALUES (?, ?, ?, ?, ?)",
+            (self.tenant, self.room, amount, date, status),
+        )
+
+    def test_outstanding_payments_stay_live(self):
+        paid = self.add_payment(1000, "2023-01-05", "Paid")
+        pending = self.add_payment(1000, "2023-02-05", "Pending")
+        overdue = self.add_payment(1000, "2023-03-05", "Overdue")
+
+        moved = archive_closed_periods("2024-01-01")
+
+        self.assertEqual(moved, {"payments": 1, "leases": 1})
+        live = {row[0] for row in self.query("SELECT id FROM Payment")}
+        self.assertEqual(live, {pending, overdue})
+        archive = sqlite3.connect(archive_path("2023"))
+        try:
+            archived = [row[0] for row in archive.execute("SELECT id FROM Payment")]
+        finally:
+            archive.close()
+        self.assertEqual(archived, [paid])
+        rollup = self.query("SELECT payment_status, total_amount, payment_count FROM PaymentRollup")
+        self.assertEqual(rollup, [("Paid", 1000, 1)])
+
+    def test_reset_clears_rollups_and_archives(self):
+        self.add_payment(1000, "2023-01-05", "Paid")
+        archive_closed_periods("2024-01-01")
+
+        reset_and_initialize_db(database.DATABASE, archive_directory=archive_controller.ARCHIVE_DIR)
+
+        self.assertEqual(self.query("SELECT COUNT(*) FROM PaymentRollup"), [(0,)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM LeaseRollup"), [(0,)])
+        self.assertFalse(os.path.exists(archive_path("2023")))
+
+
+if __name__ == "__main__":
+    unittest.main()
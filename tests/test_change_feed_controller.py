@@ -0,0 +1,38 @@
+import unittest
+from controllers.change_feed_controller import ChangeSubscription, prune_seen_changes
+from tests.database_case import DatabaseTestCase
+
+
+class PruneSeenChangesTest(DatabaseTestCase):
+
+    def change_seqs(self):
+        return [row[0] for row in self.query("SELECT seq FROM ChangeLog ORDER BY seq")]
+
+    def test_keeps_changes_a_subscriber_has_not_polled(self):
+        subscription = ChangeSubscription(["Tenant"])
+        first = self.add_tenant("Ada")
+        self.assertEqual(subscription.poll(), {"Tenant": {first}})
+        second = self.add_tenant("Grace")
+        lagging = ChangeSubscription(["Tenant"], last_seq=subscription.last_seq)
+        subscription.poll()
+
+        prune_seen_changes()
+
+        self.assertEqual(lagging.poll(), {"Tenant": {second}})
+
+    def test_prunes_everything_seen(self):
+        subscription = ChangeSubscription(["Tenant"])
+        for name in ("Ada", "Grace", "Edsger"):
+            self.add_tenant(name)
+        subscription.poll()
+
+        removed = prune_seen_changes()
+
+        self.assertEqual(removed, 2)
+        self.assertEqual(self.change_seqs(), [subscription.last_seq])
+        self.add_tenant("Barbara")
+        self.assertEqual(len(subscription.poll()["Tenant"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
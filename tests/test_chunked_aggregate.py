@@ -0,0 +1,118 @@
+import unittest
+import numpy as np
+import pandas as pd
+from controllers.chunked_aggregate import GroupAggregate, Histogram, aggregate
+from controllers.lease_management_controller import fetch_lease_data, iter_lease_data
+from controllers.payment_management_controller import fetch_payment_data, iter_payment_data
+from tests.database_case import DatabaseTestCase
+
+
+def _chunks(df, size):
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+class GroupAggregateTest(unittest.TestCase):
+    """Chunked results match a pandas groupby over the whole frame."""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        rows = 20_000
+        self.df = pd.DataFrame({
+            "month": rng.choice(["2024-01", "2024-02", "2024-03", None], rows, p=[0.3, 0.3, 0.3, 0.1]),
+            "status": pd.Categorical(rng.choice(["Paid", "Pending", "Overdue"], rows)),
+            "tenant_id": rng.integers(0, 3000, rows),
+            "amount": rng.integers(0, 1000, rows).astype(float),
+        })
+        self.df.loc[rng.choice(rows, 500, replace=False), "amount"] = np.nan
+
+    def expected(self, by):
+        grouped = self.df.groupby(by, observed=True)
+        return pd.DataFrame({
+            "total": grouped["amount"].sum(),
+            "payments": grouped["amount"].count(),
+            "tenants": grouped["tenant_id"].nunique(),
+        }).reset_index()
+
+    def run_chunked(self, by):
+        [result] = aggregate(_chunks(self.df, 3000), GroupAggregate(
+            by, total=("amount", "sum"), payments=("amount", "count"), tenants=("tenant_id", "distinct"),
+        ))
+        return result
+
+    def check(self, by):
+        expected = self.expected(by)
+        result = self.run_chunked(by)
+        keys = [by] if isinstance(by, str) else by
+        self.assertEqual(result[keys].astype(str).values.tolist(), expected[keys].astype(str).values.tolist())
+        np.testing.assert_allclose(result["total"], expected["total"])
+        np.testing.assert_array_equal(result["payments"], expected["payments"])
+        # Distinct counts are HyperLogLog estimates
+        np.testing.assert_allclose(result["tenants"], expected["tenants"], rtol=0.05)
+
+    def test_string_key_leaves_out_null_keys(self):
+        self.check("month")
+        self.assertNotIn(None, self.run_chunked("month")["month"].tolist())
+
+    def test_categorical_key(self):
+        self.check("status")
+
+    def test_two_keys(self):
+        self.check(["month", "status"])
+
+    def test_small_distinct_counts_are_exact(self):
+        df = pd.DataFrame({"key": ["a"] * 50 + ["b"] * 50, "value": list(range(50)) * 2})
+        [result] = aggregate(_chunks(df, 7), GroupAggregate("key", values=("value", "distinct")))
+        self.assertEqual(result["values"].tolist(), [50, 50])
+
+    def test_no_chunks(self):
+        [result] = aggregate([], GroupAggregate("month", total=("amount", "sum")))
+        self.assertTrue(result.empty)
+        self.assertEqual(list(result.columns), ["month", "total"])
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_buckets_match_floor_division(self):
+        values = pd.Series([-150.0, -0.5, 0.0, 99.9, 100.0, 250.0, np.nan, 250.0])
+        df = pd.DataFrame({"amount": values})
+
+        [result] = aggregate(_chunks(df, 3), Histogram("amount", 100))
+
+        expected = np.floor(values.dropna() / 100).astype(np.int64).value_counts().sort_index()
+        self.assertEqual(result["bucket"].tolist(), expected.index.tolist())
+        self.assertEqual(result["count"].tolist(), expected.tolist())
+        self.assertEqual((result["min_value"] + 100).tolist(), result["max_value"].tolist())
+
+
+class StreamFramesTest(DatabaseTestCase):
+
+    def test_chunks_add_up_to_the_whole_dataset(self):
+        tenant = self.add_tenant("Ada")
+        room = self.add_room("A1")
+        for day in range(1, 11):
+            self.execute(
+                "INSERT INTO Payment (tenant_id, room_id, amount, date, payment_status) VALUES (?, ?, ?, ?, 'Paid')",
+                (tenant, room, day * 10, f"2024-01-{day:02d}"),
+            )
+
+        chunks = list(iter_payment_data(chunk_size=3))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 3, 1])
+        streamed = pd.concat(chunks, ignore_index=True)
+        whole = fetch_payment_data()
+        pd.testing.assert_frame_equal(streamed.astype(str), whole.astype(str))
+
+    def test_lease_chunks_add_up_to_the_whole_dataset(self):
+        for number in range(5):
+            room = self.add_room(f"L{number}")
+            self.add_lease(room, self.add_tenant(f"Tenant {number}"), "2024-01-01", "2024-12-31", "Active")
+
+        chunks = list(iter_lease_data(chunk_size=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        streamed = pd.concat(chunks, ignore_index=True)
+        pd.testing.assert_frame_equal(streamed.astype(str), fetch_lease_data().astype(str))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from controllers.lease_management_controller import (
+    bulk_update_lease_status, bulk_cancel_leases, bulk_renew_leases
+)
+from tests.database_case import DatabaseTestCase
+
+
+class BulkLeaseTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tenant = self.add_tenant("Ada")
+        self.room = self.add_room("A1", status="Rented", tenant_id=self.tenant)
+        self.other_room = self.add_room("A2", status="Rented", tenant_id=self.tenant)
+        self.active = self.add_lease(self.room, self.tenant, "2024-01-01", "2024-12-31")
+        self.canceled = self.add_lease(self.other_room, self.tenant, "2023-01-01", "2023-12-31", "Canceled")
+        self.other_active = self.add_lease(self.other_room, self.tenant, "2024-01-01", "2024-06-30")
+
+    def status_of(self, lease_id):
+        return self.query("SELECT status FROM Lease WHERE id = ?", (lease_id,))[0][0]
+
+    def end_date_of(self, lease_id):
+        return self.query("SELECT end_date FROM Lease WHERE id = ?", (lease_id,))[0][0]
+
+    def test_update_status_filtered_by_current_status(self):
+        updated = bulk_update_lease_status("Completed", status="Active")
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.status_of(self.active), "Completed")
+        self.assertEqual(self.status_of(self.other_active), "Completed")
+        self.assertEqual(self.status_of(self.canceled), "Canceled")
+        self.assertEqual(self.query("SELECT DISTINCT occupancy_status FROM Room"), [("Available",)])
+
+    def test_cancel_filtered_by_current_status(self):
+        canceled = bulk_cancel_leases(status="Active", room_ids=[self.room])
+
+        self.assertEqual(canceled, 1)
+        self.assertEqual(self.status_of(self.active), "Canceled")
+        self.assertEqual(self.status_of(self.other_active), "Active")
+
+    def test_renew_leaves_inactive_leases_alone(self):
+        renewed = bulk_renew_leases(extend_days=30, lease_ids=[self.active, self.canceled])
+
+        self.assertEqual(renewed, 1)
+        self.assertEqual(self.end_date_of(self.active), "2025-01-30")
+        self.assertEqual(self.status_of(self.canceled), "Canceled")
+        self.assertEqual(self.end_date_of(self.canceled), "2023-12-31")
+
+    def test_renew_refuses_to_overlap_another_active_lease(self):
+        later = self.add_lease(self.other_room, self.tenant, "2024-08-01", "2024-12-31")
+
+        with self.assertRaises(Exception):
+            bulk_renew_leases(new_end_date="2024-09-30", lease_ids=[self.other_active])
+
+        self.assertEqual(self.end_date_of(self.other_active), "2024-06-30")
+        self.assertEqual(bulk_renew_leases(new_end_date="2024-07-31", lease_ids=[self.other_active]), 1)
+        self.assertEqual(self.status_of(later), "Active")
+
+
+if __name__ == "__main__":
+    unittest.main()
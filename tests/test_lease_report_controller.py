@@ -0,0 +1,91 @@
+import unittest
+import pandas as pd
+from controllers.lease_report_controller import (
+    LeaseReportController, _summarize, fetch_lease_status_breakdown, fetch_lease_duration_histogram
+)
+from tests.database_case import DatabaseTestCase
+
+
+class LeaseStatusBreakdownTest(DatabaseTestCase):
+
+    def test_counts_leases_per_status(self):
+        for number, status in enumerate(("Active", "Active", "Completed", "Canceled")):
+            self.add_lease(self.add_room(f"R{number}"), self.add_tenant(f"Tenant {number}"),
+                           "2024-01-01", "2024-12-31", status)
+
+        df = fetch_lease_status_breakdown()
+
+        self.assertEqual(dict(zip(df["status"], df["lease_count"])), {"Active": 2, "Completed": 1, "Canceled": 1})
+        self.assertEqual(str(df["lease_count"].dtype), "int64")
+
+    def test_without_leases(self):
+        df = fetch_lease_status_breakdown()
+
+        self.assertTrue(df.empty)
+        self.assertEqual(str(df["lease_count"].dtype), "int64")
+
+
+class LeaseDurationHistogramTest(DatabaseTestCase):
+
+    def test_buckets_lease_durations(self):
+        room, tenant = self.add_room(), self.add_tenant()
+        self.add_lease(room, tenant, "2024-01-01", "2024-01-31")  # 30 days
+        self.add_lease(room, tenant, "2024-01-01", "2024-02-15")  # 45 days
+        self.add_lease(room, tenant, "2024-01-01", "2024-04-10")  # 100 days
+        self.add_lease(room, tenant, "2024-01-01", "not a date")
+
+        df = fetch_lease_duration_histogram(bucket_days=90)
+
+        self.assertEqual(df.to_dict("records"), [
+            {"bucket": 0, "min_days": 0, "max_days": 90, "lease_count": 2},
+            {"bucket": 1, "min_days": 90, "max_days": 180, "lease_count": 1},
+        ])
+        self.assertTrue(all(str(dtype) == "int64" for dtype in df.dtypes))
+
+    def test_without_leases(self):
+        df = fetch_lease_duration_histogram()
+
+        self.assertTrue(df.empty)
+        self.assertEqual(list(df.columns), ["bucket", "min_days", "max_days", "lease_count"])
+        self.assertTrue(all(str(dtype) == "int64" for dtype in df.dtypes))
+
+
+class SummarizeTest(unittest.TestCase):
+
+    def test_totals_and_occupancy(self):
+        statuses = pd.DataFrame({"status": ["Active", "Completed", "Canceled"], "lease_count": [3, 2, 1]})
+        occupancy = pd.DataFrame({"room_type": ["Single", "Double"], "total_rooms": [4, 4], "leased_rooms": [2, 1]})
+
+        self.assertEqual(_summarize(statuses, occupancy), {
+            "total_leases": 6,
+            "active_leases": 3,
+            "completed_leases": 2,
+            "canceled_leases": 1,
+            "occupancy_rate": 37.5,
+        })
+
+    def test_without_leases_or_rooms(self):
+        statuses = pd.DataFrame({"status": [], "lease_count": []}).astype({"lease_count": "int64"})
+        occupancy = pd.DataFrame({"total_rooms": [], "leased_rooms": []}).astype("int64")
+
+        self.assertEqual(_summarize(statuses, occupancy), {
+            "total_leases": 0,
+            "active_leases": 0,
+            "completed_leases": 0,
+            "canceled_leases": 0,
+            "occupancy_rate": 0.0,
+        })
+
+
+class LeaseReportControllerTest(DatabaseTestCase):
+
+    def test_summary_without_leases(self):
+        summary, df = LeaseReportController().load_report("Status Breakdown")
+
+        self.assertTrue(df.empty)
+        self.assertEqual(summary["total_leases"], 0)
+        self.assertEqual(summary["occupancy_rate"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
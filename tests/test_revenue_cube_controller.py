@@ -0,0 +1,34 @@
+import unittest
+from controllers.revenue_cube_controller import fetch_monthly_payers, fetch_revenue, fetch_revenue_by_room
+from tests.database_case import DatabaseTestCase
+
+
+class RevenueCubeFallbackTest(DatabaseTestCase):
+    """A revenue query that fails returns an empty frame with the report's columns."""
+
+    def setUp(self):
+        super().setUp()
+        self.execute("DROP TABLE RevenueCube")
+        self.execute("DROP TABLE RevenueByMonth")
+
+    def test_revenue_by_room_without_cube(self):
+        df = fetch_revenue_by_room(10)
+
+        self.assertTrue(df.empty)
+        self.assertEqual(list(df.columns), ["room_id", "room_name", "revenue", "payment_count"])
+
+    def test_revenue_without_cube(self):
+        df = fetch_revenue(("period",))
+
+        self.assertTrue(df.empty)
+        self.assertEqual(list(df.columns), ["period", "total_amount", "payment_count"])
+
+    def test_monthly_payers_without_cube(self):
+        df = fetch_monthly_payers()
+
+        self.assertTrue(df.empty)
+        self.assertEqual(list(df.columns), ["period", "total_amount", "payment_count", "tenants"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,8 @@ from PyQt6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QDateEdit, QLineEdit, QPushButton, QDialog, QMessageBox
 )
 from PyQt6.QtCore import Qt, QDate
-from controllers.payment_management_controller import create_payment, fetch_available_rooms, fetch_tenants
+from controllers.payment_management_controller import create_payment
+from views.reference_combo import ReferenceComboBox, tenant_choice_model, available_room_choice_model
 
 
 class AddPaymentView(QDialog):
@@ -18,8 +19,6 @@ class AddPaymentView(QDialog):
         tenant_label.setStyleSheet("font-size: 16px; font-weight: bold;")
         self.layout.addWidget(tenant_label)
 
-        self.tenant_selector = QComboBox()
-        self.tenant_selector.setStyleSheet("font-size: 14px;")
         self.load_tenants()
         self.layout.addWidget(self.tenant_selector)
 
@@ -28,8 +27,6 @@ class AddPaymentView(QDialog):
         room_label.setStyleSheet("font-size: 16px; font-weight: bold;")
         self.layout.addWidget(room_label)
 
-        self.room_selector = QComboBox()
-        self.room_selector.setStyleSheet("font-size: 14px;")
         self.load_rooms()
         self.layout.addWidget(self.room_selector)
 
@@ -107,22 +104,22 @@ class AddPaymentView(QDialog):
         self.setLayout(self.layout)
 
     def load_rooms(self):
-        """Load available rooms into the dropdown."""
+        """Create the searchable dropdown of available rooms (shared cached choices)."""
         try:
-            rooms = fetch_available_rooms()
-            for room in rooms:
-                self.room_selector.addItem(f"{room[1]} (ID: {room[0]})", room[0])  # Display name, store ID
+            self.room_selector = ReferenceComboBox(available_room_choice_model())
         except Exception as e:
+            self.room_selector = QComboBox()
             QMessageBox.critical(self, "Error", f"Failed to load rooms: {e}")
+        self.room_selector.setStyleSheet("font-size: 14px;")
 
     def load_tenants(self):
-        """Load tenants into the dropdown."""
+        """Create the searchable dropdown of tenants (shared cached choices)."""
         try:
-            tenants = fetch_tenants()
-            for tenant in tenants:
-                self.tenant_selector.addItem(f"{tenant[1]} (ID: {tenant[0]})", tenant[0])  # Display name, store ID
+            self.tenant_selector = ReferenceComboBox(tenant_choice_model())
         except Exception as e:
+            self.tenant_selector = QComboBox()
             QMessageBox.critical(self, "Error", f"Failed to load tenants: {e}")
+        self.tenant_selector.setStyleSheet("font-size: 14px;")
 
     def save_payment(self):
         """Save the payment."""
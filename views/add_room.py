@@ -1,10 +1,13 @@
 
 
+import logging
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox
 )
 from controllers.room_controller import add_room
 
+logger = logging.getLogger(__name__)
+
 class AddRoomView(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -98,5 +101,5 @@ class AddRoomView(QDialog):
             QMessageBox.information(self, "Success", "Room added successfully!")
             self.accept()  # Close the dialog
         except Exception as e:
-            print(f"Error adding room: {e}")
+            logger.exception("Error adding room: %s", e)
             QMessageBox.critical(self, "Error", f"Failed to add room: {e}")
@@ -1,10 +1,13 @@
 
 
+import logging
 from PyQt6.QtWidgets import QVBoxLayout, QLineEdit, QPushButton, QLabel, QDialog
 from PyQt6.QtGui import QIntValidator
 from PyQt6.QtCore import QRegularExpression
 from PyQt6.QtGui import QRegularExpressionValidator
 
+logger = logging.getLogger(__name__)
+
 class AddTenantView(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -92,7 +95,7 @@ class AddTenantView(QDialog):
         from controllers.tenant_controller import add_tenant
         try:
             add_tenant(first_name, last_name, phone, email)
-            print("Tenant added successfully!")
+            logger.info("Tenant added successfully!")
             self.accept()  # Close the dialog
         except Exception as e:
             self.error_label.setText(f"Error adding tenant: {e}")
@@ -0,0 +1,37 @@
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLineEdit
+from PyQt6.QtCore import QTimer, pyqtSignal
+
+
+class ColumnFilterBar(QWidget):
+    """One filter box per grid column; emits {column number: text} after typing pauses."""
+
+    filtersChanged = pyqtSignal(dict)
+
+    DEBOUNCE_MS = 300
+
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.inputs = []
+        for header in headers:
+            line_edit = QLineEdit()
+            line_edit.setPlaceholderText(f"Filter {header}")
+            line_edit.setStyleSheet("font-size: 14px; padding: 6px;")
+            line_edit.textChanged.connect(self.schedule_emit)
+            layout.addWidget(line_edit)
+            self.inputs.append(line_edit)
+        self.setLayout(layout)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.timeout.connect(self.emit_filters)
+
+    def schedule_emit(self):
+        self.debounce_timer.start(self.DEBOUNCE_MS)
+
+    def filters(self):
+        return {column: line_edit.text() for column, line_edit in enumerate(self.inputs) if line_edit.text().strip()}
+
+    def emit_filters(self):
+        self.filtersChanged.emit(self.filters())
@@ -1,7 +1,11 @@
+import logging
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from PyQt6.QtWidgets import QVBoxLayout, QLabel, QComboBox, QPushButton, QTableWidget, QTableWidgetItem, QWidget
 import matplotlib
+
+logger = logging.getLogger(__name__)
+
 matplotlib.use('QtAgg')  # Explicitly set the backend
 
 class Dashboard(QWidget):
@@ -59,4 +63,4 @@ class Dashboard(QWidget):
 
     def export_report(self):
         # Placeholder export functionality
-        print("Export Report Triggered")
+        logger.debug("Export Report Triggered")
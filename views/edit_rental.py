@@ -2,7 +2,9 @@
 from PyQt6.QtWidgets import (
     QVBoxLayout, QLineEdit, QComboBox, QTextEdit, QPushButton, QDialog, QLabel, QMessageBox
 )
-from controllers.tenant_controller import fetch_tenants
+from PyQt6.QtCore import Qt
+from views.reference_combo import ReferenceComboBox, tenant_choice_model
+from controllers.database import unit_of_work
 from controllers.rental_management_controller import (
     set_rental_price_and_terms, update_occupancy_status, update_tenant_for_room
 )
@@ -52,16 +54,11 @@ class EditRentalView(QDialog):
 
         # Tenant Selector
         self.layout.addWidget(QLabel("Assigned Tenant:"))
-        self.tenant_selector = QComboBox()
-        tenants = fetch_tenants()
-        self.tenant_selector.addItem("No Tenant", None)  # Allow no tenant
-        for tenant in tenants:
-            self.tenant_selector.addItem(f"{tenant[1]} {tenant[2]}", tenant[0])
+        self.tenant_selector = ReferenceComboBox(tenant_choice_model(allow_none=True))  # First item is "No Tenant"
         if room_data[8] and room_data[8] != "No Tenant":
-            for i in range(self.tenant_selector.count()):
-                if self.tenant_selector.itemText(i) == room_data[8]:
-                    self.tenant_selector.setCurrentIndex(i)
-                    break
+            index = self.tenant_selector.findText(f"{room_data[8]} (ID: ", Qt.MatchFlag.MatchStartsWith)
+            if index >= 0:
+                self.tenant_selector.setCurrentIndex(index)
         self.layout.addWidget(self.tenant_selector)
 
         # Amenities (Optional Field)
@@ -92,10 +89,11 @@ class EditRentalView(QDialog):
             tenant_id = self.tenant_selector.currentData()
             amenities = self.amenities_input.toPlainText().strip()
 
-            # Call Controllers
-            set_rental_price_and_terms(self.room_id, rental_price, payment_frequency, security_deposit, grace_period)
-            update_occupancy_status(self.room_id, occupancy_status)
-            update_tenant_for_room(self.room_id, tenant_id)
+            # Call Controllers in one transaction so the edit is all-or-nothing
+            with unit_of_work():
+                set_rental_price_and_terms(self.room_id, rental_price, payment_frequency, security_deposit, grace_period)
+                update_occupancy_status(self.room_id, occupancy_status)
+                update_tenant_for_room(self.room_id, tenant_id)
 
 
             QMessageBox.information(self, "Success", "Room details updated successfully!")
@@ -1,10 +1,13 @@
 
 
+import logging
 from PyQt6.QtWidgets import QVBoxLayout, QLineEdit, QPushButton, QDialog, QLabel
 from PyQt6.QtGui import QIntValidator
 from PyQt6.QtCore import QRegularExpression
 from PyQt6.QtGui import QRegularExpressionValidator
 
+logger = logging.getLogger(__name__)
+
 
 class EditTenantView(QDialog):
     def __init__(self, tenant_data, parent=None):
@@ -101,7 +104,7 @@ class EditTenantView(QDialog):
         from controllers.tenant_controller import update_tenant
         try:
             update_tenant(self.tenant_id, first_name, last_name, phone, email)
-            print("Tenant updated successfully!")
+            logger.info("Tenant updated successfully!")
             self.accept()  # Close the dialog
         except Exception as e:
             self.error_label.setText(f"Error updating tenant: {e}")
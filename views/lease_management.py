@@ -1,34 +1,48 @@
+from PyQt6.QtCore import QDate
 from PyQt6.QtWidgets import (
-    QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox,
-    QWidget, QHeaderView
+    QVBoxLayout, QHBoxLayout, QTableView, QPushButton, QMessageBox,
+    QWidget, QHeaderView, QAbstractItemView, QInputDialog
+)
+from controllers.lease_management_controller import (
+    LEASE_GRID, fetch_leases_affected, cancel_lease, delete_lease,
+    bulk_renew_leases, bulk_cancel_leases, bulk_update_lease_status, bulk_terminate_leases
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
-from controllers.lease_management_controller import fetch_leases, cancel_lease, delete_lease
 from views.add_lease import AddLeaseView
+from views.live_refresh import LiveRefreshMixin
+from views.table_models import PagedTableModel
+from views.column_filters import ColumnFilterBar
 
 
-class LeaseManagement(QWidget):
+class LeaseManagement(LiveRefreshMixin, QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Lease Management")
         self.layout = QVBoxLayout()
 
-        # Lease Table
-        self.lease_table = QTableWidget()
-        self.lease_table.setColumnCount(9)  # Added "Cancel" column
-        self.lease_table.setHorizontalHeaderLabels([
-            "Lease ID", "Room Name", "Tenant Name", "Start Date", "End Date",
-            "Status", "Edit", "Cancel", "Delete"
-        ])
+        # Lease Table (pages fetched on demand; sort and filter run in SQL)
+        headers = ["Lease ID", "Room Name", "Tenant Name", "Start Date", "End Date", "Status"]
+        self.lease_model = PagedTableModel(LEASE_GRID, headers, actions=["Edit", "Terminate", "Cancel", "Delete"])
+        self.lease_table = QTableView()
+        self.lease_table.setModel(self.lease_model)
+        self.lease_table.setSortingEnabled(True)
+        self.lease_table.clicked.connect(self.on_table_clicked)
+
+        # Per-column filters
+        self.filter_bar = ColumnFilterBar(headers)
+        self.filter_bar.filtersChanged.connect(self.lease_model.set_filters)
+        self.layout.addWidget(self.filter_bar)
 
         # Table styling
         self.lease_table.setStyleSheet("""
-            QTableWidget::item { font-size: 14px; text-align: center; }
+            QTableView::item { font-size: 14px; text-align: center; }
             QHeaderView::section { font-size: 16px; font-weight: bold; text-align: center; }
         """)
         self.lease_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
 
+        # Multi-row selection for bulk actions
+        self.lease_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.lease_table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+
         self.layout.addWidget(self.lease_table)
 
         # Refresh Button
@@ -43,41 +57,58 @@ class LeaseManagement(QWidget):
         self.add_lease_btn.clicked.connect(self.open_add_lease_view)
         self.layout.addWidget(self.add_lease_btn)
 
+        # Bulk Action Buttons (apply to the selected rows)
+        bulk_layout = QHBoxLayout()
+        self.renew_selected_btn = QPushButton("Renew Selected")
+        self.renew_selected_btn.setStyleSheet("font-size: 14px; font-weight: bold; padding: 8px;")
+        self.renew_selected_btn.clicked.connect(self.renew_selected_action)
+        bulk_layout.addWidget(self.renew_selected_btn)
+
+        self.complete_selected_btn = QPushButton("Complete Selected")
+        self.complete_selected_btn.setStyleSheet("font-size: 14px; font-weight: bold; padding: 8px;")
+        self.complete_selected_btn.clicked.connect(self.complete_selected_action)
+        bulk_layout.addWidget(self.complete_selected_btn)
+
+        self.cancel_selected_btn = QPushButton("Cancel Selected")
+        self.cancel_selected_btn.setStyleSheet("font-size: 14px; font-weight: bold; padding: 8px;")
+        self.cancel_selected_btn.clicked.connect(self.cancel_selected_action)
+        bulk_layout.addWidget(self.cancel_selected_btn)
+
+        self.terminate_selected_btn = QPushButton("Terminate Selected")
+        self.terminate_selected_btn.setStyleSheet("font-size: 14px; font-weight: bold; padding: 8px;")
+        self.terminate_selected_btn.clicked.connect(self.terminate_selected_action)
+        bulk_layout.addWidget(self.terminate_selected_btn)
+        self.layout.addLayout(bulk_layout)
+
         self.setLayout(self.layout)
+        self.start_live_refresh(["Lease", "Room", "Tenant"])
         self.load_leases()
 
     def load_leases(self):
         """Load and display leases."""
-        leases = fetch_leases()
-        self.lease_table.setRowCount(0)
-
-        for lease in leases:
-            row = self.lease_table.rowCount()
-            self.lease_table.insertRow(row)
-
-            # Populate the table with lease data
-            for col, data in enumerate(lease[:6]):  # Lease ID, Room Name, Tenant Name, Start/End Date, Status
-                item = QTableWidgetItem(str(data))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.lease_table.setItem(row, col, item)
-
-            # Edit Button
-            edit_btn = QPushButton("Edit")
-            edit_btn.setStyleSheet("font-size: 14px; font-weight: bold; padding: 4px;")
-            edit_btn.clicked.connect(lambda _, l=lease: self.edit_lease(l))
-            self.lease_table.setCellWidget(row, 6, edit_btn)
-
-            # Cancel Button
-            cancel_btn = QPushButton("Cancel")
-            cancel_btn.setStyleSheet("font-size: 14px; font-weight: bold; padding: 4px;")
-            cancel_btn.clicked.connect(lambda _, l=lease: self.cancel_lease_action(l[0]))
-            self.lease_table.setCellWidget(row, 7, cancel_btn)
-
-            # Delete Button
-            delete_btn = QPushButton("Delete")
-            delete_btn.setStyleSheet("font-size: 14px; font-weight: bold; padding: 4px;")
-            delete_btn.clicked.connect(lambda _, l=lease: self.delete_lease_action(l[0]))
-            self.lease_table.setCellWidget(row, 8, delete_btn)
+        self.subscription.reset()
+        self.lease_model.refresh()
+
+    def on_table_clicked(self, index):
+        """Run the Edit/Terminate/Cancel/Delete action for a click in an action column."""
+        action = self.lease_model.action_at(index)
+        if action == "Edit":
+            self.edit_lease(self.lease_model.record(index.row()))
+        elif action == "Terminate":
+            self.terminate_lease_action(self.lease_model.record(index.row()))
+        elif action == "Cancel":
+            self.cancel_lease_action(self.lease_model.record_id(index.row()))
+        elif action == "Delete":
+            self.delete_lease_action(self.lease_model.record_id(index.row()))
+
+    def apply_changes(self, changes):
+        """Re-read and patch shown leases that changed or show a changed room/tenant."""
+        lease_ids = changes.get("Lease", set())
+        shown = self.lease_model.loaded_ids()
+        leases = fetch_leases_affected(
+            lease_ids & shown, changes.get("Room", ()), changes.get("Tenant", ()), shown_ids=shown
+        )
+        self.patch_rows(self.lease_model, lease_ids, leases, table="Lease")
 
     # def edit_lease(self, lease):
     #     QMessageBox.information(self, "Edit Lease", f"Editing lease: {lease}")
@@ -87,7 +118,14 @@ class LeaseManagement(QWidget):
         from views.edit_lease import EditLeaseView
         dialog = EditLeaseView(lease, self)
         if dialog.exec():
-            self.load_leases()
+            self.poll_changes()
+
+    def terminate_lease_action(self, lease):
+        """Open the Terminate Lease dialog (settles the lease on a chosen date)."""
+        from views.terminate_lease import TerminateLeaseView
+        dialog = TerminateLeaseView(lease, self)
+        if dialog.exec():
+            self.poll_changes()
 
     def cancel_lease_action(self, lease_id):
         """Cancel a lease with confirmation."""
@@ -100,7 +138,7 @@ class LeaseManagement(QWidget):
             try:
                 cancel_lease(lease_id)
                 QMessageBox.information(self, "Success", f"Lease {lease_id} canceled successfully!")
-                self.load_leases()
+                self.poll_changes()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to cancel lease: {e}")
 
@@ -115,13 +153,84 @@ class LeaseManagement(QWidget):
             try:
                 delete_lease(lease_id)
                 QMessageBox.information(self, "Success", f"Lease {lease_id} deleted successfully!")
-                self.load_leases()
+                self.poll_changes()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to delete lease: {e}")
                 
+    def selected_lease_ids(self):
+        """Return the lease ids of all selected rows."""
+        rows = {index.row() for index in self.lease_table.selectionModel().selectedRows()}
+        return [self.lease_model.record_id(row) for row in sorted(rows)]
+
+    def renew_selected_action(self):
+        """Extend every selected lease by a number of days."""
+        lease_ids = self.selected_lease_ids()
+        if not lease_ids:
+            QMessageBox.warning(self, "Renew Leases", "Select one or more leases first.")
+            return
+        days, ok = QInputDialog.getInt(
+            self, "Renew Leases", f"Extend {len(lease_ids)} lease(s) by how many days?", 365, 1, 3650
+        )
+        if ok:
+            try:
+                renewed = bulk_renew_leases(extend_days=days, lease_ids=lease_ids)
+                QMessageBox.information(self, "Success", f"{renewed} lease(s) renewed.")
+                self.poll_changes()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to renew leases: {e}")
+
+    def complete_selected_action(self):
+        """Mark every selected lease as Completed."""
+        self.bulk_status_action("Completed", lambda ids: bulk_update_lease_status("Completed", lease_ids=ids))
+
+    def cancel_selected_action(self):
+        """Cancel every selected lease."""
+        self.bulk_status_action("Canceled", lambda ids: bulk_cancel_leases(lease_ids=ids))
+
+    def terminate_selected_action(self):
+        """Terminate and settle every selected active lease on one date."""
+        lease_ids = self.selected_lease_ids()
+        if not lease_ids:
+            QMessageBox.warning(self, "Terminate Leases", "Select one or more leases first.")
+            return
+        termination_date, ok = QInputDialog.getText(
+            self, "Terminate Leases", f"Terminate {len(lease_ids)} lease(s) on (YYYY-MM-DD):",
+            text=QDate.currentDate().toString("yyyy-MM-dd")
+        )
+        if not ok:
+            return
+        if not QDate.fromString(termination_date, "yyyy-MM-dd").isValid():
+            QMessageBox.warning(self, "Terminate Leases", "Enter the date as YYYY-MM-DD.")
+            return
+        try:
+            terminated = bulk_terminate_leases(termination_date, lease_ids=lease_ids)
+            QMessageBox.information(self, "Success", f"{terminated} lease(s) terminated and settled.")
+            self.poll_changes()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to terminate leases: {e}")
+
+    def bulk_status_action(self, status, operation):
+        """Confirm and apply a bulk status change to the selected leases."""
+        lease_ids = self.selected_lease_ids()
+        if not lease_ids:
+            QMessageBox.warning(self, "Bulk Update", "Select one or more leases first.")
+            return
+        reply = QMessageBox.question(
+            self, "Bulk Update",
+            f"Set {len(lease_ids)} lease(s) to {status}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            try:
+                updated = operation(lease_ids)
+                QMessageBox.information(self, "Success", f"{updated} lease(s) set to {status}.")
+                self.poll_changes()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to update leases: {e}")
+
     def open_add_lease_view(self):
         """Open Add Lease dialog."""
         dialog = AddLeaseView(self)
         if dialog.exec():
-            self.load_leases()            
+            self.poll_changes()            
                 
@@ -1,57 +1,114 @@
-# from PyQt6.QtWidgets import QVBoxLayout, QPushButton, QLabel, QWidget, QTableWidget, QTableWidgetItem
-# from PyQt6.QtGui import QPixmap
-# from controllers.lease_report_controller import LeaseReportController
-
-# class LeaseReportView(QWidget):
-#     def __init__(self):
-#         super().__init__()
-#         self.controller = LeaseReportController()
-#         self.init_ui()
-
-#     def init_ui(self):
-#         layout = QVBoxLayout()
-
-#         # Lease Summary
-#         summary_label = QLabel("Lease Summary Report")
-#         summary_label.setStyleSheet("font-size: 18px; font-weight: bold;")
-#         layout.addWidget(summary_label)
-
-#         summary = self.controller.get_lease_summary()
-#         layout.addWidget(QLabel(f"Total Leases: {summary['total_leases']}"))
-#         layout.addWidget(QLabel(f"Active Leases: {summary['active_leases']}"))
-#         layout.addWidget(QLabel(f"Completed Leases: {summary['completed_leases']}"))
-#         layout.addWidget(QLabel(f"Canceled Leases: {summary['canceled_leases']}"))
-#         layout.addWidget(QLabel(f"Occupancy Rate: {summary['occupancy_rate']:.2f}%"))
-
-#         # Generate Visualizations
-#         pie_chart_btn = QPushButton("Generate Lease Status Pie Chart")
-#         pie_chart_btn.clicked.connect(self.show_pie_chart)
-#         layout.addWidget(pie_chart_btn)
-
-#         bar_chart_btn = QPushButton("Generate Room Revenue Bar Chart")
-#         bar_chart_btn.clicked.connect(self.show_bar_chart)
-#         layout.addWidget(bar_chart_btn)
-
-#         histogram_btn = QPushButton("Generate Lease Duration Histogram")
-#         histogram_btn.clicked.connect(self.show_histogram)
-#         layout.addWidget(histogram_btn)
-
-#         self.setLayout(layout)
-
-#     def show_pie_chart(self):
-#         self.controller.generate_status_pie_chart()
-#         pie_chart = QLabel()
-#         pie_chart.setPixmap(QPixmap("lease_status_pie_chart.png"))
-#         self.layout().addWidget(pie_chart)
-
-#     def show_bar_chart(self):
-#         self.controller.generate_revenue_bar_chart()
-#         bar_chart = QLabel()
-#         bar_chart.setPixmap(QPixmap("room_revenue_bar_chart.png"))
-#         self.layout().addWidget(bar_chart)
-
-#     def show_histogram(self):
-#         self.controller.generate_lease_duration_histogram()
-#         histogram = QLabel()
-#         histogram.setPixmap(QPixmap("lease_duration_histogram.png"))
-#         self.layout().addWidget(histogram)
+from PyQt6.QtWidgets import (
+    QVBoxLayout, QHBoxLayout, QWidget, QLabel, QPushButton, QComboBox, QCheckBox,
+    QTableWidget, QTableWidgetItem
+)
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from controllers.lease_report_controller import LeaseReportController
+import pandas as pd
+
+class LeaseReportView(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Lease Report")
+        self.controller = LeaseReportController()
+        self.layout = QVBoxLayout()
+
+        # Lease Summary
+        summary_label = QLabel("Lease Summary Report")
+        summary_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        self.layout.addWidget(summary_label)
+
+        self.total_label = QLabel()
+        self.active_label = QLabel()
+        self.completed_label = QLabel()
+        self.canceled_label = QLabel()
+        self.occupancy_label = QLabel()
+        for label in [self.total_label, self.active_label, self.completed_label,
+                      self.canceled_label, self.occupancy_label]:
+            self.layout.addWidget(label)
+
+        # Filter and Actions
+        filter_layout = QHBoxLayout()
+        self.report_type_selector = QComboBox()
+        self.report_type_selector.addItems(
+            ["Status Breakdown", "Revenue by Room", "Lease Duration", "Occupancy Rate"]
+        )
+        self.archive_checkbox = QCheckBox("Include archived years")
+        self.generate_btn = QPushButton("Generate Report")
+        self.generate_btn.clicked.connect(self.generate_report)
+        filter_layout.addWidget(QLabel("Select Report:"))
+        filter_layout.addWidget(self.report_type_selector)
+        filter_layout.addWidget(self.archive_checkbox)
+        filter_layout.addWidget(self.generate_btn)
+        self.layout.addLayout(filter_layout)
+
+        # Table for displaying data
+        self.table = QTableWidget()
+        self.layout.addWidget(self.table)
+
+        # Canvas for Matplotlib graphs
+        self.canvas = FigureCanvas(Figure(figsize=(8, 6)))
+        self.layout.addWidget(self.canvas)
+
+        self.setLayout(self.layout)
+        self.load_summary()
+
+    def load_summary(self):
+        """Refresh the summary labels (for the selected property)."""
+        self.show_summary(self.controller.get_lease_summary(self.archive_checkbox.isChecked()))
+
+    def show_summary(self, summary):
+        self.total_label.setText(f"Total Leases: {summary['total_leases']}")
+        self.active_label.setText(f"Active Leases: {summary['active_leases']}")
+        self.completed_label.setText(f"Completed Leases: {summary['completed_leases']}")
+        self.canceled_label.setText(f"Canceled Leases: {summary['canceled_leases']}")
+        self.occupancy_label.setText(f"Occupancy Rate: {summary['occupancy_rate']:.2f}%")
+
+    def generate_report(self):
+        """Generate the selected report."""
+        report_type = self.report_type_selector.currentText()
+        # Summary and report data come from the same database state
+        summary, df = self.controller.load_report(report_type, self.archive_checkbox.isChecked())
+        self.show_summary(summary)
+
+        self.canvas.figure.clear()
+        ax = self.canvas.figure.add_subplot(111)
+        if df.empty:
+            # Nothing to chart (e.g. a fresh database); matplotlib cannot draw an empty pie
+            ax.text(0.5, 0.5, "No leases" if report_type != "Occupancy Rate" else "No rooms",
+                    ha='center', va='center', fontsize=14, transform=ax.transAxes)
+            ax.set_axis_off()
+        elif report_type == "Status Breakdown":
+            ax.pie(df['lease_count'], labels=df['status'], autopct='%1.1f%%', startangle=140)
+            ax.set_title("Lease Status Distribution")
+        elif report_type == "Revenue by Room":
+            ax.bar(df['room_name'].fillna(df['room_id'].astype(str)), df['revenue'], color='skyblue')
+            ax.set_xlabel("Room")
+            ax.set_ylabel("Revenue ($)")
+            ax.set_title(f"Top {len(df)} Rooms by Revenue")
+            ax.tick_params(axis='x', labelrotation=45)
+        elif report_type == "Lease Duration":
+            ax.bar(df['min_days'], df['lease_count'], width=df['max_days'] - df['min_days'],
+                   align='edge', color='orange', edgecolor='black')
+            ax.set_xlabel("Lease Duration (Days)")
+            ax.set_ylabel("Number of Leases")
+            ax.set_title("Lease Duration Distribution")
+        else:
+            ax.bar(df['room_type'], df['occupancy_rate'], color='green')
+            ax.set_ylim(0, 100)
+            ax.set_xlabel("Room Type")
+            ax.set_ylabel("Occupancy (%)")
+            ax.set_title("Occupancy Rate by Room Type")
+        self.populate_table(df)
+        self.canvas.draw()
+
+    def populate_table(self, df: pd.DataFrame):
+        """Populate the table with DataFrame data, ensuring that None values are handled."""
+        df = df.fillna('N/A').reset_index(drop=True)
+        self.table.setRowCount(len(df))
+        self.table.setColumnCount(len(df.columns))
+        self.table.setHorizontalHeaderLabels(df.columns)
+        for row_idx, row_data in enumerate(df.itertuples(index=False)):
+            for col_idx, value in enumerate(row_data):
+                self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
@@ -0,0 +1,47 @@
+import logging
+from PyQt6.QtCore import QTimer
+from controllers.change_feed_controller import ChangeSubscription
+
+logger = logging.getLogger(__name__)
+
+
+class LiveRefreshMixin:
+    """Keeps an open management table in sync with the change log.
+
+    The view polls its ChangeSubscription on a timer and after every dialog it
+    opens, then re-reads and patches only the rows that changed.
+    """
+
+    POLL_INTERVAL_MS = 2000
+
+    def start_live_refresh(self, tables):
+        """Subscribe to changes on the given tables and start polling."""
+        self.subscription = ChangeSubscription(tables)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_changes)
+        self.poll_timer.start(self.POLL_INTERVAL_MS)
+
+    def poll_changes(self):
+        """Apply any changes recorded since the last poll."""
+        try:
+            changes = self.subscription.poll()
+            if changes:
+                self.apply_changes(changes)
+        except Exception as e:
+            logger.exception("Error applying live changes: %s", e)
+
+    def apply_changes(self, changes):
+        """Patch the view for {table_name: set(row_ids)}; each view overrides this."""
+
+    def patch_rows(self, model, changed_ids, fresh_rows, table=None):
+        """Patch only the changed records in the view's RowStoreTableModel.
+
+        For a PagedTableModel, table names the model's table, so it can
+        tell inserts and deletes (which shift rows) from updates.
+        """
+        if table is None:
+            model.patch(changed_ids, fresh_rows)
+        else:
+            model.patch(changed_ids, fresh_rows,
+                        inserted_ids=self.subscription.inserted.get(table, ()),
+                        deleted_ids=self.subscription.deleted.get(table, ()))
@@ -1,33 +1,41 @@
 
 
 from PyQt6.QtWidgets import (
-    QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox,
-    QWidget, QHeaderView
+    QVBoxLayout, QTableView, QPushButton, QMessageBox, QWidget, QHeaderView
+)
+from controllers.payment_management_controller import (
+    PAYMENT_GRID, fetch_payments_affected, create_payment, update_payment, delete_payment
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
-from controllers.payment_management_controller import fetch_payments, create_payment, update_payment, delete_payment
 from views.add_payment import AddPaymentView
 from views.edit_payment import EditPaymentView
+from views.live_refresh import LiveRefreshMixin
+from views.table_models import PagedTableModel
+from views.column_filters import ColumnFilterBar
 
 
-class PaymentManagement(QWidget):
+class PaymentManagement(LiveRefreshMixin, QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Payment Management")
         self.layout = QVBoxLayout()
 
-        # Payment Table
-        self.payment_table = QTableWidget()
-        self.payment_table.setColumnCount(10)  # Columns for payment details and actions
-        self.payment_table.setHorizontalHeaderLabels([
-            "Payment ID", "Room Name", "Tenant Name", "Amount", "Payment Date",
-            "Due Date", "Method", "Status", "Edit", "Delete"
-        ])
+        # Payment Table (pages fetched on demand; sort and filter run in SQL)
+        headers = ["Payment ID", "Room Name", "Tenant Name", "Amount", "Payment Date",
+                   "Due Date", "Method", "Status"]
+        self.payment_model = PagedTableModel(PAYMENT_GRID, headers, actions=["Edit", "Delete"])
+        self.payment_table = QTableView()
+        self.payment_table.setModel(self.payment_model)
+        self.payment_table.setSortingEnabled(True)
+        self.payment_table.clicked.connect(self.on_table_clicked)
+
+        # Per-column filters
+        self.filter_bar = ColumnFilterBar(headers)
+        self.filter_bar.filtersChanged.connect(self.payment_model.set_filters)
+        self.layout.addWidget(self.filter_bar)
 
         # Table styling
         self.payment_table.setStyleSheet("""
-            QTableWidget::item { font-size: 14px; text-align: center; }
+            QTableView::item { font-size: 14px; text-align: center; }
             QHeaderView::section { font-size: 16px; font-weight: bold; text-align: center; }
         """)
         self.payment_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
@@ -46,40 +54,36 @@ class PaymentManagement(QWidget):
         self.layout.addWidget(self.add_payment_btn)
 
         self.setLayout(self.layout)
+        self.start_live_refresh(["Payment", "Room", "Tenant"])
         self.load_payments()
 
     def load_payments(self):
         """Load and display payments."""
-        payments = fetch_payments()
-        self.payment_table.setRowCount(0)
-
-        for payment in payments:
-            row = self.payment_table.rowCount()
-            self.payment_table.insertRow(row)
-
-            # Populate the table with payment data
-            for col, data in enumerate(payment[:8]):  # Exclude actions for now
-                item = QTableWidgetItem(str(data))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.payment_table.setItem(row, col, item)
-
-            # Edit Button
-            edit_btn = QPushButton("Edit")
-            edit_btn.setStyleSheet("font-size: 14px; font-weight: bold; padding: 4px;")
-            edit_btn.clicked.connect(lambda _, p=payment: self.edit_payment(p))
-            self.payment_table.setCellWidget(row, 8, edit_btn)
-
-            # Delete Button
-            delete_btn = QPushButton("Delete")
-            delete_btn.setStyleSheet("font-size: 14px; font-weight: bold; padding: 4px;")
-            delete_btn.clicked.connect(lambda _, p=payment: self.delete_payment_action(p[0]))
-            self.payment_table.setCellWidget(row, 9, delete_btn)
+        self.subscription.reset()
+        self.payment_model.refresh()
+
+    def on_table_clicked(self, index):
+        """Run the Edit/Delete action for a click in an action column."""
+        action = self.payment_model.action_at(index)
+        if action == "Edit":
+            self.edit_payment(self.payment_model.record(index.row()))
+        elif action == "Delete":
+            self.delete_payment_action(self.payment_model.record_id(index.row()))
+
+    def apply_changes(self, changes):
+        """Re-read and patch shown payments that changed or show a changed room/tenant."""
+        payment_ids = changes.get("Payment", set())
+        shown = self.payment_model.loaded_ids()
+        payments = fetch_payments_affected(
+            payment_ids & shown, changes.get("Room", ()), changes.get("Tenant", ()), shown_ids=shown
+        )
+        self.patch_rows(self.payment_model, payment_ids, payments, table="Payment")
 
     def edit_payment(self, payment):
         """Open Edit Payment dialog."""
         dialog = EditPaymentView(payment, self)
         if dialog.exec():
-            self.load_payments()
+            self.poll_changes()
 
     def delete_payment_action(self, payment_id):
         """Delete a payment with confirmation."""
@@ -92,7 +96,7 @@ class PaymentManagement(QWidget):
             try:
                 delete_payment(payment_id)
                 QMessageBox.information(self, "Success", f"Payment {payment_id} deleted successfully!")
-                self.load_payments()
+                self.poll_changes()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to delete payment: {e}")
 
@@ -100,5 +104,5 @@ class PaymentManagement(QWidget):
         """Open Add Payment dialog."""
         dialog = AddPaymentView(self)
         if dialog.exec():
-            self.load_payments()
+            self.poll_changes()
 
@@ -1,56 +1,111 @@
-# from PyQt6.QtWidgets import QVBoxLayout, QPushButton, QLabel, QWidget
-# from PyQt6.QtGui import QPixmap
-# from controllers.payment_report_controller import PaymentReportController
-
-# class PaymentReportView(QWidget):
-#     def __init__(self):
-#         super().__init__()
-#         self.controller = PaymentReportController()
-#         self.init_ui()
-
-#     def init_ui(self):
-#         layout = QVBoxLayout()
-
-#         # Payment Summary
-#         summary_label = QLabel("Payment Summary Report")
-#         summary_label.setStyleSheet("font-size: 18px; font-weight: bold;")
-#         layout.addWidget(summary_label)
-
-#         summary = self.controller.get_payment_summary()
-#         layout.addWidget(QLabel(f"Total Payments: {summary['total_payments']}"))
-#         layout.addWidget(QLabel(f"Total Income: ${summary['total_income']:.2f}"))
-#         layout.addWidget(QLabel(f"Outstanding Balances: ${summary['outstanding_balances']:.2f}"))
-#         layout.addWidget(QLabel(f"Overdue Payments: {summary['overdue_count']} (${summary['overdue_total']:.2f})"))
-
-#         # Generate Visualizations
-#         pie_chart_btn = QPushButton("Generate Payment Status Pie Chart")
-#         pie_chart_btn.clicked.connect(self.show_pie_chart)
-#         layout.addWidget(pie_chart_btn)
-
-#         bar_chart_btn = QPushButton("Generate Revenue by Room Chart")
-#         bar_chart_btn.clicked.connect(self.show_bar_chart)
-#         layout.addWidget(bar_chart_btn)
-
-#         trends_chart_btn = QPushButton("Generate Monthly Payment Trends Chart")
-#         trends_chart_btn.clicked.connect(self.show_line_chart)
-#         layout.addWidget(trends_chart_btn)
-
-#         self.setLayout(layout)
-
-#     def show_pie_chart(self):
-#         self.controller.generate_status_pie_chart()
-#         pie_chart = QLabel()
-#         pie_chart.setPixmap(QPixmap("payment_status_pie_chart.png"))
-#         self.layout().addWidget(pie_chart)
-
-#     def show_bar_chart(self):
-#         self.controller.generate_revenue_by_room_chart()
-#         bar_chart = QLabel()
-#         bar_chart.setPixmap(QPixmap("revenue_by_room_bar_chart.png"))
-#         self.layout().addWidget(bar_chart)
-
-#     def show_line_chart(self):
-#         self.controller.generate_monthly_trends_line_chart()
-#         line_chart = QLabel()
-#         line_chart.setPixmap(QPixmap("monthly_trends_line_chart.png"))
-#         self.layout().addWidget(line_chart)
+from PyQt6.QtWidgets import (
+    QVBoxLayout, QHBoxLayout, QWidget, QLabel, QPushButton, QComboBox, QTableWidget, QTableWidgetItem
+)
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from controllers.payment_report_controller import PaymentReportController
+import pandas as pd
+
+class PaymentReportView(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Payment Report")
+        self.controller = PaymentReportController()
+        self.layout = QVBoxLayout()
+
+        # Payment Summary
+        summary_label = QLabel("Payment Summary Report")
+        summary_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        self.layout.addWidget(summary_label)
+
+        self.total_label = QLabel()
+        self.income_label = QLabel()
+        self.outstanding_label = QLabel()
+        self.overdue_label = QLabel()
+        for label in [self.total_label, self.income_label, self.outstanding_label, self.overdue_label]:
+            self.layout.addWidget(label)
+
+        # Filter and Actions
+        filter_layout = QHBoxLayout()
+        self.report_type_selector = QComboBox()
+        self.report_type_selector.addItems(
+            ["Payment Status", "Revenue by Room", "Monthly Trends", "Monthly Payers", "Payment Amounts"]
+        )
+        self.generate_btn = QPushButton("Generate Report")
+        self.generate_btn.clicked.connect(self.generate_report)
+        filter_layout.addWidget(QLabel("Select Report:"))
+        filter_layout.addWidget(self.report_type_selector)
+        filter_layout.addWidget(self.generate_btn)
+        self.layout.addLayout(filter_layout)
+
+        # Table for displaying data
+        self.table = QTableWidget()
+        self.layout.addWidget(self.table)
+
+        # Canvas for Matplotlib graphs
+        self.canvas = FigureCanvas(Figure(figsize=(8, 6)))
+        self.layout.addWidget(self.canvas)
+
+        self.setLayout(self.layout)
+        self.load_summary()
+
+    def load_summary(self):
+        """Refresh the summary labels (for the selected property)."""
+        self.show_summary(self.controller.get_payment_summary())
+
+    def show_summary(self, summary):
+        self.total_label.setText(f"Total Payments: {summary['total_payments']}")
+        self.income_label.setText(f"Total Income: ${summary['total_income']:.2f}")
+        self.outstanding_label.setText(f"Outstanding Balances: ${summary['outstanding_balances']:.2f}")
+        self.overdue_label.setText(
+            f"Overdue Payments: {summary['overdue_count']} (${summary['overdue_total']:.2f})"
+        )
+
+    def generate_report(self):
+        """Generate the selected report."""
+        report_type = self.report_type_selector.currentText()
+        # Summary and report data come from the same database state
+        summary, df = self.controller.load_report(report_type)
+        self.show_summary(summary)
+
+        self.canvas.figure.clear()
+        ax = self.canvas.figure.add_subplot(111)
+        if report_type == "Payment Status":
+            ax.pie(df['payment_count'], labels=df['payment_status'], autopct='%1.1f%%', startangle=140)
+            ax.set_title("Payment Status Breakdown")
+        elif report_type == "Revenue by Room":
+            ax.bar(df['room_name'].fillna(df['room_id'].astype(str)), df['revenue'], color='blue')
+            ax.set_xlabel("Room")
+            ax.set_ylabel("Total Revenue ($)")
+            ax.set_title(f"Top {len(df)} Rooms by Revenue")
+            ax.tick_params(axis='x', labelrotation=45)
+        elif report_type == "Monthly Payers":
+            ax.bar(df['period'], df['tenants'], color='teal')
+            ax.set_xlabel("Month")
+            ax.set_ylabel("Paying Tenants")
+            ax.set_title("Tenants Paying per Month")
+            ax.tick_params(axis='x', labelrotation=45)
+        elif report_type == "Payment Amounts":
+            ax.bar(df['min_value'], df['count'], width=df['max_value'] - df['min_value'],
+                   align='edge', color='orange', edgecolor='black')
+            ax.set_xlabel("Payment Amount ($)")
+            ax.set_ylabel("Number of Payments")
+            ax.set_title("Payment Amount Distribution")
+        else:
+            ax.plot(df['period'], df['total_amount'], marker='o', color='purple')
+            ax.set_xlabel("Month")
+            ax.set_ylabel("Total Payments ($)")
+            ax.set_title("Monthly Payment Trends")
+            ax.tick_params(axis='x', labelrotation=45)
+        self.populate_table(df)
+        self.canvas.draw()
+
+    def populate_table(self, df: pd.DataFrame):
+        """Populate the table with DataFrame data, ensuring that None values are handled."""
+        df = df.fillna('N/A').reset_index(drop=True)
+        self.table.setRowCount(len(df))
+        self.table.setColumnCount(len(df.columns))
+        self.table.setHorizontalHeaderLabels(df.columns)
+        for row_idx, row_data in enumerate(df.itertuples(index=False)):
+            for col_idx, value in enumerate(row_data):
+                self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
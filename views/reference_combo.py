@@ -0,0 +1,120 @@
+from PyQt6.QtWidgets import QComboBox, QCompleter
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+from controllers.reference_cache import tenant_choices, room_choices
+from controllers.property_controller import current_property
+
+
+class ChoiceListModel(QAbstractListModel):
+    """Dropdown choices built from a ReferenceData cache, sorted by label.
+
+    DisplayRole is the label and UserRole the record id, so a QComboBox's
+    currentData() is the selected id. sync() rebuilds the list only when
+    the cache version moved, or for a scoped model when the selected
+    property changed (accept then sees the property id too).
+    """
+
+    def __init__(self, reference, label, accept=None, none_label=None, scoped=False):
+        super().__init__()
+        self.reference = reference
+        self.label = label
+        self.accept = accept
+        self.none_label = none_label
+        self.scoped = scoped
+        self.items = []  # (label, id)
+        self.version = None
+
+    def sync(self):
+        version = self.reference.refresh()
+        property_id = current_property() if self.scoped else None
+        if self.scoped:
+            version = (version, property_id)
+        if version == self.version:
+            return
+        self.beginResetModel()
+        accept = self.accept
+        if self.scoped:
+            accept = lambda row: self.accept(row, property_id)
+        items = sorted(
+            ((self.label(row), row[0]) for row in self.reference.rows.values()
+             if accept is None or accept(row)),
+            key=lambda item: item[0].lower(),
+        )
+        if self.none_label is not None:
+            items.insert(0, (self.none_label, None))
+        self.items = items
+        self.version = version
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        label, record_id = self.items[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return label
+        if role == Qt.ItemDataRole.UserRole:
+            return record_id
+        return None
+
+
+def _choice_label(row):
+    return f"{row[1]} (ID: {row[0]})"
+
+
+# Models are shared by every dialog, so reopening one costs a change-log check
+_models = {}
+
+
+def _shared_model(key, factory):
+    model = _models.get(key)
+    if model is None:
+        model = _models[key] = factory()
+    model.sync()
+    return model
+
+
+def tenant_choice_model(allow_none=False):
+    return _shared_model(
+        ("tenants", allow_none),
+        lambda: ChoiceListModel(tenant_choices, _choice_label, none_label="No Tenant" if allow_none else None),
+    )
+
+
+def available_room_choice_model():
+    return _shared_model(
+        ("available_rooms",),
+        lambda: ChoiceListModel(
+            room_choices, _choice_label, scoped=True,
+            accept=lambda row, property_id: row[2] == "Available" and property_id in (None, row[3]),
+        ),
+    )
+
+
+class ReferenceComboBox(QComboBox):
+    """Searchable dropdown over a shared ChoiceListModel.
+
+    Typing filters the choices (case-insensitive, anywhere in the label)
+    through a QSortFilterProxyModel that feeds the QCompleter popup.
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        # Do not measure every item to size the box
+        self.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        self.setMinimumContentsLength(30)
+        self.setModel(model)
+        self.view().setUniformItemSizes(True)
+
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+        completer = QCompleter(self.proxy, self)
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setCompleter(completer)
+        self.lineEdit().textEdited.connect(self.proxy.setFilterFixedString)
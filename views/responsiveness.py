@@ -0,0 +1,192 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from collections import Counter, deque
+from PyQt6.QtCore import QTimer
+from controllers.app_logging import LOG_DIRECTORY
+
+logger = logging.getLogger(__name__)
+
+# The GUI thread stamps a heartbeat every HEARTBEAT_MS; a beat arriving
+# STALL_THRESHOLD_MS or more late means the event loop was blocked that long
+# (to within one heartbeat).
+# While a beat is overdue, a watchdog thread samples the GUI thread's Python
+# stack every WATCHDOG_POLL_MS, so the stall can be pinned on the code that
+# was running.
+HEARTBEAT_MS = 100
+STALL_THRESHOLD_MS = 250
+WATCHDOG_POLL_MS = 50
+
+# Stall histogram bucket lower bounds; the last bucket is open-ended
+STALL_BUCKETS_MS = (250, 500, 1000, 2000, 5000, 10000)
+RECENT_STALLS = 100
+STACK_DEPTH = 30
+REPORT_FILE = "responsiveness.json"
+
+# Frames under this directory are the application's own code
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _bucket_label(index):
+    low = STALL_BUCKETS_MS[index]
+    if index + 1 < len(STALL_BUCKETS_MS):
+        return f"{low}-{STALL_BUCKETS_MS[index + 1]} ms"
+    return f"{low}+ ms"
+
+
+def _stack_of(thread_id):
+    """The thread's current stack, innermost frame first, as (file, line, function) tuples."""
+    frame = sys._current_frames().get(thread_id)
+    stack = []
+    while frame is not None and len(stack) < STACK_DEPTH:
+        code = frame.f_code
+        stack.append((code.co_filename, frame.f_lineno, code.co_qualname))
+        frame = frame.f_back
+    return stack
+
+
+def _offender(stack):
+    """Where a stall is blamed, e.g. 'LeaseManagement.load_leases (views/lease_management.py)'.
+
+    The innermost view frame: the screen code that made the blocking call
+    (the stack shows which controller it was in). Failing that, the
+    innermost application frame.
+    """
+    own = []
+    for filename, _line, function in stack:
+        path = os.path.abspath(filename)
+        if path.startswith(_APP_ROOT + os.sep) and path != os.path.abspath(__file__):
+            own.append(f"{function} ({os.path.relpath(path, _APP_ROOT)})")
+    views = [frame for frame in own if f"(views{os.sep}" in frame]
+    if views or own:
+        return (views or own)[0]
+    return "(outside application code)"
+
+
+def _format_stack(stack):
+    return [f"{os.path.relpath(os.path.abspath(filename), _APP_ROOT)}:{line} {function}"
+            for filename, line, function in stack]
+
+
+class StallRecorder:
+    """Stall statistics: a duration histogram, per-offender totals and the latest stalls.
+
+    sample() is called from the watchdog thread while a stall is under
+    way, finish() from the GUI thread once it is over; report() and
+    export() may be called from anywhere.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = []
+        self.histogram = [0] * len(STALL_BUCKETS_MS)
+        self.offenders = {}
+        self.recent = deque(maxlen=RECENT_STALLS)
+
+    def sample(self, stack):
+        with self._lock:
+            self._samples.append(stack)
+
+    def finish(self, duration_ms):
+        """Record a stall of duration_ms, blamed on the most sampled offender."""
+        with self._lock:
+            samples, self._samples = self._samples, []
+            offenders = Counter(_offender(stack) for stack in samples)
+            offender = offenders.most_common(1)[0][0] if offenders else "(not sampled)"
+            stack = next((stack for stack in samples if _offender(stack) == offender), [])
+
+            bucket = max(i for i, low in enumerate(STALL_BUCKETS_MS) if duration_ms >= low or i == 0)
+            self.histogram[bucket] += 1
+            stats = self.offenders.setdefault(offender, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            stats["stack"] = _format_stack(stack)
+            self.recent.append({
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "duration_ms": round(duration_ms, 1),
+                "offender": offender,
+                "samples": len(samples),
+            })
+        logger.warning("Event loop blocked for %.0f ms in %s", duration_ms, offender,
+                       extra={"stall_ms": round(duration_ms, 1), "offender": offender})
+        return offender
+
+    def discard_samples(self):
+        with self._lock:
+            self._samples = []
+
+    def report(self, top=10):
+        """Histogram, the top offenders by total blocked time, and the latest stalls."""
+        with self._lock:
+            ranked = sorted(self.offenders.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+            return {
+                "threshold_ms": STALL_THRESHOLD_MS,
+                "stalls": sum(self.histogram),
+                "histogram": {_bucket_label(i): count for i, count in enumerate(self.histogram)},
+                "top_offenders": [
+                    {"offender": offender, **{key: round(value, 1) if isinstance(value, float) else value
+                                              for key, value in stats.items()}}
+                    for offender, stats in ranked[:top]
+                ],
+                "recent": list(self.recent),
+            }
+
+    def export(self, path=None):
+        """Write report() as JSON (default logs/responsiveness.json); returns the path."""
+        path = path or os.path.join(LOG_DIRECTORY, REPORT_FILE)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2)
+        return path
+
+
+class EventLoopMonitor:
+    """Detects when the Qt event loop is blocked and records what blocked it.
+
+    Start it from the GUI thread once the QApplication exists; the
+    recorder keeps the statistics.
+    """
+
+    def __init__(self):
+        self.recorder = StallRecorder()
+        self._gui_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped = threading.Event()
+        self._watchdog = None
+        self.timer = None
+
+    def start(self, parent=None):
+        self._gui_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self.timer = QTimer(parent)
+        self.timer.timeout.connect(self.beat)
+        self.timer.start(HEARTBEAT_MS)
+        self._stopped.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self.timer is not None:
+            self.timer.stop()
+
+    def beat(self):
+        """Heartbeat slot: a late beat ends a stall."""
+        now = time.monotonic()
+        late_ms = (now - self._last_beat) * 1000 - HEARTBEAT_MS
+        self._last_beat = now
+        if late_ms >= STALL_THRESHOLD_MS:
+            self.recorder.finish(late_ms)
+        else:
+            # Samples from a wait the watchdog caught but that stayed below the threshold
+            self.recorder.discard_samples()
+
+    def _watch(self):
+        while not self._stopped.wait(WATCHDOG_POLL_MS / 1000):
+            overdue_ms = (time.monotonic() - self._last_beat) * 1000 - HEARTBEAT_MS
+            if overdue_ms >= STALL_THRESHOLD_MS:
+                self.recorder.sample(_stack_of(self._gui_thread))
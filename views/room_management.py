@@ -1,28 +1,43 @@
 
 from PyQt6.QtWidgets import (
-    QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QPushButton,
-    QWidget, QMessageBox, QHBoxLayout, QSizePolicy
+    QVBoxLayout, QTableView, QHeaderView, QPushButton,
+    QWidget, QMessageBox, QHBoxLayout
 )
-from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
-from functools import partial
-from controllers.room_controller import fetch_rooms
+from controllers.room_controller import ROOM_GRID, fetch_rooms_by_ids
+from views.live_refresh import LiveRefreshMixin
+from views.table_models import PagedTableModel
+from views.column_filters import ColumnFilterBar
 
 
-class RoomManagement(QWidget):
+class RoomManagement(LiveRefreshMixin, QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Room Management")
         self.layout = QVBoxLayout()
 
-        # Room Table
-        self.room_table = QTableWidget()
-        self.room_table.setColumnCount(8)  # Updated for separate Edit and Delete columns
-        self.room_table.setHorizontalHeaderLabels([
-            "Room ID", "Room Name", "Room Type", "Room Size", "Rental Price",
-            "Occupancy Status", "Action Edit", "Action Delete"
-        ])
-        
+        # Set font for table rows
+        self.row_font = QFont()
+        self.row_font.setPointSize(14)  # Set font size for row values
+
+        # Room Table (pages fetched on demand; sort and filter run in SQL)
+        headers = ["Room ID", "Room Name", "Room Type", "Room Size", "Rental Price", "Occupancy Status"]
+        self.room_model = PagedTableModel(
+            ROOM_GRID, headers,
+            actions=["Edit Room", "Delete Room"],
+            empty_text="N/A",
+            font=self.row_font,
+        )
+        self.room_table = QTableView()
+        self.room_table.setModel(self.room_model)
+        self.room_table.setSortingEnabled(True)
+        self.room_table.clicked.connect(self.on_table_clicked)
+
+        # Per-column filters
+        self.filter_bar = ColumnFilterBar(headers)
+        self.filter_bar.filtersChanged.connect(self.room_model.set_filters)
+        self.layout.addWidget(self.filter_bar)
+
         # Adjust column width for each column
         self.room_table.setColumnWidth(0, 100)  # Room ID
         self.room_table.setColumnWidth(1, 240)  # Room Name
@@ -36,14 +51,14 @@ class RoomManagement(QWidget):
         # Apply table styling
         self.room_table.setStyleSheet(
             """
-            QTableWidget::item { text-align: center; }
+            QTableView::item { text-align: center; }
             QHeaderView::section { font-size: 16px; font-weight: bold; text-align: center; }
             """
         )
 
         # Enable horizontal scrolling
-        self.room_table.setHorizontalScrollMode(QTableWidget.ScrollMode.ScrollPerPixel)
-        self.room_table.setSizeAdjustPolicy(QTableWidget.SizeAdjustPolicy.AdjustToContents)
+        self.room_table.setHorizontalScrollMode(QTableView.ScrollMode.ScrollPerPixel)
+        self.room_table.setSizeAdjustPolicy(QTableView.SizeAdjustPolicy.AdjustToContents)
         self.room_table.horizontalScrollBar().setVisible(True)
 
         # Adjust column width and row height
@@ -69,58 +84,32 @@ class RoomManagement(QWidget):
         self.layout.addLayout(button_layout)
         self.setLayout(self.layout)
 
+        self.start_live_refresh(["Room"])
         self.load_rooms()
 
     def load_rooms(self):
         """Fetch and display all rooms."""
         try:
-            rooms = fetch_rooms()
-            if not rooms:
+            self.subscription.reset()
+            self.room_model.refresh()
+            if not self.room_model.rowCount() and not self.room_model.filters:
                 QMessageBox.information(self, "Info", "No rooms found.")
-                self.room_table.setRowCount(0)  # Clear any existing rows
-                return
-            self.populate_table(rooms)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load rooms: {e}")
 
-    def populate_table(self, rooms):
-        """Populate the table with room data."""
-        self.room_table.setRowCount(0)  # Clear existing rows
+    def on_table_clicked(self, index):
+        """Run the Edit/Delete action for a click in an action column."""
+        action = self.room_model.action_at(index)
+        if action == "Edit Room":
+            self.open_edit_room_view(self.room_model.record(index.row()))
+        elif action == "Delete Room":
+            self.delete_room_action(self.room_model.record_id(index.row()))
 
-        # Set font for table rows
-        row_font = QFont()
-        row_font.setPointSize(14)  # Set font size for row values
-
-        for row_data in rooms:
-            row = self.room_table.rowCount()
-            self.room_table.insertRow(row)
-
-            # Populate all columns with room data (excluding actions)
-            for col, data in enumerate(row_data[:6]):
-                item = QTableWidgetItem(str(data) if data is not None else "N/A")
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)  # Center-align text
-                item.setFont(row_font)  # Apply the font to the row item
-                self.room_table.setItem(row, col, item)
-
-            # Add action buttons
-            self.add_edit_action(row, row_data)
-            self.add_delete_action(row, row_data)
-
-    def add_edit_action(self, row, row_data):
-        """Add the Edit button to the table."""
-        edit_btn = QPushButton("Edit Room")
-        edit_btn.setStyleSheet("font-size: 14px;font-weight:bold; padding: 5px;")
-        edit_btn.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding))
-        edit_btn.clicked.connect(partial(self.open_edit_room_view, row_data))
-        self.room_table.setCellWidget(row, 6, edit_btn)  # Place in the "Action Edit" column
-
-    def add_delete_action(self, row, row_data):
-        """Add the Delete button to the table."""
-        delete_btn = QPushButton("Delete Room")
-        delete_btn.setStyleSheet("font-size: 14px; font-weight:bold; padding: 5px;")
-        delete_btn.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding))
-        delete_btn.clicked.connect(partial(self.delete_room_action, row_data[0]))
-        self.room_table.setCellWidget(row, 7, delete_btn)  # Place in the "Action Delete" column
+    def apply_changes(self, changes):
+        """Re-read and patch only the shown rooms that changed."""
+        room_ids = changes.get("Room", set())
+        rooms = {room[0]: room for room in fetch_rooms_by_ids(room_ids & self.room_model.loaded_ids())}
+        self.patch_rows(self.room_model, room_ids, rooms, table="Room")
 
     def delete_room_action(self, room_id):
         """Delete a room."""
@@ -128,7 +117,7 @@ class RoomManagement(QWidget):
         try:
             delete_room(room_id)
             QMessageBox.information(self, "Success", f"Room ID {room_id} deleted successfully!")
-            self.load_rooms()
+            self.poll_changes()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to delete Room ID {room_id}: {e}")
     
@@ -144,7 +133,7 @@ class RoomManagement(QWidget):
         from views.edit_room import EditRoomView
         dialog = EditRoomView(room_data[0], current_data)  # Pass Room ID and current data
         if dialog.exec():
-            self.load_rooms()  # Reload rooms after editing
+            self.poll_changes()  # Patch the edited room only
 
 
     def open_add_room_view(self):
@@ -152,6 +141,6 @@ class RoomManagement(QWidget):
         from views.add_room import AddRoomView
         dialog = AddRoomView(self)
         if dialog.exec():
-            self.load_rooms()
+            self.poll_changes()
 
 
@@ -102,14 +102,19 @@
 
 
 
+import logging
 from PyQt6.QtWidgets import (
-    QVBoxLayout, QHBoxLayout, QWidget, QLabel, QPushButton, QComboBox, QTableWidget, QTableWidgetItem
+    QVBoxLayout, QHBoxLayout, QWidget, QLabel, QPushButton, QComboBox, QTableView
 )
+from PyQt6.QtCore import Qt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from controllers.room_report_controller import fetch_room_summary, fetch_occupancy_analysis, fetch_financial_performance
+from views.table_models import DataFrameTableModel
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 class RoomReport(QWidget):
     def __init__(self):
         super().__init__()
@@ -127,8 +132,11 @@ class RoomReport(QWidget):
         filter_layout.addWidget(self.generate_btn)
         self.layout.addLayout(filter_layout)
 
-        # Table for displaying data
-        self.table = QTableWidget()
+        # Table for displaying data; cells are read from the report DataFrame
+        self.table_model = DataFrameTableModel(empty_text='N/A')
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        self.table.setSortingEnabled(True)
         self.layout.addWidget(self.table)
 
         # Canvas for Matplotlib graphs
@@ -136,12 +144,12 @@ class RoomReport(QWidget):
         self.layout.addWidget(self.canvas)
 
         self.setLayout(self.layout)
-        print("RoomReport initialized")  # Debug print
+        logger.debug("RoomReport initialized")
 
     def generate_report(self):
         """Generate the selected report."""
         report_type = self.report_type_selector.currentText()
-        print(f"Report type selected: {report_type}")  # Debug print
+        logger.debug("Report type selected: %s", report_type)
 
         if report_type == "Room Summary":
             self.show_room_summary()
@@ -153,13 +161,13 @@ class RoomReport(QWidget):
     def show_room_summary(self):
         """Display room summary in the table."""
         df = fetch_room_summary()
-        print(f"Room Summary Data: \n{df}")  # Debug print
+        logger.debug("Room Summary Data: \n%s", df)
         self.populate_table(df)
 
     def show_occupancy_analysis(self):
         """Display occupancy analysis with a pie chart."""
         df = fetch_occupancy_analysis()
-        print(f"Occupancy Analysis Data: \n{df}")  # Debug print
+        logger.debug("Occupancy Analysis Data: \n%s", df)
         self.populate_table(df)
 
         # Plot pie chart
@@ -168,12 +176,12 @@ class RoomReport(QWidget):
         ax.pie(df['count'], labels=df['occupancy_status'], autopct='%1.1f%%', startangle=140)
         ax.set_title("Occupancy Analysis")
         self.canvas.draw()
-        print("Pie chart drawn")  # Debug print
+        logger.debug("Pie chart drawn")
 
     def show_financial_performance(self):
         """Display financial performance in the table and bar chart."""
         df = fetch_financial_performance()
-        print(f"Financial Performance Data: \n{df}")  # Debug print
+        logger.debug("Financial Performance Data: \n%s", df)
         self.populate_table(df)
 
         # Ensure no None values for plotting
@@ -190,17 +198,11 @@ class RoomReport(QWidget):
         ax.set_title("Financial Performance by Room")
         ax.legend()
         self.canvas.draw()
-        print("Bar chart drawn")  # Debug print
+        logger.debug("Bar chart drawn")
 
     def populate_table(self, df: pd.DataFrame):
-        """Populate the table with DataFrame data, ensuring that None values are handled."""
-        df = df.fillna('N/A')  # Replace None with 'N/A' for display purposes
-        self.table.setRowCount(0)
-        self.table.setColumnCount(len(df.columns))
-        self.table.setHorizontalHeaderLabels(df.columns)
-
-        for row_idx, row_data in df.iterrows():
-            self.table.insertRow(row_idx)
-            for col_idx, value in enumerate(row_data):
-                self.table.setItem(row_idx, col_idx, QTableWidgetItem(str(value)))
-        print("Table populated with data")  # Debug print
+        """Show the DataFrame in the table; None values display as 'N/A'."""
+        # Reset the header's sort indicator, or the view would re-sort the new frame
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table_model.set_frame(df)
+        logger.debug("Table populated with data")
@@ -0,0 +1,297 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QFont, QColor
+from controllers.row_store import RowStore
+
+
+class RowStoreTableModel(QAbstractTableModel):
+    """Table model that reads cells straight from a RowStore.
+
+    The first len(headers) store columns are shown as text; each entry in
+    actions adds a clickable column after them (e.g. "Edit", "Delete").
+    Nothing is converted to str until the view paints the cell.
+    """
+
+    def __init__(self, headers, actions=(), empty_text="", font=None, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.actions = list(actions)
+        self.empty_text = empty_text
+        self.font = font
+        self.action_font = QFont(font) if font else QFont()
+        self.action_font.setBold(True)
+        self.store = RowStore(len(self.headers))
+
+    def set_store(self, store):
+        """Show a freshly fetched store."""
+        self.beginResetModel()
+        self.store = store
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers) + len(self.actions)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return (self.headers + self.actions)[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        action = self.action_at(index)
+        if role == Qt.ItemDataRole.DisplayRole:
+            if action:
+                return action
+            value = self.value(index.row(), index.column())
+            return self.empty_text if value is None else str(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.FontRole:
+            return self.action_font if action else self.font
+        if role == Qt.ItemDataRole.ForegroundRole and action:
+            return QColor("#1565c0")
+        return None
+
+    def action_at(self, index):
+        """Name of the action column at index, or None for a data column."""
+        column = index.column() - len(self.headers)
+        return self.actions[column] if column >= 0 else None
+
+    def value(self, row, column):
+        return self.store.value(row, column)
+
+    def record(self, row):
+        """The full fetched row (all store columns) as a tuple."""
+        return self.store.row(row)
+
+    def record_id(self, row):
+        return self.value(row, 0)
+
+    def patch(self, changed_ids, fresh_rows):
+        """Update, append or remove only the rows whose records changed.
+
+        fresh_rows maps record id -> row data; a changed id without fresh data
+        was deleted (or no longer matches the view) and its row is removed.
+        """
+        removed = []
+        last_column = self.columnCount() - 1
+        for record_id in set(changed_ids) | set(fresh_rows):
+            row = self.store.find(record_id)
+            data = fresh_rows.get(record_id)
+            if data is None:
+                if row is not None:
+                    removed.append(row)
+            elif row is None:
+                row = len(self.store)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.store.append(data)
+                self.endInsertRows()
+            else:
+                self.store.set_row(row, data)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+        for row in sorted(removed, reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.store.remove_rows([row])
+            self.endRemoveRows()
+
+
+class PagedTableModel(RowStoreTableModel):
+    """Table model over a GridQuery that loads rows a page at a time.
+
+    Only the row count is known up front; pages are fetched with LIMIT/OFFSET
+    when the view first paints them and the most recent PAGES_CACHED are
+    kept. Sorting (header clicks) and filtering re-run the query in SQL.
+    """
+
+    PAGE_SIZE = 200
+    PAGES_CACHED = 10
+
+    def __init__(self, grid, headers, actions=(), empty_text="", font=None, parent=None):
+        super().__init__(headers, actions, empty_text, font, parent)
+        self.grid = grid
+        self.sort_column = None
+        self.descending = None
+        self.filters = {}
+        self.row_total = 0
+        self.pages = OrderedDict()  # page number -> RowStore
+
+    def refresh(self):
+        """Drop cached pages and recount; the view re-reads what it shows."""
+        self.beginResetModel()
+        self.pages.clear()
+        self.row_total = self.grid.count(self.filters)
+        self.endResetModel()
+
+    def set_filters(self, filters):
+        """Apply {column number: text} filters."""
+        self.filters = dict(filters)
+        self.refresh()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if column >= len(self.headers):
+            return  # action columns do not sort
+        self.sort_column = column
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self.refresh()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_total
+
+    def page(self, page_number):
+        store = self.pages.get(page_number)
+        if store is None:
+            store = self.grid.fetch_page(
+                page_number * self.PAGE_SIZE, self.PAGE_SIZE,
+                self.sort_column, self.descending, self.filters,
+            )
+            self.pages[page_number] = store
+            while len(self.pages) > self.PAGES_CACHED:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(page_number)
+        return store
+
+    def value(self, row, column):
+        store = self.page(row // self.PAGE_SIZE)
+        offset = row % self.PAGE_SIZE
+        # The table can shrink between the count and the page read
+        return store.value(offset, column) if offset < len(store) else None
+
+    def record(self, row):
+        store = self.page(row // self.PAGE_SIZE)
+        offset = row % self.PAGE_SIZE
+        return store.row(offset) if offset < len(store) else None
+
+    def loaded_ids(self):
+        """Record ids on the cached pages: the only rows a patch can touch."""
+        return {store.value(offset, 0) for store in self.pages.values() for offset in range(len(store))}
+
+    def patch(self, changed_ids, fresh_rows, inserted_ids=(), deleted_ids=()):
+        """Update changed rows on cached pages in place.
+
+        Inserts and deletes shift every following row, so those (and a
+        shown row that no longer matches the view) recount and reload the
+        grid instead. Updates to rows on no cached page need nothing: the
+        page is read fresh when it is shown.
+        """
+        if inserted_ids or deleted_ids:
+            self.refresh()
+            return
+
+        located = {}
+        for page_number, store in self.pages.items():
+            for record_id in set(changed_ids) | set(fresh_rows):
+                offset = store.find(record_id)
+                if offset is not None:
+                    located[record_id] = (page_number, store, offset)
+        if any(fresh_rows.get(record_id) is None for record_id in located):
+            self.refresh()
+            return
+
+        last_column = self.columnCount() - 1
+        for record_id, (page_number, store, offset) in located.items():
+            store.set_row(offset, fresh_rows[record_id])
+            row = page_number * self.PAGE_SIZE + offset
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """Read-only table model serving cells straight from a DataFrame.
+
+    Each column is kept as its NumPy array (a categorical as its codes and
+    categories), so showing a frame copies nothing. A cell is formatted
+    when the view paints it; missing values show as empty_text. Sorting
+    (header clicks) reorders a row index taken from argsort, never the
+    data, and missing values stay last either way.
+    """
+
+    def __init__(self, df=None, empty_text="N/A", parent=None):
+        super().__init__(parent)
+        self.empty_text = empty_text
+        self.headers = []
+        self.columns = []
+        self.row_total = 0
+        self.order = None
+        if df is not None:
+            self.set_frame(df)
+
+    def set_frame(self, df):
+        """Show a new DataFrame, unsorted."""
+        self.beginResetModel()
+        self.headers = [str(column) for column in df.columns]
+        self.columns = [_column_values(df[column]) for column in df.columns]
+        self.row_total = len(df)
+        self.order = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_total
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        row = index.row() if self.order is None else self.order[index.row()]
+        return self.display(self.columns[index.column()], row)
+
+    def display(self, column, row):
+        values, categories = column
+        value = values[row]
+        if categories is not None:
+            return self.empty_text if value < 0 else str(categories[value])
+        if pd.isna(value):
+            return self.empty_text
+        if isinstance(value, np.datetime64):
+            return str(np.datetime_as_string(value, unit="D"))
+        return str(value)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if not 0 <= column < len(self.columns):
+            return
+        self.layoutAboutToBeChanged.emit()
+        keys, missing = _sort_keys(self.columns[column])
+        rows = np.argsort(keys, kind="stable")
+        if order == Qt.SortOrder.DescendingOrder:
+            rows = rows[::-1]
+        gaps = missing[rows]
+        self.order = np.concatenate([rows[~gaps], rows[gaps]])
+        self.layoutChanged.emit()
+
+
+def _column_values(series):
+    """(values, categories) of a column; categories only for a categorical."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories.to_numpy()
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy(copy=False), None
+    # Extension arrays (nullable ints, pandas strings) hand out a converted copy
+    return series.to_numpy(dtype=object), None
+
+
+def _sort_keys(column):
+    """Sortable keys for a column, and which of its rows are missing."""
+    values, categories = column
+    if categories is not None:
+        # Rank the categories by their own order, so codes sort like the values
+        ranks = np.argsort(np.argsort(categories, kind="stable"))
+        return np.where(values < 0, 0, ranks[values]), values < 0
+    if values.dtype.kind in "biuf":
+        return values, np.isnan(values) if values.dtype.kind == "f" else np.zeros(len(values), dtype=bool)
+    if values.dtype.kind in "mM":
+        return values.view(np.int64), np.isnat(values)
+    codes, _uniques = pd.factorize(values, sort=True)
+    return codes, codes < 0
@@ -1,12 +1,14 @@
 
 
 from PyQt6.QtWidgets import (
-    QVBoxLayout, QTableWidget,QMessageBox, QTableWidgetItem, QPushButton, QLineEdit, QLabel, QWidget, QHeaderView
+    QVBoxLayout, QTableView, QMessageBox, QPushButton, QLineEdit, QLabel, QWidget, QHeaderView
 )
-from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from controllers.row_store import RowStore
+from views.live_refresh import LiveRefreshMixin
+from views.table_models import RowStoreTableModel
 
-class TenantManagement(QWidget):
+class TenantManagement(LiveRefreshMixin, QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Tenant Management")
@@ -19,22 +21,28 @@ class TenantManagement(QWidget):
         self.search_input.textChanged.connect(self.search_tenants)
         self.layout.addWidget(self.search_input)
 
-        # Tenant Table
-        self.tenant_table = QTableWidget()
-        self.tenant_table.setColumnCount(5)  # ID, Name, Contact, Edit, Delete
-        self.tenant_table.setHorizontalHeaderLabels(["ID", "Name", "Contact", "Edit", "Delete"])
+        self.row_font = QFont()
+        self.row_font.setPointSize(14)  # Set font size for row values
+
+        # Tenant Table (rows live in a RowStore; cells are read on paint)
+        self.tenant_model = RowStoreTableModel(
+            ["ID", "Name", "Contact"], actions=["Edit", "Delete"], font=self.row_font
+        )
+        self.tenant_table = QTableView()
+        self.tenant_table.setModel(self.tenant_model)
+        self.tenant_table.clicked.connect(self.on_table_clicked)
         self.layout.addWidget(self.tenant_table)
 
         # Enable horizontal scrolling
-        self.tenant_table.setHorizontalScrollMode(QTableWidget.ScrollMode.ScrollPerPixel)
-        self.tenant_table.setSizeAdjustPolicy(QTableWidget.SizeAdjustPolicy.AdjustToContents)
+        self.tenant_table.setHorizontalScrollMode(QTableView.ScrollMode.ScrollPerPixel)
+        self.tenant_table.setSizeAdjustPolicy(QTableView.SizeAdjustPolicy.AdjustToContents)
         self.tenant_table.horizontalScrollBar().setVisible(True)
 
         # Apply column size and styling
         self.tenant_table.horizontalHeader().setDefaultSectionSize(200)  # Default column width
         self.tenant_table.setStyleSheet(
             """
-            QTableWidget::item { font-size: 14px; text-align: center; }
+            QTableView::item { font-size: 14px; text-align: center; }
             QHeaderView::section { font-size: 16px; font-weight: bold; text-align: center; }
             """
         )
@@ -58,68 +66,49 @@ class TenantManagement(QWidget):
         self.layout.addWidget(self.refresh_btn)
 
         self.setLayout(self.layout)
+        self.start_live_refresh(["Tenant"])
         self.load_tenants()
 
     def load_tenants(self):
         """Fetch and display tenant data."""
-        from controllers.tenant_controller import fetch_tenants, delete_tenant
-        tenants = fetch_tenants()
-        self.tenant_table.setRowCount(0)
-
-        row_font = QFont()
-        row_font.setPointSize(14)  # Set font size for row values
-
-        for tenant in tenants:
-            row = self.tenant_table.rowCount()
-            self.tenant_table.insertRow(row)
-            for col, data in enumerate(tenant[:3]):  # ID, Name, Contact
-                item = QTableWidgetItem(str(data))
-                item.setFont(row_font)  # Apply font size to row values
-                self.tenant_table.setItem(row, col, item)
-
-            # Add Edit Button
-            edit_btn = QPushButton("Edit")
-            edit_btn.setStyleSheet("font-size: 14px; font-weight:bold; padding: 5px;")
-            edit_btn.clicked.connect(lambda _, t=tenant: self.open_edit_tenant_view(t))
-            self.tenant_table.setCellWidget(row, 3, edit_btn)
-
-            # Add Delete Button
-            delete_btn = QPushButton("Delete")
-            delete_btn.setStyleSheet("font-size: 14px; font-weight:bold; padding: 5px;")
-            delete_btn.clicked.connect(lambda _, t=tenant: self.delete_tenant_action(t[0]))
-            self.tenant_table.setCellWidget(row, 4, delete_btn)
+        from controllers.tenant_controller import fetch_tenants
+        self.subscription.reset()
+        self.tenant_model.set_store(fetch_tenants(as_store=True))
 
     def search_tenants(self, search_text):
         """Search tenants by name or contact."""
         from controllers.tenant_controller import fetch_tenants
-        tenants = fetch_tenants()
-        filtered_tenants = [
-            tenant for tenant in tenants if search_text.lower() in tenant[1].lower() or search_text.lower() in tenant[2].lower()
-        ]
-        self.tenant_table.setRowCount(0)
-
-        row_font = QFont()
-        row_font.setPointSize(14)  # Set font size for row values
-
-        for tenant in filtered_tenants:
-            row = self.tenant_table.rowCount()
-            self.tenant_table.insertRow(row)
-            for col, data in enumerate(tenant[:3]):  # ID, Name, Contact
-                item = QTableWidgetItem(str(data))
-                item.setFont(row_font)  # Apply font size to row values
-                self.tenant_table.setItem(row, col, item)
-
-            # Add Edit Button
-            edit_btn = QPushButton("Edit")
-            edit_btn.setStyleSheet("font-size: 14px; font-weight:bold; padding: 5px;")
-            edit_btn.clicked.connect(lambda _, t=tenant: self.open_edit_tenant_view(t))
-            self.tenant_table.setCellWidget(row, 3, edit_btn)
-
-            # Add Delete Button
-            delete_btn = QPushButton("Delete")
-            delete_btn.setStyleSheet("font-size: 14px; font-weight:bold; padding: 5px;")
-            delete_btn.clicked.connect(lambda _, t=tenant: self.delete_tenant_action(t[0]))
-            self.tenant_table.setCellWidget(row, 4, delete_btn)
+        self.subscription.reset()
+        tenants = fetch_tenants(as_store=True)
+        if search_text:
+            tenants = RowStore.from_rows(
+                (tenant for tenant in tenants if self.matches_search(tenant)), tenants.column_count
+            )
+        self.tenant_model.set_store(tenants)
+
+    def matches_search(self, tenant):
+        """Check a tenant row against the current search text."""
+        search_text = self.search_input.text().lower()
+        return search_text in tenant[1].lower() or search_text in tenant[2].lower()
+
+    def on_table_clicked(self, index):
+        """Run the Edit/Delete action for a click in an action column."""
+        action = self.tenant_model.action_at(index)
+        if action == "Edit":
+            self.open_edit_tenant_view(self.tenant_model.record(index.row()))
+        elif action == "Delete":
+            self.delete_tenant_action(self.tenant_model.record_id(index.row()))
+
+    def apply_changes(self, changes):
+        """Re-read and patch only the tenants that changed."""
+        from controllers.tenant_controller import fetch_tenants_by_ids
+        tenant_ids = changes.get("Tenant", set())
+        tenants = {
+            tenant[0]: tenant
+            for tenant in fetch_tenants_by_ids(tenant_ids)
+            if self.matches_search(tenant)
+        }
+        self.patch_rows(self.tenant_model, tenant_ids, tenants)
 
     def delete_tenant_action(self, tenant_id):
         """Delete a tenant."""
@@ -127,7 +116,7 @@ class TenantManagement(QWidget):
         try:
             delete_tenant(tenant_id)
             QMessageBox.information(self, "Success", f"Tenant ID {tenant_id} deleted successfully!")
-            self.load_tenants()
+            self.poll_changes()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to delete Tenant ID {tenant_id}: {e}")
 
@@ -136,11 +125,11 @@ class TenantManagement(QWidget):
         from views.add_tenant import AddTenantView
         dialog = AddTenantView(self)
         if dialog.exec():
-            self.load_tenants()
+            self.poll_changes()
 
     def open_edit_tenant_view(self, tenant_data):
         """Open edit tenant view."""
         from views.edit_tenant import EditTenantView
         dialog = EditTenantView(tenant_data, self)
         if dialog.exec():
-            self.load_tenants()
+            self.poll_changes()
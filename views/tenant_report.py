@@ -393,20 +393,27 @@
 
 
 
+import logging
 from PyQt6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget,
     QTableWidgetItem, QWidget, QMessageBox, QProgressBar, QGroupBox,
-    QScrollArea, QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QAbstractScrollArea
+    QScrollArea, QGraphicsView, QGraphicsScene, QGraphicsPixmapItem
 )
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap
 import os
 from controllers.tenant_report_controller import TenantReportController
 
+logger = logging.getLogger(__name__)
+
+# Tenants per page of the payment ranking
+PAYMENT_PAGE_SIZE = 50
+
 
 class TenantReportView(QWidget):
     def __init__(self):
         super().__init__()
-        print("Initializing TenantReportView")  # Debug print
+        logger.debug("Initializing TenantReportView")
         self.controller = TenantReportController()
         self.init_ui()
 
@@ -428,13 +435,13 @@ class TenantReportView(QWidget):
 
         try:
             total, active, inactive, overdue = self.controller.get_tenant_summary()
-            print(f"Tenant Summary: Total={total}, Active={active}, Inactive={inactive}, Overdue={overdue}")
+            logger.debug("Tenant Summary: Total=%s, Active=%s, Inactive=%s, Overdue=%s", total, active, inactive, overdue)
             summary_layout.addWidget(QLabel(f"Total Tenants: {total}"))
             summary_layout.addWidget(QLabel(f"Active Tenants: {active}"))
             summary_layout.addWidget(QLabel(f"Inactive Tenants: {inactive}"))
             summary_layout.addWidget(QLabel(f"Overdue Payments: {overdue}"))
         except Exception as e:
-            print(f"Error fetching tenant summary: {e}")
+            logger.exception("Error fetching tenant summary: %s", e)
             summary_layout.addWidget(QLabel("Error fetching tenant summary."))
         summary_group.setLayout(summary_layout)
         scroll_layout.addWidget(summary_group)
@@ -462,6 +469,24 @@ class TenantReportView(QWidget):
         export_btn = QPushButton("Export Payment Report")
         export_btn.clicked.connect(self.export_payment_report)
         report_layout.addWidget(export_btn)
+
+        # One page of the ranking at a time
+        self.payment_table = QTableWidget()
+        self.payment_table.setVisible(False)
+        report_layout.addWidget(self.payment_table)
+
+        paging_layout = QHBoxLayout()
+        self.prev_page_btn = QPushButton("Previous")
+        self.prev_page_btn.clicked.connect(lambda: self.load_payment_page(self.payment_page - 1))
+        self.next_page_btn = QPushButton("Next")
+        self.next_page_btn.clicked.connect(lambda: self.load_payment_page(self.payment_page + 1))
+        self.page_label = QLabel()
+        paging_layout.addWidget(self.prev_page_btn)
+        paging_layout.addWidget(self.page_label)
+        paging_layout.addWidget(self.next_page_btn)
+        report_layout.addLayout(paging_layout)
+        self.payment_page = 0
+        self.set_paging_enabled(False)
         report_group.setLayout(report_layout)
         scroll_layout.addWidget(report_group)
 
@@ -477,59 +502,111 @@ class TenantReportView(QWidget):
         self.setLayout(layout)
 
     def show_bar_chart(self):
-        print("Generating bar chart...")
+        logger.debug("Generating bar chart...")
         self.start_loading()
         try:
             total, active, inactive, _ = self.controller.get_tenant_summary()
-            print(f"Bar Chart Data: Active={active}, Inactive={inactive}")
+            logger.debug("Bar Chart Data: Active=%s, Inactive=%s", active, inactive)
             chart_path = self.controller.generate_bar_chart(active, inactive)
             if not chart_path or not os.path.exists(chart_path):
                 raise FileNotFoundError(f"Bar chart file not found at {chart_path}")
             self.display_scrollable_chart(chart_path, "Bar chart")
         except Exception as e:
-            print(f"Error generating bar chart: {e}")
+            logger.exception("Error generating bar chart: %s", e)
             self.show_error(f"Error generating bar chart: {e}")
         finally:
             self.stop_loading()
 
     def show_pie_chart(self):
-        print("Generating pie chart...")
+        logger.debug("Generating pie chart...")
         self.start_loading()
         try:
             total, active, inactive, _ = self.controller.get_tenant_summary()
-            print(f"Pie Chart Data: Active={active}, Inactive={inactive}")
+            logger.debug("Pie Chart Data: Active=%s, Inactive=%s", active, inactive)
             chart_path = self.controller.generate_pie_chart(active, inactive)
             if not chart_path or not os.path.exists(chart_path):
                 raise FileNotFoundError(f"Pie chart file not found at {chart_path}")
             self.display_scrollable_chart(chart_path, "Pie chart")
         except Exception as e:
-            print(f"Error generating pie chart: {e}")
+            logger.exception("Error generating pie chart: %s", e)
             self.show_error(f"Error generating pie chart: {e}")
         finally:
             self.stop_loading()
 
     def display_scrollable_chart(self, chart_path, chart_type):
         """Display a chart with scrollable view."""
-        print(f"Displaying scrollable {chart_type} from: {chart_path}")
+        logger.debug("Displaying scrollable %s from: %s", chart_type, chart_path)
         scene = QGraphicsScene()
         pixmap_item = QGraphicsPixmapItem(QPixmap(chart_path))
         scene.addItem(pixmap_item)
 
         graphics_view = QGraphicsView()
         graphics_view.setScene(scene)
-        graphics_view.setHorizontalScrollBarPolicy(QAbstractScrollArea.ScrollBarPolicy.ScrollBarAsNeeded)
-        graphics_view.setVerticalScrollBarPolicy(QAbstractScrollArea.ScrollBarPolicy.ScrollBarAsNeeded)
+        graphics_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        graphics_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
 
         self.layout().addWidget(graphics_view)
-        print(f"Scrollable {chart_type} added to layout.")
+        logger.debug("Scrollable %s added to layout.", chart_type)
 
     def show_payment_report(self):
-        # Implementation for showing the payment report...
-        pass
+        logger.debug("Generating payment report...")
+        self.start_loading()
+        try:
+            self.load_payment_page(0)
+            top_tenants = self.controller.get_tenant_payment_report(limit=10)
+            if top_tenants.empty:
+                raise ValueError("No payment data available.")
+            chart_path = self.controller.generate_payment_bar_chart(top_tenants)
+            if not chart_path or not os.path.exists(chart_path):
+                raise FileNotFoundError(f"Payment bar chart file not found at {chart_path}")
+            self.display_scrollable_chart(chart_path, "Payment bar chart")
+        except Exception as e:
+            logger.exception("Error generating payment report: %s", e)
+            self.show_error(f"Error generating payment report: {e}")
+        finally:
+            self.stop_loading()
+
+    def load_payment_page(self, page):
+        """Show one page of the tenant payment ranking."""
+        if page < 0:
+            return
+        payment_data = self.controller.get_tenant_payment_report(PAYMENT_PAGE_SIZE, page * PAYMENT_PAGE_SIZE)
+        if payment_data.empty and page > 0:
+            return  # Past the last tenant; stay on this page
+        self.payment_page = page
+
+        self.payment_table.setRowCount(len(payment_data))
+        self.payment_table.setColumnCount(len(payment_data.columns))
+        self.payment_table.setHorizontalHeaderLabels(payment_data.columns)
+        for row, data in enumerate(payment_data.itertuples(index=False)):
+            tenant_id, name, total, count, last_period = data
+            for column, value in enumerate([tenant_id, name or "", f"${total:.2f}", count, last_period]):
+                self.payment_table.setItem(row, column, QTableWidgetItem(str(value)))
+        self.payment_table.setVisible(True)
+
+        first = page * PAYMENT_PAGE_SIZE + 1
+        self.page_label.setText(f"Tenants {first}-{first + len(payment_data) - 1}" if len(payment_data) else "No tenants")
+        self.prev_page_btn.setEnabled(page > 0)
+        self.next_page_btn.setEnabled(len(payment_data) == PAYMENT_PAGE_SIZE)
+
+    def set_paging_enabled(self, enabled):
+        self.prev_page_btn.setEnabled(enabled)
+        self.next_page_btn.setEnabled(enabled)
 
     def export_payment_report(self):
-        # Implementation for exporting the payment report...
-        pass
+        logger.debug("Exporting payment report...")
+        self.start_loading()
+        try:
+            file_path = "reports/tenant_payment_report.csv"
+            count = self.controller.export_payment_report(file_path)
+            if count == 0:
+                raise ValueError("No payment data to export.")
+            QMessageBox.information(self, "Export Complete", f"Payment report for {count} tenants saved at {file_path}")
+        except Exception as e:
+            logger.exception("Error exporting payment report: %s", e)
+            self.show_error(f"Error exporting payment report: {e}")
+        finally:
+            self.stop_loading()
 
     def show_error(self, message):
         """Display an error message box."""
@@ -541,13 +618,16 @@ class TenantReportView(QWidget):
 
     def clear_charts(self):
         """Clear previous charts from the layout."""
-        print("Clearing old charts from layout...")
+        logger.debug("Clearing old charts from layout...")
         for i in reversed(range(self.layout().count())):
             widget = self.layout().itemAt(i).widget()
             if isinstance(widget, QLabel) and widget.pixmap():
                 widget.deleteLater()
-        print("Charts cleared.")
+        logger.debug("Charts cleared.")
 
     def start_loading(self):
         self.progress_bar.setVisible(True)
-        self.pro
+        self.progress_bar.setValue(0)
+
+    def stop_loading(self):
+        self.progress_bar.setVisible(False)
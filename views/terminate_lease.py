@@ -40,7 +40,8 @@
 #             QMessageBox.critical(self, "Error", f"Failed to terminate lease: {e}")
 
 
-from PyQt6.QtWidgets import QVBoxLayout, QDialog, QLabel, QPushButton, QMessageBox
+from PyQt6.QtWidgets import QVBoxLayout, QDialog, QLabel, QPushButton, QMessageBox, QDateEdit
+from PyQt6.QtCore import QDate
 from controllers.lease_management_controller import terminate_lease
 
 class TerminateLeaseView(QDialog):
@@ -57,6 +58,14 @@ class TerminateLeaseView(QDialog):
         self.layout.addWidget(QLabel(f"End Date: {lease_data[4]}"))  # End date
         self.layout.addWidget(QLabel(f"Status: {lease_data[5]}"))  # Lease status
 
+        # Termination Date
+        self.layout.addWidget(QLabel("Termination Date:"))
+        self.termination_date_input = QDateEdit()
+        self.termination_date_input.setCalendarPopup(True)
+        self.termination_date_input.setDisplayFormat("yyyy-MM-dd")
+        self.termination_date_input.setDate(QDate.currentDate())
+        self.layout.addWidget(self.termination_date_input)
+
         # Terminate Button
         self.terminate_btn = QPushButton("Terminate Lease")
         self.terminate_btn.clicked.connect(self.terminate_lease)
@@ -70,12 +79,20 @@ class TerminateLeaseView(QDialog):
         self.setLayout(self.layout)
 
     def terminate_lease(self):
-        """Terminate the lease."""
+        """Terminate the lease and show its settlement."""
         try:
-            terminate_lease(self.lease_id)
-            QMessageBox.information(self, "Success", "Lease terminated successfully!")
+            termination_date = self.termination_date_input.date().toString("yyyy-MM-dd")
+            settlement = terminate_lease(self.lease_id, termination_date)
+            QMessageBox.information(
+                self, "Success",
+                f"Lease terminated on {settlement['termination_date']}.\n\n"
+                f"Prorated final rent: ${settlement['prorated_rent']:.2f}\n"
+                f"Unpaid balance: ${settlement['unpaid_balance']:.2f}\n"
+                f"Paid towards final period: ${settlement['final_period_paid']:.2f}\n"
+                f"Security deposit: ${settlement['security_deposit']:.2f}\n"
+                f"Deposit refund: ${settlement['deposit_refund']:.2f}\n"
+                f"Balance due: ${settlement['balance_due']:.2f}"
+            )
             self.accept()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to terminate lease: {e}")
-            
-